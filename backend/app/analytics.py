@@ -0,0 +1,139 @@
+import asyncio
+import enum
+import hashlib
+from collections import Counter
+from typing import Optional
+
+from sqlalchemy import String, func, literal, select, type_coerce, union_all
+
+from .database import AsyncSessionLocal
+from .models import Project, Task, Bug, ArchivedTask, ArchivedBug
+
+def _status_key(value) -> Optional[str]:
+    """Status as its stored name, whether given as an enum or a string."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+class DashboardCounters:
+    """In-process counters behind /analytics/dashboard.
+
+    Seeded by one grouped query, then kept current by the write handlers so
+    the dashboard never touches the database. Writes made by other workers
+    arrive over the event bus without their old and new status, so they
+    mark the counters stale and the next read reloads them. A periodic
+    reconcile corrects any other drift, e.g. from scripts that bypass the
+    API.
+    """
+
+    def __init__(self):
+        self.total_projects = 0
+        self.task_status: Counter = Counter()
+        self.bug_status: Counter = Counter()
+        self.loaded = False
+        self.stale = False
+        self._lock = asyncio.Lock()
+
+    def count_query(self):
+        """Task and bug status counts plus the project total, in one round trip.
+
+        Archived tasks and bugs still count; their rows come back separately
+        and are added to the live counts.
+        """
+        return union_all(
+            select(literal("task"), type_coerce(Task.status, String), func.count(Task.id)).group_by(Task.status),
+            select(literal("bug"), type_coerce(Bug.status, String), func.count(Bug.id)).group_by(Bug.status),
+            select(literal("task"), type_coerce(ArchivedTask.status, String), func.count(ArchivedTask.id))
+            .group_by(ArchivedTask.status),
+            select(literal("bug"), type_coerce(ArchivedBug.status, String), func.count(ArchivedBug.id))
+            .group_by(ArchivedBug.status),
+            select(literal("project"), literal(None, String), func.count(Project.id)),
+        )
+
+    async def load(self, db):
+        """Replace the counters with the current database counts."""
+        # Cleared before the query, so a write seen meanwhile marks it again
+        self.stale = False
+        rows = (await db.execute(self.count_query())).all()
+        task_status: Counter = Counter()
+        bug_status: Counter = Counter()
+        total_projects = 0
+        for kind, status, count in rows:
+            if kind == "task":
+                task_status[status] += count
+            elif kind == "bug":
+                bug_status[status] += count
+            else:
+                total_projects = count
+
+        self.task_status = task_status
+        self.bug_status = bug_status
+        self.total_projects = total_projects
+        self.loaded = True
+
+    async def ensure_loaded(self, db):
+        if self.loaded and not self.stale:
+            return
+        async with self._lock:
+            if not self.loaded or self.stale:
+                await self.load(db)
+
+    def invalidate(self, project_id: Optional[int] = None):
+        """Reload on the next read, e.g. for a write seen on another worker."""
+        self.stale = True
+
+    async def reconcile(self):
+        """Reload counts in a fresh session."""
+        async with AsyncSessionLocal() as db:
+            await self.load(db)
+
+    async def reconcile_forever(self, interval: float):
+        """Background task: reconcile every `interval` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reconcile()
+            except Exception as e:
+                print(f"Error reconciling dashboard counters: {e}")
+
+    # Write-path hooks. They are no-ops until the counters are loaded, since
+    # the first load picks up every committed row anyway.
+    def project_created(self):
+        if self.loaded:
+            self.total_projects += 1
+
+    def task_created(self, status):
+        if self.loaded:
+            self.task_status[_status_key(status)] += 1
+
+    def task_status_changed(self, old, new):
+        if self.loaded and _status_key(old) != _status_key(new):
+            self.task_status[_status_key(old)] -= 1
+            self.task_status[_status_key(new)] += 1
+
+    def bug_created(self, status):
+        if self.loaded:
+            self.bug_status[_status_key(status)] += 1
+
+    def bug_status_changed(self, old, new):
+        if self.loaded and _status_key(old) != _status_key(new):
+            self.bug_status[_status_key(old)] -= 1
+            self.bug_status[_status_key(new)] += 1
+
+    def etag(self) -> str:
+        """Tag derived from the counters, so it changes exactly when the payload does."""
+        state = (self.total_projects, sorted(self.task_status.items()), sorted(self.bug_status.items()))
+        return f'W/"dashboard-{hashlib.sha1(repr(state).encode()).hexdigest()[:16]}"'
+
+    def snapshot(self) -> dict:
+        """Dashboard payload computed from the counters alone."""
+        total_tasks = sum(self.task_status.values())
+        completed_tasks = self.task_status["done"]
+        return {
+            "total_projects": self.total_projects,
+            "total_tasks": total_tasks,
+            "total_bugs": sum(self.bug_status.values()),
+            "open_bugs": self.bug_status["open"],
+            "completed_tasks": completed_tasks,
+            "completion_rate": (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+        }
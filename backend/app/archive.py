@@ -0,0 +1,85 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import changelog
+from .database import AsyncSessionLocal
+from .models import Task, Bug, ArchivedTask, ArchivedBug
+
+# Entity name -> (hot model, archive model, statuses that are final)
+ARCHIVES = {
+    "task": (Task, ArchivedTask, ("done",)),
+    "bug": (Bug, ArchivedBug, ("closed",)),
+}
+
+# Called after each committed batch with (entity, [(id, project_id)], seq)
+OnBatch = Callable[[str, list, Optional[int]], Awaitable[None]]
+
+def _archivable(hot, statuses, cutoff: datetime) -> list:
+    # A row counts as untouched since its last update, or since creation if
+    # it was never updated. The newest row is never moved: SQLite hands out
+    # max(id) + 1 for new rows, which would collide with an archived id.
+    return [
+        hot.status.in_(statuses),
+        func.coalesce(hot.updated_at, hot.created_at) < cutoff,
+        hot.id < select(func.max(hot.id)).scalar_subquery(),
+    ]
+
+async def archive_batch(db: AsyncSession, entity: str, cutoff: datetime, batch_size: int) -> Dict:
+    """Move up to `batch_size` final rows last touched before `cutoff`, in one transaction.
+
+    Rows are copied with their ids, deleted from the hot table and logged
+    as deletes, so delta sync clients drop them. Returns the moved
+    (id, project_id) pairs and the change log seq.
+    """
+    hot, cold, statuses = ARCHIVES[entity]
+    ids = select(hot.id).where(*_archivable(hot, statuses, cutoff)).order_by(hot.id).limit(batch_size)
+    if db.bind.dialect.name == "postgresql":
+        # Leave rows a concurrent write holds to the next run
+        ids = ids.with_for_update(skip_locked=True)
+    ids = (await db.scalars(ids)).all()
+    if not ids:
+        return {"rows": [], "seq": None}
+
+    names = [column.name for column in hot.__table__.columns]
+    await db.execute(insert(cold).from_select(names, select(*hot.__table__.columns).where(hot.id.in_(ids))))
+    rows = (await db.execute(delete(hot).where(hot.id.in_(ids)).returning(hot.id, hot.project_id))).all()
+    rows = [tuple(row) for row in rows]
+    seq = await changelog.record_changes(db, entity, rows, f"{entity}_archived", op=changelog.DELETE)
+    await db.commit()
+    return {"rows": rows, "seq": seq}
+
+async def archive(age: timedelta, batch_size: int, on_batch: Optional[OnBatch] = None,
+                  entities: Optional[List[str]] = None) -> Dict[str, int]:
+    """Archive every eligible row, one batch per transaction, and count them per entity.
+
+    Short transactions keep the write lock brief, so requests are not held
+    up behind a large backlog on the first run.
+    """
+    cutoff = datetime.utcnow() - age
+    moved = {}
+    for entity in entities or ARCHIVES:
+        moved[entity] = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                batch = await archive_batch(db, entity, cutoff, batch_size)
+            if not batch["rows"]:
+                break
+            moved[entity] += len(batch["rows"])
+            if on_batch is not None:
+                await on_batch(entity, batch["rows"], batch["seq"])
+            if len(batch["rows"]) < batch_size:
+                break
+    return moved
+
+async def archive_forever(interval: float, age: timedelta, batch_size: int, on_batch: Optional[OnBatch] = None):
+    """Background task: archive old final rows every `interval` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await archive(age, batch_size, on_batch)
+        except Exception as e:
+            print(f"Error archiving tasks and bugs: {e}")
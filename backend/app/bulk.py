@@ -0,0 +1,224 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import changelog, rollups
+from .database import TaskStatus, TaskPriority, BugSeverity, BugStatus
+from .models import User, Project, Task, Bug
+from .principal_cache import Principal
+
+# Largest batch accepted by the :batch endpoints
+MAX_BATCH_SIZE = 1000
+
+class BulkKind:
+    """How one entity type is validated and written in bulk."""
+
+    def __init__(self, entity: str, model, enum_fields: dict, defaults: dict, creator_field: str, level_field: str):
+        self.entity = entity
+        self.model = model
+        self.enum_fields = enum_fields
+        self.defaults = defaults
+        self.creator_field = creator_field
+        self.level_field = level_field
+        self.editable = ("title", "description", "assigned_to") + tuple(enum_fields)
+
+TASKS = BulkKind(
+    "task",
+    Task,
+    {"priority": TaskPriority, "status": TaskStatus},
+    {"description": "", "priority": TaskPriority.medium, "status": TaskStatus.todo},
+    "created_by",
+    "priority",
+)
+
+BUGS = BulkKind(
+    "bug",
+    Bug,
+    {"severity": BugSeverity, "status": BugStatus},
+    {"description": "", "severity": BugSeverity.medium, "status": BugStatus.open},
+    "reported_by",
+    "severity",
+)
+
+def batch_items(payload: dict) -> list:
+    """Extract the item list from a {"items": [...]} request body."""
+    items = payload.get("items") if isinstance(payload, dict) else None
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Body must be an object with an items list")
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch too large (max {MAX_BATCH_SIZE} items)")
+    return items
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def check_item(kind: BulkKind, item, creating: bool, movable: Tuple[str, ...] = ()) -> Tuple[dict, Optional[str]]:
+    """Validate one batch item; returns (column values, error).
+
+    `movable` names integer fields an update may change besides the
+    editable ones, e.g. project_id for a single task.
+    """
+    if not isinstance(item, dict):
+        return {}, "Item must be an object"
+
+    key_fields = ("project_id",) if creating else ("id",)
+    for name in item:
+        if name not in kind.editable and name not in key_fields and name not in movable:
+            return {}, f"Unknown field: {name}"
+    for name in key_fields:
+        if not _is_int(item.get(name)):
+            return {}, f"{name} is required and must be an integer"
+    for name in movable:
+        if name in item and not _is_int(item[name]):
+            return {}, f"{name} must be an integer"
+    if creating and "title" not in item:
+        return {}, "title is required"
+
+    values = {}
+    for name, value in item.items():
+        if name in kind.enum_fields:
+            try:
+                value = kind.enum_fields[name](value)
+            except ValueError:
+                return {}, f"Invalid {name}: {value}"
+        elif name == "title" and not (isinstance(value, str) and value.strip()):
+            return {}, "title must be a non-empty string"
+        elif name == "description" and value is not None and not isinstance(value, str):
+            return {}, "description must be a string"
+        elif name == "assigned_to" and value is not None and not _is_int(value):
+            return {}, "assigned_to must be an integer"
+        values[name] = value
+    return values, None
+
+def checked_body(kind: BulkKind, body: dict, item_id: Optional[int] = None,
+                 movable: Tuple[str, ...] = ()) -> dict:
+    """check_item for a single-row create (no `item_id`) or update; raises 422.
+
+    Runs before the row is touched, so an invalid value never reaches the
+    table, the rollups or the change log.
+    """
+    creating = item_id is None
+    values, error = check_item(kind, body if creating else dict(body, id=item_id), creating, movable)
+    if error:
+        raise HTTPException(status_code=422, detail=error)
+    values.pop("id", None)
+    return values
+
+async def _existing(db: AsyncSession, column, ids: set) -> set:
+    if not ids:
+        return set()
+    return set(await db.scalars(select(column).where(column.in_(ids))))
+
+async def _check_references(db: AsyncSession, pending: Dict[int, dict], results: list):
+    """Fail items whose project or assignee does not exist (one query each)."""
+    projects = await _existing(db, Project.id, {v["project_id"] for v in pending.values() if "project_id" in v})
+    users = await _existing(db, User.id, {v["assigned_to"] for v in pending.values() if v.get("assigned_to") is not None})
+    for index, values in list(pending.items()):
+        if "project_id" in values and values["project_id"] not in projects:
+            results[index] = {"index": index, "status": "error", "error": "Project not found"}
+        elif values.get("assigned_to") is not None and values["assigned_to"] not in users:
+            results[index] = {"index": index, "status": "error", "error": "Assignee not found"}
+        else:
+            continue
+        del pending[index]
+
+async def create_many(db: AsyncSession, kind: BulkKind, items: list, creator_id: int) -> Tuple[list, list, Optional[int]]:
+    """Insert every valid item in one INSERT ... RETURNING.
+
+    Returns the per-item results, in request order, the created rows as
+    (id, project_id, status) tuples and the last change log seq.
+    """
+    results: List[Optional[dict]] = [None] * len(items)
+    pending: Dict[int, dict] = {}
+    for index, item in enumerate(items):
+        values, error = check_item(kind, item, creating=True)
+        if error:
+            results[index] = {"index": index, "status": "error", "error": error}
+        else:
+            pending[index] = values
+    await _check_references(db, pending, results)
+
+    created, seq = [], None
+    if pending:
+        model = kind.model
+        rows = [dict(kind.defaults, **values, **{kind.creator_field: creator_id}) for values in pending.values()]
+        stmt = insert(model).returning(model.id, model.project_id, model.status, sort_by_parameter_order=True)
+        created = (await db.execute(stmt, rows)).all()
+        await rollups.record_transitions(db, kind.entity, [
+            (None, rollups.item_state(row["project_id"], row[kind.level_field], row["status"])) for row in rows
+        ])
+        seq = await changelog.record_changes(db, kind.entity, [row[:2] for row in created], f"{kind.entity}_created")
+        await db.commit()
+        for index, row in zip(pending, created):
+            results[index] = {"index": index, "status": "created", "id": row.id}
+    return results, created, seq
+
+async def update_many(db: AsyncSession, kind: BulkKind, items: list, current_user: Principal) -> Tuple[list, list, Optional[int]]:
+    """Apply every valid item as one executemany UPDATE by primary key.
+
+    Returns the per-item results, the updated rows as
+    (id, project_id, old_status, new_status) tuples and the last change
+    log seq.
+    """
+    model = kind.model
+    results: List[Optional[dict]] = [None] * len(items)
+    pending: Dict[int, dict] = {}
+    seen = set()
+    for index, item in enumerate(items):
+        values, error = check_item(kind, item, creating=False)
+        if not error and values["id"] in seen:
+            error = "Duplicate id in batch"
+        if error:
+            results[index] = {"index": index, "status": "error", "error": error}
+        else:
+            seen.add(values["id"])
+            pending[index] = values
+
+    # Current state of every targeted row, in one query
+    current = {}
+    if seen:
+        stmt = select(model.id, model.project_id, model.status, getattr(model, kind.level_field),
+                      model.assigned_to, getattr(model, kind.creator_field))
+        current = {row.id: row for row in await db.execute(stmt.where(model.id.in_(seen)))}
+    privileged = current_user.role.value in ("admin", "manager")
+    for index, values in list(pending.items()):
+        row = current.get(values["id"])
+        if row is None:
+            results[index] = {"index": index, "status": "error", "error": "Not found"}
+        elif (kind is BUGS and not privileged and
+              current_user.id not in (row.assigned_to, getattr(row, kind.creator_field))):
+            results[index] = {"index": index, "status": "error", "error": "Not enough permissions"}
+        else:
+            continue
+        del pending[index]
+    await _check_references(db, pending, results)
+
+    updated, seq = [], None
+    if pending:
+        now = datetime.utcnow()
+        await db.execute(update(model), [dict(values, updated_at=now) for values in pending.values()])
+        transitions = []
+        for values in pending.values():
+            row = current[values["id"]]
+            level = getattr(row, kind.level_field)
+            transitions.append((
+                rollups.item_state(row.project_id, level, row.status),
+                rollups.item_state(row.project_id, values.get(kind.level_field, level), values.get("status", row.status)),
+            ))
+        await rollups.record_transitions(db, kind.entity, transitions)
+        changes = [(values["id"], current[values["id"]].project_id) for values in pending.values()]
+        seq = await changelog.record_changes(db, kind.entity, changes, f"{kind.entity}_updated")
+        await db.commit()
+        for index, values in pending.items():
+            row = current[values["id"]]
+            results[index] = {"index": index, "status": "updated", "id": row.id}
+            updated.append((row.id, row.project_id, row.status, values.get("status", row.status)))
+    return results, updated, seq
+
+def summarize(results: list) -> dict:
+    """Response body for a batch: counts plus the per-item results."""
+    ok = sum(1 for result in results if result["status"] != "error")
+    return {"succeeded": ok, "failed": len(results) - ok, "results": results}
@@ -0,0 +1,173 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import delete, exists, func, insert, literal, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import AsyncSessionLocal
+from .models import Project, Task, Bug, ChangeLog, ChangeLogState
+from .schemas import ProjectOut, TaskOut, BugOut
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+# Entity name in the log -> (model, schema of its current state)
+ENTITIES = {
+    "project": (Project, ProjectOut),
+    "task": (Task, TaskOut),
+    "bug": (Bug, BugOut),
+}
+
+# Arbitrary key for the Postgres advisory lock that orders log appends
+APPEND_LOCK_KEY = 7346201
+
+async def _lock_for_append(db: AsyncSession):
+    # Postgres assigns sequence values at insert time, not at commit, so two
+    # concurrent writers could commit seq 11 before seq 10 and a reader (or
+    # a client resuming from a live event's seq) that saw 11 would never see
+    # 10. Holding a transaction-scoped lock from the append until commit
+    # keeps seq order equal to commit order. SQLite already serializes
+    # writers.
+    #
+    # The cost: only one transaction database-wide can be between its append
+    # and its commit, so write throughput is capped at roughly one commit
+    # round trip (including the WAL flush) per write. Callers append as the
+    # last statement before committing to keep that window to the commit
+    # itself; row writes, rollups and reference checks run before it,
+    # concurrently with other writers.
+    if db.bind.dialect.name == "postgresql":
+        await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": APPEND_LOCK_KEY})
+
+async def record_changes(db: AsyncSession, entity: str, changes: List[Tuple[int, Optional[int]]],
+                         event_type: str, op: str = UPSERT) -> Optional[int]:
+    """Append (entity_id, project_id) changes in the caller's transaction.
+
+    Call as the last statement before committing the write itself, since
+    the append holds the log lock until commit; returns the highest seq
+    assigned, which live events carry so clients know where to resume.
+    """
+    changes = list(dict.fromkeys(changes))
+    if not changes:
+        return None
+    await _lock_for_append(db)
+    rows = [
+        {"entity": entity, "entity_id": entity_id, "project_id": project_id, "op": op, "event_type": event_type}
+        for entity_id, project_id in changes
+    ]
+    seqs = (await db.scalars(insert(ChangeLog).returning(ChangeLog.seq), rows)).all()
+    return max(seqs)
+
+async def record_change(db: AsyncSession, entity: str, entity_id: int, project_id: Optional[int],
+                        event_type: str, op: str = UPSERT) -> int:
+    return await record_changes(db, entity, [(entity_id, project_id)], event_type, op)
+
+def backfill_change_log(engine: Engine):
+    """Log an upsert for every project, task and bug without a log entry.
+
+    Rows written outside the API (seed scripts, bulk loads, data from
+    before the log existed) are otherwise invisible to `since=0`.
+    """
+    with engine.begin() as conn:
+        for entity, (model, _) in ENTITIES.items():
+            project_id = model.id if model is Project else model.project_id
+            logged = exists().where(ChangeLog.entity == entity, ChangeLog.entity_id == model.id)
+            conn.execute(insert(ChangeLog).from_select(
+                ["entity", "entity_id", "project_id", "op", "event_type"],
+                select(literal(entity), model.id, project_id, literal(UPSERT), literal(f"{entity}_created"))
+                .where(~logged).order_by(model.id),
+            ))
+
+async def changes_since(db: AsyncSession, since: int, limit: int, project_id: Optional[int] = None) -> dict:
+    """Changes after `since`, oldest first, one per entity.
+
+    Upserts carry the entity's current state, which may be newer than the
+    logged change; entities that no longer exist come back as tombstones.
+    Raises 410 when `since` predates compacted tombstones or is ahead of
+    the log, meaning the client has to refetch the collections.
+    """
+    state = await db.get(ChangeLogState, 1)
+    if state is not None and since < state.compacted_through:
+        raise HTTPException(status_code=410, detail="Changes since this point were compacted; refetch the collections")
+
+    stmt = select(ChangeLog).where(ChangeLog.seq > since)
+    if project_id is not None:
+        stmt = stmt.where(ChangeLog.project_id == project_id)
+    entries = (await db.scalars(stmt.order_by(ChangeLog.seq).limit(limit + 1))).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if not entries:
+        head = await db.scalar(select(func.max(ChangeLog.seq))) or 0
+        if since > max(head, state.compacted_through if state else 0):
+            raise HTTPException(status_code=410, detail="since is ahead of the change log; refetch the collections")
+
+    # A later entry for the same entity supersedes earlier ones
+    latest: Dict[tuple, ChangeLog] = {}
+    for entry in entries:
+        latest.pop((entry.entity, entry.entity_id), None)
+        latest[(entry.entity, entry.entity_id)] = entry
+
+    current = {}
+    for entity, (model, schema) in ENTITIES.items():
+        ids = [entity_id for (name, entity_id), entry in latest.items() if name == entity and entry.op == UPSERT]
+        if ids:
+            rows = await db.execute(select(*schema.columns(model)).where(model.id.in_(ids)))
+            current.update({(entity, row.id): schema.from_row(row) for row in rows})
+
+    changes = []
+    for key, entry in latest.items():
+        change = {"seq": entry.seq, "entity": entry.entity, "id": entry.entity_id, "op": DELETE}
+        if entry.op == UPSERT and key in current:
+            change.update(op=UPSERT, event_type=entry.event_type, data=current[key])
+        changes.append(change)
+    return {
+        "changes": changes,
+        "last_seq": entries[-1].seq if entries else since,
+        "has_more": has_more,
+    }
+
+async def compact(db: AsyncSession, tombstone_retention: timedelta) -> dict:
+    """Drop superseded entries and expired tombstones.
+
+    Only the newest entry per entity and project is kept, so the log stays
+    about as large as the tables plus recent churn. Compaction never drops
+    the entry of a live entity, so `since=0` yields every entity that has
+    one; rows written around the API need `backfill_change_log` first.
+    Tombstones older than the retention are then dropped, and the horizon
+    moves past them.
+    """
+    head = await db.scalar(select(func.max(ChangeLog.seq)))
+    if head is None:
+        return {"superseded": 0, "tombstones": 0}
+
+    newest = (
+        select(func.max(ChangeLog.seq))
+        .where(ChangeLog.seq <= head)
+        .group_by(ChangeLog.entity, ChangeLog.entity_id, ChangeLog.project_id)
+    )
+    superseded = await db.execute(delete(ChangeLog).where(ChangeLog.seq <= head, ChangeLog.seq.not_in(newest)))
+
+    expired = (ChangeLog.op == DELETE, ChangeLog.created_at < datetime.utcnow() - tombstone_retention)
+    horizon = await db.scalar(select(func.max(ChangeLog.seq)).where(*expired))
+    tombstones = 0
+    if horizon is not None:
+        tombstones = (await db.execute(delete(ChangeLog).where(ChangeLog.seq <= horizon, *expired))).rowcount
+        state = await db.get(ChangeLogState, 1)
+        if state is None:
+            db.add(ChangeLogState(id=1, compacted_through=horizon))
+        else:
+            state.compacted_through = max(state.compacted_through, horizon)
+    await db.commit()
+    return {"superseded": superseded.rowcount, "tombstones": tombstones}
+
+async def compact_forever(interval: float, tombstone_retention: timedelta):
+    """Background task: compact the log every `interval` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionLocal() as db:
+                await compact(db, tombstone_retention)
+        except Exception as e:
+            print(f"Error compacting change log: {e}")
@@ -0,0 +1,136 @@
+import zlib
+from typing import Dict, Optional
+
+from starlette.datastructures import MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # br is only offered when the package is installed
+    brotli = None
+
+class GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+class BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+def accepted_encodings(header: str) -> Dict[str, float]:
+    """Content codings from an Accept-Encoding header, with their q-values."""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with brotli or gzip.
+
+    The coding is negotiated from Accept-Encoding, preferring br at equal
+    q-values. Bodies sent in one piece and smaller than `minimum_size` go
+    out uncompressed, since framing overhead and CPU outweigh the saving;
+    streamed bodies (NDJSON) are always compressed, as their size is not
+    known up front, and flushed after every chunk so each one reaches the
+    client as it is produced. Responses that already carry a
+    Content-Encoding are left alone.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders = {"gzip": lambda: GzipEncoder(gzip_level)}
+        if brotli is not None:
+            self.encoders["br"] = lambda: BrotliEncoder(brotli_quality)
+
+    def choose(self, scope) -> Optional[str]:
+        header = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                header = value.decode("latin-1")
+                break
+        accepted = accepted_encodings(header)
+        best, best_q = None, 0.0
+        for coding in ("br", "gzip"):
+            q = accepted.get(coding, accepted.get("*", 0.0))
+            if coding in self.encoders and q > best_q:
+                best, best_q = coding, q
+        return best
+
+    async def __call__(self, scope, receive, send):
+        coding = self.choose(scope) if scope["type"] == "http" else None
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        encoder = None
+
+        async def send_wrapper(message):
+            nonlocal start, encoder
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows how to send it
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                response_start, start = start, None
+                headers = MutableHeaders(scope=response_start)
+                if "content-encoding" in headers or (not more_body and (not body or len(body) < self.minimum_size)):
+                    await send(response_start)
+                    await send(message)
+                    return
+                encoder = self.encoders[coding]()
+                del headers["content-length"]
+                headers["content-encoding"] = coding
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body:
+                    body = encoder.compress(body) + encoder.finish()
+                    headers["content-length"] = str(len(body))
+                    await send(response_start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(response_start)
+
+            if encoder is None:
+                await send(message)
+                return
+            # Without a sync flush the compressor holds output back until it
+            # has a full block, and a stream would arrive all at the end
+            data = encoder.compress(body) + (encoder.flush() if more_body else encoder.finish())
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,4 +1,6 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Enum
+from sqlalchemy import create_engine, event, text, Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Enum
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.sql import func
@@ -9,18 +11,53 @@ import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import settings
+from .storage import apply_profile, engine_options
+
+# Async drivers used by the request path for each sync URL scheme
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+def to_async_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver (aiosqlite/asyncpg)."""
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
 
 # Database setup
-engine = create_engine(settings.DATABASE_URL)
+# The sync engine backs scripts and schema management; request handlers use
+# the async engine so queries never block the event loop.
+# Both are tuned by the storage profile (WAL and friends on SQLite, pool
+# sizing on Postgres); only requests get the statement timeout, since the
+# sync engine runs migrations, index builds and exports.
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL, settings.STORAGE_PROFILE,
+                                                                statement_timeout=False))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ASYNC_DATABASE_URL = to_async_url(settings.DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, settings.STORAGE_PROFILE))
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+for _target in (engine, async_engine.sync_engine):
+    apply_profile(_target, settings.STORAGE_PROFILE)
+
+# Count and time every statement for /metrics
+if settings.METRICS_ENABLED:
+    from .metrics import before_cursor_execute, after_cursor_execute
+    for _target in (engine, async_engine.sync_engine):
+        event.listen(_target, "before_cursor_execute", before_cursor_execute)
+        event.listen(_target, "after_cursor_execute", after_cursor_execute)
+
+# Statement logs for query budgets and the N+1 detector; a no-op unless one is active
+from . import query_log
+for _target in (engine, async_engine.sync_engine):
+    event.listen(_target, "after_cursor_execute", query_log.after_cursor_execute)
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # Enums
 class UserRole(enum.Enum):
@@ -53,6 +90,36 @@ class BugStatus(enum.Enum):
     fixed = "fixed"
     closed = "closed"
 
-# Create all tables
-def create_tables():
-    Base.metadata.create_all(bind=engine)
+# Schema management: Alembic migrations in backend/migrations
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+def upgrade_schema():
+    """Apply any pending migrations (`alembic upgrade head`) to DATABASE_URL."""
+    from alembic import command
+    from alembic.config import Config
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.upgrade(config, "head")
+
+def latest_revision() -> str:
+    # Revision ids are the numeric prefixes of the files (0005_daily_rollups.py)
+    names = os.listdir(os.path.join(MIGRATIONS_DIR, "versions"))
+    return max(name.split("_", 1)[0] for name in names if name[:1].isdigit() and name.endswith(".py"))
+
+async def check_schema_version():
+    """Fail fast unless the database is at the latest migration.
+    
+    One indexed read of alembic_version, so every worker can afford it on
+    boot; migrating is left to a single explicit `alembic upgrade head`.
+    """
+    async with async_engine.connect() as conn:
+        try:
+            current = await conn.scalar(text("SELECT version_num FROM alembic_version"))
+        except DBAPIError:
+            current = None
+    expected = latest_revision()
+    if current != expected:
+        raise RuntimeError(f"Database schema is at revision {current or 'none'}, expected {expected}: "
+                           f"run `alembic upgrade head` (or `python init_db.py`) in backend/ first")
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import uuid
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, List, Optional
+
+# Called with each envelope published by another worker
+EnvelopeHandler = Callable[[dict], Awaitable[None]]
+
+class EventBus(ABC):
+    """Pub/sub backend that carries WebSocket events between workers.
+
+    Each worker publishes envelopes for the events it broadcasts and receives
+    the envelopes of every other worker. A worker never gets its own
+    envelopes back: it has already delivered them to its local clients.
+    """
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+        self.published = 0
+        self.received = 0
+        self.dropped = 0
+
+    @abstractmethod
+    async def start(self, handler: EnvelopeHandler):
+        """Begin delivering other workers' envelopes to `handler`."""
+
+    @abstractmethod
+    def publish(self, envelope: dict):
+        """Queue an envelope for other workers; never waits on the network."""
+
+    async def close(self):
+        pass
+
+class InProcessBroker:
+    """Shared channel for InProcessEventBus instances in one process."""
+
+    def __init__(self):
+        self.buses: List["InProcessEventBus"] = []
+
+class InProcessEventBus(EventBus):
+    """Event bus for tests: buses sharing a broker act like separate workers.
+
+    Everything stays in one process, so it cannot connect real workers.
+    """
+
+    def __init__(self, broker: Optional[InProcessBroker] = None):
+        super().__init__()
+        self.broker = broker or InProcessBroker()
+        self.handler: Optional[EnvelopeHandler] = None
+
+    async def start(self, handler: EnvelopeHandler):
+        self.handler = handler
+        self.broker.buses.append(self)
+
+    def publish(self, envelope: dict):
+        envelope = dict(envelope, origin=self.origin)
+        self.published += 1
+        for bus in self.broker.buses:
+            if bus is not self and bus.handler is not None:
+                bus.received += 1
+                asyncio.create_task(bus.handler(envelope))
+
+    async def close(self):
+        if self in self.broker.buses:
+            self.broker.buses.remove(self)
+
+class RedisEventBus(EventBus):
+    """Redis pub/sub backend for running several workers or nodes.
+
+    Envelopes are buffered for up to `batch_window` seconds and sent as one
+    Redis message per batch, so a burst of writes costs one PUBLISH.
+    """
+
+    def __init__(self, url: str, channel: str, batch_window: float = 0.005,
+                 max_batch: int = 500, max_pending: int = 10000):
+        super().__init__()
+        self.url = url
+        self.channel = channel
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.outbox: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.redis = None
+        self.tasks: List[asyncio.Task] = []
+
+    async def start(self, handler: EnvelopeHandler):
+        import redis.asyncio as redis
+
+        self.redis = redis.from_url(self.url)
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        self.tasks = [
+            asyncio.create_task(self._listen(pubsub, handler)),
+            asyncio.create_task(self._flush()),
+        ]
+
+    def publish(self, envelope: dict):
+        try:
+            self.outbox.put_nowait(dict(envelope, origin=self.origin))
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def close(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        if self.redis is not None:
+            await self.redis.close()
+
+    async def _flush(self):
+        while True:
+            batch = [await self.outbox.get()]
+            await asyncio.sleep(self.batch_window)
+            while len(batch) < self.max_batch and not self.outbox.empty():
+                batch.append(self.outbox.get_nowait())
+            try:
+                await self.redis.publish(self.channel, json.dumps(batch))
+                self.published += len(batch)
+            except Exception as e:
+                self.dropped += len(batch)
+                print(f"Error publishing WebSocket events: {e}")
+
+    async def _listen(self, pubsub, handler: EnvelopeHandler):
+        while True:
+            try:
+                async for message in pubsub.listen():
+                    await self._dispatch(message["data"], handler)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # redis-py reconnects and resubscribes on the next read
+                print(f"Error receiving WebSocket events: {e}")
+                await asyncio.sleep(1)
+
+    async def _dispatch(self, data, handler: EnvelopeHandler):
+        try:
+            batch = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        for envelope in batch:
+            if envelope.get("origin") == self.origin:
+                continue
+            self.received += 1
+            await handler(envelope)
+
+def create_event_bus(backend: str, redis_url: str, channel: str, batch_ms: float,
+                     workers: int = 1) -> Optional[EventBus]:
+    """Build the configured bus; "local" means a single worker and no bus.
+
+    "local" and "memory" (a process-local bus for tests) are refused when
+    `workers` says the app runs in several processes: each worker would
+    miss the others' writes, and keep answering 304 for lists they changed.
+    """
+    if backend in ("local", "memory") and workers > 1:
+        raise ValueError(f"EVENT_BUS_BACKEND={backend} only works in one process, not {workers} workers; use redis")
+    if backend == "local":
+        return None
+    if backend == "redis":
+        return RedisEventBus(redis_url, channel, batch_window=batch_ms / 1000)
+    if backend == "memory":
+        return InProcessEventBus()
+    raise ValueError(f"Unknown EVENT_BUS_BACKEND: {backend}")
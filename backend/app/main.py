@@ -1,16 +1,29 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends, HTTPException, status
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends, HTTPException, status, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Type
 import asyncio
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
-from .models import User, Project, Task, Bug
-from .auth import get_current_user, create_access_token, verify_password, get_password_hash
+from .models import User, Project, Task, Bug, ArchivedTask, ArchivedBug
+from .auth import get_current_user, create_access_token, verify_and_update_password, hash_password
+from .principal_cache import Principal
 from .websocket_manager import ConnectionManager
-from .database import get_db, create_tables
+from .event_bus import create_event_bus
+from .database import get_db, check_schema_version, AsyncSessionLocal
+from .pagination import MAX_PAGE_SIZE, paginate, stream_ndjson
+from .search import MAX_SEARCH_RESULTS, search_items
+from .analytics import DashboardCounters
+from .schemas import Schema, UserOut, ProjectOut, TaskOut, BugOut
+from .responses import ORJSONResponse, dumps
+from .versions import CollectionVersions, etag_matches, cache_headers, not_modified
+from .compression import CompressionMiddleware
+from . import archive, bulk, changelog, metrics, query_log, rollups
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,26 +31,47 @@ from config import settings
 
 app = FastAPI(title="DevTrack API", version="1.0.0")
 
-# Create database tables on startup
 @app.on_event("startup")
 async def startup_event():
-    create_tables()
-    # Initialize sample data if database is empty
-    db = next(get_db())
-    try:
-        # Check if we already have data
-        user_count = db.query(User).count()
-        if user_count == 0:
-            print("Initializing sample data...")
-            # Import and run the initialization
-            sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            from init_db import init_database
-            init_database()
-            print("Sample data initialized successfully!")
-    except Exception as e:
-        print(f"Error initializing sample data: {e}")
-    finally:
-        db.close()
+    # Migrations and sample data are explicit steps (alembic upgrade head,
+    # init_db.py); workers only refuse to serve an out-of-date schema
+    await check_schema_version()
+
+    # Share broadcasts with the other workers when a bus is configured
+    bus = create_event_bus(settings.EVENT_BUS_BACKEND, settings.REDIS_URL,
+                           settings.EVENT_BUS_CHANNEL, settings.EVENT_BUS_BATCH_MS, settings.WORKERS)
+    if bus is not None:
+        # Writes on other workers invalidate this worker's ETags and counts too
+        def on_remote_event(project_id):
+            versions.invalidate(project_id)
+            counters.invalidate(project_id)
+        manager.on_remote_event = on_remote_event
+        await manager.attach_bus(bus)
+    
+    # Keep the dashboard counters honest against the real table counts
+    app.state.counter_reconciler = asyncio.create_task(
+        counters.reconcile_forever(settings.ANALYTICS_RECONCILE_SECONDS)
+    )
+    
+    # Keep the change log to about one entry per entity
+    app.state.change_log_compactor = asyncio.create_task(changelog.compact_forever(
+        settings.CHANGE_LOG_COMPACT_SECONDS, timedelta(days=settings.CHANGE_LOG_TOMBSTONE_DAYS)
+    ))
+    
+    # Move long-finished tasks and bugs out of the hot tables
+    if settings.ARCHIVE_AFTER_DAYS > 0:
+        app.state.archiver = asyncio.create_task(archive.archive_forever(
+            settings.ARCHIVE_INTERVAL_SECONDS, timedelta(days=settings.ARCHIVE_AFTER_DAYS),
+            settings.ARCHIVE_BATCH_SIZE, on_archived
+        ))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for name in ("counter_reconciler", "change_log_compactor", "archiver"):
+        task = getattr(app.state, name, None)
+        if task:
+            task.cancel()
+    await manager.detach_bus()
 
 # CORS middleware
 app.add_middleware(
@@ -46,48 +80,171 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# gzip/brotli for list payloads; inside the metrics middleware, so its time counts
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+# Per-route latency and SQL counts for /metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# Log repeated same-shape queries within a request (N+1 patterns)
+if settings.QUERY_DEBUG:
+    app.add_middleware(query_log.QueryDebugMiddleware, threshold=settings.QUERY_DEBUG_REPEAT_THRESHOLD)
+
 # WebSocket connection manager
-manager = ConnectionManager()
+manager = ConnectionManager(
+    settings.WEBSOCKET_SEND_QUEUE_SIZE,
+    settings.WEBSOCKET_OVERFLOW_POLICY,
+    coalesce_window=settings.WEBSOCKET_COALESCE_MS / 1000,
+)
+if settings.METRICS_ENABLED:
+    metrics.track_websockets(manager)
+
+# Cached dashboard counts, maintained by the write handlers
+counters = DashboardCounters()
+
+# Collection versions behind the list endpoints' ETags
+versions = CollectionVersions()
 
 # Security
 security = HTTPBearer()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Replayed events per WebSocket frame
+REPLAY_FRAME_SIZE = 100
+
+async def list_response(db: AsyncSession, stmt, model, schema: Type[Schema], limit: Optional[int],
+                  cursor: Optional[str], sort: str, format: str, etag: str):
+    """Serve a list endpoint as a keyset page or as an NDJSON stream.
+
+    `stmt` selects `schema.columns(model)`. Pages keep the plain JSON array
+    body, encoded by orjson; the cursor for the next page, if any, is
+    returned in the X-Next-Cursor header. `etag` must be read before the
+    query runs, so a write landing mid-request can only make it stale.
+    """
+    headers = cache_headers(etag)
+    if format == "ndjson":
+        return StreamingResponse(stream_ndjson(stmt, model, schema, limit, cursor, sort),
+                                 media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+    items, next_cursor = await paginate(db, stmt, model, schema, limit, cursor, sort)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return ORJSONResponse(items, headers=headers)
+
+def event_message(event_type: str, data: dict, seq: Optional[int] = None) -> str:
+    """Encode a WebSocket event; enums and datetimes become plain JSON values.
+    
+    `seq` is the change log position of the write, which clients pass back
+    as `last_seq` when they reconnect.
+    """
+    event = {"type": event_type, "data": jsonable_encoder(data)}
+    if seq is not None:
+        event["seq"] = seq
+    return json.dumps(event)
+
+async def broadcast_batch(event_type: str, rows, seq: Optional[int]) -> None:
+    """Send one summary event per project touched by a batch."""
+    ids_by_project: Dict[int, List[int]] = {}
+    for row in rows:
+        ids_by_project.setdefault(row[1], []).append(row[0])
+    for project_id, ids in ids_by_project.items():
+        await manager.broadcast_to_project(event_message(event_type, {
+            "project_id": project_id,
+            "count": len(ids),
+            "ids": ids
+        }, seq), project_id)
+
+async def on_archived(entity: str, rows, seq: Optional[int]) -> None:
+    """Tell clients about archived rows, which leave the default listings."""
+    collection = f"{entity}s"
+    versions.bump(collection, *(row[1] for row in rows))
+    await broadcast_batch(f"{collection}_batch_archived", rows, seq)
+
+# Columns keyset pagination reads from the model, selected or not
+KEYSET_COLUMNS = ("id", "updated_at", "created_at")
+
+def list_select(schema: Type[Schema], project_id: Optional[int], *models):
+    """Select `schema` columns from one model, or from several as one relation.
+    
+    Returns the statement and what stands in for the model when paginating:
+    the model itself, or the columns of the union. Archived rows keep their
+    ids, which never collide with live ones.
+    """
+    if len(models) == 1:
+        stmt = select(*schema.columns(models[0]))
+        if project_id:
+            stmt = stmt.where(models[0].project_id == project_id)
+        return stmt, models[0]
+    
+    names = list(dict.fromkeys([*schema.model_fields, *KEYSET_COLUMNS]))
+    selects = []
+    for model in models:
+        stmt = select(*(getattr(model, name) for name in names))
+        if project_id:
+            stmt = stmt.where(model.project_id == project_id)
+        selects.append(stmt)
+    source = union_all(*selects).subquery(models[0].__tablename__)
+    return select(*schema.columns(source.c)), source.c
+
+def list_variant(schema: Type[Schema], full: Type[Schema], include_archived: bool) -> Optional[str]:
+    """ETag variant for a list narrowed by `fields=` and/or including archived rows."""
+    parts = []
+    if include_archived:
+        parts.append("archived")
+    if schema is not full:
+        parts.append(".".join(schema.model_fields))
+    return "-".join(parts) or None
+
 @app.get("/")
 async def root():
     return {"message": "DevTrack API is running!"}
 
 # Authentication endpoints
 @app.post("/auth/login")
-async def login(credentials: dict, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == credentials["email"]).first()
-    if not user or not verify_password(credentials["password"], user.hashed_password):
+async def login(credentials: dict, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(User).where(User.email == credentials["email"]))
+    user = result.scalars().first()
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await verify_and_update_password(credentials["password"], user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
     
-    access_token = create_access_token(data={"sub": user.email, "role": user.role})
+    # Transparently upgrade hashes made with a different bcrypt cost
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
+    access_token = create_access_token(data={"sub": user.email, "role": user.role.value})
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "user": {
-            "id": user.id,
-            "email": user.email,
-            "username": user.username,
-            "role": user.role
-        }
+        "user": UserOut.model_validate(user)
     }
 
 @app.post("/auth/register")
-async def register(user_data: dict, db: Session = Depends(get_db)):
+async def register(user_data: dict, db: AsyncSession = Depends(get_db)):
     # Check if user exists
-    if db.query(User).filter(User.email == user_data["email"]).first():
+    existing = await db.execute(select(User.id).where(User.email == user_data["email"]))
+    if existing.first():
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create new user
-    hashed_password = get_password_hash(user_data["password"])
+    hashed_password = await hash_password(user_data["password"])
     user = User(
         email=user_data["email"],
         username=user_data["username"],
@@ -95,29 +252,35 @@ async def register(user_data: dict, db: Session = Depends(get_db)):
         role=user_data.get("role", "developer")
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     
     access_token = create_access_token(data={"sub": user.email, "role": user.role.value})
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "user": {
-            "id": user.id,
-            "email": user.email,
-            "username": user.username,
-            "role": user.role
-        }
+        "user": UserOut.model_validate(user)
     }
 
 # Project endpoints
-@app.get("/projects")
-async def get_projects(db: Session = Depends(get_db)):
-    projects = db.query(Project).all()
-    return projects
+@app.get("/projects", response_model=List[ProjectOut])
+async def get_projects(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    etag = versions.etag("projects")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    stmt = select(*ProjectOut.columns(Project))
+    return await list_response(db, stmt, Project, ProjectOut, limit, cursor, sort, format, etag)
 
-@app.post("/projects")
-async def create_project(project_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@app.post("/projects", response_model=ProjectOut)
+async def create_project(project_data: dict, current_user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     if current_user.role not in ["admin", "manager"]:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
@@ -127,33 +290,49 @@ async def create_project(project_data: dict, current_user: User = Depends(get_cu
         owner_id=current_user.id
     )
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    await db.flush()
+    seq = await changelog.record_change(db, "project", project.id, project.id, "project_created")
+    await db.commit()
+    await db.refresh(project)
+    counters.project_created()
+    versions.bump("projects")
     
     # Broadcast project creation
-    await manager.broadcast(json.dumps({
-        "type": "project_created",
-        "data": {
-            "id": project.id,
-            "name": project.name,
-            "description": project.description,
-            "created_at": project.created_at.isoformat()
-        }
-    }))
+    await manager.broadcast(event_message("project_created", {
+        "id": project.id,
+        "name": project.name,
+        "description": project.description,
+        "created_at": project.created_at.isoformat()
+    }, seq))
     
     return project
 
 # Task endpoints
-@app.get("/tasks")
-async def get_tasks(project_id: int = None, db: Session = Depends(get_db)):
-    query = db.query(Task)
-    if project_id:
-        query = query.filter(Task.project_id == project_id)
-    tasks = query.all()
-    return tasks
-
-@app.post("/tasks")
-async def create_task(task_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@app.get("/tasks", response_model=List[TaskOut])
+async def get_tasks(
+    project_id: int = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    include_archived: bool = False,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    schema = TaskOut.only(fields)
+    etag = versions.etag("tasks", project_id or None, list_variant(schema, TaskOut, include_archived))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    # Archived rows only change when archival moves more in, which bumps the version
+    models = (Task, ArchivedTask) if include_archived else (Task,)
+    stmt, model = list_select(schema, project_id, *models)
+    return await list_response(db, stmt, model, schema, limit, cursor, sort, format, etag)
+
+@app.post("/tasks", response_model=TaskOut)
+async def create_task(task_data: dict, current_user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    task_data = bulk.checked_body(bulk.TASKS, task_data)
     task = Task(
         title=task_data["title"],
         description=task_data.get("description", ""),
@@ -164,53 +343,78 @@ async def create_task(task_data: dict, current_user: User = Depends(get_current_
         created_by=current_user.id
     )
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    await db.flush()
+    await rollups.record_transitions(db, "task", [(None, rollups.item_state(task.project_id, task.priority, task.status))])
+    seq = await changelog.record_change(db, "task", task.id, task.project_id, "task_created")
+    await db.commit()
+    await db.refresh(task)
+    counters.task_created(task.status)
+    versions.bump("tasks", task.project_id)
     
     # Broadcast task creation
-    await manager.broadcast(json.dumps({
-        "type": "task_created",
-        "data": {
-            "id": task.id,
-            "title": task.title,
-            "status": task.status,
-            "priority": task.priority,
-            "project_id": task.project_id,
-            "created_at": task.created_at.isoformat()
-        }
-    }))
+    await manager.broadcast_to_project(event_message("task_created", {
+        "id": task.id,
+        "title": task.title,
+        "status": task.status,
+        "priority": task.priority,
+        "project_id": task.project_id,
+        "created_at": task.created_at.isoformat()
+    }, seq), task.project_id)
     
     return task
 
-@app.put("/tasks/{task_id}")
-async def update_task(task_id: int, task_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    task = db.query(Task).filter(Task.id == task_id).first()
+@app.put("/tasks/{task_id}", response_model=TaskOut)
+async def update_task(task_id: int, task_data: dict, current_user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
+    task_data = bulk.checked_body(bulk.TASKS, task_data, task_id, movable=("project_id",))
+    old_status, old_project_id = task.status, task.project_id
+    old_state = rollups.item_state(task.project_id, task.priority, task.status)
     for key, value in task_data.items():
         setattr(task, key, value)
     
     task.updated_at = datetime.utcnow()
-    db.commit()
+    await rollups.record_transitions(db, "task", [(old_state, rollups.item_state(task.project_id, task.priority, task.status))])
+    # A task moved between projects shows up in both projects' change feeds
+    seq = await changelog.record_changes(db, "task", [(task.id, old_project_id), (task.id, task.project_id)], "task_updated")
+    await db.commit()
+    counters.task_status_changed(old_status, task.status)
+    versions.bump("tasks", old_project_id, task.project_id)
     
     # Broadcast task update
-    await manager.broadcast(json.dumps({
-        "type": "task_updated",
-        "data": {
-            "id": task.id,
-            "title": task.title,
-            "status": task.status,
-            "priority": task.priority,
-            "updated_at": task.updated_at.isoformat()
-        }
-    }))
+    await manager.broadcast_to_project(event_message("task_updated", {
+        "id": task.id,
+        "title": task.title,
+        "status": task.status,
+        "priority": task.priority,
+        "updated_at": task.updated_at.isoformat()
+    }, seq), task.project_id, old_project_id)
     
     return task
 
-@app.put("/projects/{project_id}")
-async def update_project(project_id: int, project_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    project = db.query(Project).filter(Project.id == project_id).first()
+@app.post("/tasks:batch")
+async def create_tasks_batch(payload: dict, current_user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    results, created, seq = await bulk.create_many(db, bulk.TASKS, bulk.batch_items(payload), current_user.id)
+    for _, _, new_status in created:
+        counters.task_created(new_status)
+    versions.bump("tasks", *(row[1] for row in created))
+    await broadcast_batch("tasks_batch_created", created, seq)
+    return bulk.summarize(results)
+
+@app.patch("/tasks:batch")
+async def update_tasks_batch(payload: dict, current_user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    results, updated, seq = await bulk.update_many(db, bulk.TASKS, bulk.batch_items(payload), current_user)
+    for _, _, old_status, new_status in updated:
+        counters.task_status_changed(old_status, new_status)
+    versions.bump("tasks", *(row[1] for row in updated))
+    await broadcast_batch("tasks_batch_updated", updated, seq)
+    return bulk.summarize(results)
+
+@app.put("/projects/{project_id}", response_model=ProjectOut)
+async def update_project(project_id: int, project_data: dict, current_user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -227,34 +431,47 @@ async def update_project(project_id: int, project_data: dict, current_user: User
         project.is_active = project_data["is_active"]
     
     project.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(project)
+    seq = await changelog.record_change(db, "project", project.id, project.id, "project_updated")
+    await db.commit()
+    await db.refresh(project)
+    versions.bump("projects")
     
     # Broadcast project update
-    await manager.broadcast(json.dumps({
-        "type": "project_updated",
-        "data": {
-            "id": project.id,
-            "name": project.name,
-            "description": project.description,
-            "is_active": project.is_active,
-            "updated_at": project.updated_at.isoformat()
-        }
-    }))
+    await manager.broadcast(event_message("project_updated", {
+        "id": project.id,
+        "name": project.name,
+        "description": project.description,
+        "is_active": project.is_active,
+        "updated_at": project.updated_at.isoformat()
+    }, seq))
     
     return project
 
 # Bug endpoints
-@app.get("/bugs")
-async def get_bugs(project_id: int = None, db: Session = Depends(get_db)):
-    query = db.query(Bug)
-    if project_id:
-        query = query.filter(Bug.project_id == project_id)
-    bugs = query.all()
-    return bugs
-
-@app.post("/bugs")
-async def create_bug(bug_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@app.get("/bugs", response_model=List[BugOut])
+async def get_bugs(
+    project_id: int = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    include_archived: bool = False,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    schema = BugOut.only(fields)
+    etag = versions.etag("bugs", project_id or None, list_variant(schema, BugOut, include_archived))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    models = (Bug, ArchivedBug) if include_archived else (Bug,)
+    stmt, model = list_select(schema, project_id, *models)
+    return await list_response(db, stmt, model, schema, limit, cursor, sort, format, etag)
+
+@app.post("/bugs", response_model=BugOut)
+async def create_bug(bug_data: dict, current_user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    bug_data = bulk.checked_body(bulk.BUGS, bug_data)
     bug = Bug(
         title=bug_data["title"],
         description=bug_data.get("description", ""),
@@ -265,27 +482,29 @@ async def create_bug(bug_data: dict, current_user: User = Depends(get_current_us
         reported_by=current_user.id
     )
     db.add(bug)
-    db.commit()
-    db.refresh(bug)
+    await db.flush()
+    await rollups.record_transitions(db, "bug", [(None, rollups.item_state(bug.project_id, bug.severity, bug.status))])
+    seq = await changelog.record_change(db, "bug", bug.id, bug.project_id, "bug_created")
+    await db.commit()
+    await db.refresh(bug)
+    counters.bug_created(bug.status)
+    versions.bump("bugs", bug.project_id)
     
     # Broadcast bug creation
-    await manager.broadcast(json.dumps({
-        "type": "bug_created",
-        "data": {
-            "id": bug.id,
-            "title": bug.title,
-            "severity": bug.severity,
-            "status": bug.status,
-            "project_id": bug.project_id,
-            "created_at": bug.created_at.isoformat()
-        }
-    }))
+    await manager.broadcast_to_project(event_message("bug_created", {
+        "id": bug.id,
+        "title": bug.title,
+        "severity": bug.severity,
+        "status": bug.status,
+        "project_id": bug.project_id,
+        "created_at": bug.created_at.isoformat()
+    }, seq), bug.project_id)
     
     return bug
 
-@app.put("/bugs/{bug_id}")
-async def update_bug(bug_id: int, bug_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    bug = db.query(Bug).filter(Bug.id == bug_id).first()
+@app.put("/bugs/{bug_id}", response_model=BugOut)
+async def update_bug(bug_id: int, bug_data: dict, current_user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    bug = await db.get(Bug, bug_id)
     if not bug:
         raise HTTPException(status_code=404, detail="Bug not found")
     
@@ -296,6 +515,9 @@ async def update_bug(bug_id: int, bug_data: dict, current_user: User = Depends(g
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     # Update bug fields
+    bug_data = bulk.checked_body(bulk.BUGS, bug_data, bug_id)
+    old_status = bug.status
+    old_state = rollups.item_state(bug.project_id, bug.severity, bug.status)
     if "title" in bug_data:
         bug.title = bug_data["title"]
     if "description" in bug_data:
@@ -308,53 +530,184 @@ async def update_bug(bug_id: int, bug_data: dict, current_user: User = Depends(g
         bug.assigned_to = bug_data["assigned_to"]
     
     bug.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(bug)
+    await rollups.record_transitions(db, "bug", [(old_state, rollups.item_state(bug.project_id, bug.severity, bug.status))])
+    seq = await changelog.record_change(db, "bug", bug.id, bug.project_id, "bug_updated")
+    await db.commit()
+    await db.refresh(bug)
+    counters.bug_status_changed(old_status, bug.status)
+    versions.bump("bugs", bug.project_id)
     
     # Broadcast bug update
-    await manager.broadcast(json.dumps({
-        "type": "bug_updated",
-        "data": {
-            "id": bug.id,
-            "title": bug.title,
-            "status": bug.status,
-            "severity": bug.severity,
-            "updated_at": bug.updated_at.isoformat()
-        }
-    }))
+    await manager.broadcast_to_project(event_message("bug_updated", {
+        "id": bug.id,
+        "title": bug.title,
+        "status": bug.status,
+        "severity": bug.severity,
+        "updated_at": bug.updated_at.isoformat()
+    }, seq), bug.project_id)
     
     return bug
 
+@app.post("/bugs:batch")
+async def create_bugs_batch(payload: dict, current_user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    results, created, seq = await bulk.create_many(db, bulk.BUGS, bulk.batch_items(payload), current_user.id)
+    for _, _, new_status in created:
+        counters.bug_created(new_status)
+    versions.bump("bugs", *(row[1] for row in created))
+    await broadcast_batch("bugs_batch_created", created, seq)
+    return bulk.summarize(results)
+
+@app.patch("/bugs:batch")
+async def update_bugs_batch(payload: dict, current_user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    results, updated, seq = await bulk.update_many(db, bulk.BUGS, bulk.batch_items(payload), current_user)
+    for _, _, old_status, new_status in updated:
+        counters.bug_status_changed(old_status, new_status)
+    versions.bump("bugs", *(row[1] for row in updated))
+    await broadcast_batch("bugs_batch_updated", updated, seq)
+    return bulk.summarize(results)
+
 # Analytics endpoints
 @app.get("/analytics/dashboard")
-async def get_dashboard_analytics(db: Session = Depends(get_db)):
-    total_projects = db.query(Project).count()
-    total_tasks = db.query(Task).count()
-    total_bugs = db.query(Bug).count()
-    open_bugs = db.query(Bug).filter(Bug.status == "open").count()
-    completed_tasks = db.query(Task).filter(Task.status == "done").count()
-    
-    return {
-        "total_projects": total_projects,
-        "total_tasks": total_tasks,
-        "total_bugs": total_bugs,
-        "open_bugs": open_bugs,
-        "completed_tasks": completed_tasks,
-        "completion_rate": (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-    }
+async def get_dashboard_analytics(if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_db)):
+    # Only the first call after startup queries the database
+    await counters.ensure_loaded(db)
+    etag = counters.etag()
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return ORJSONResponse(counters.snapshot(), headers=cache_headers(etag))
+
+# Trend charts, read from the daily rollups
+@app.get("/analytics/burndown")
+async def get_burndown(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    type: Optional[str] = Query(None, pattern="^(task|bug)$"),
+    project_id: Optional[int] = None,
+    level: Optional[str] = Query(None, pattern="^(low|medium|high|critical)$"),
+    db: AsyncSession = Depends(get_db)
+):
+    start, end = rollups.date_range(start, end)
+    days = await rollups.burndown(db, start, end, type, project_id, level)
+    return ORJSONResponse({"start": start, "end": end, "days": days})
+
+@app.get("/analytics/created-vs-resolved")
+async def get_created_vs_resolved(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    type: Optional[str] = Query(None, pattern="^(task|bug)$"),
+    project_id: Optional[int] = None,
+    level: Optional[str] = Query(None, pattern="^(low|medium|high|critical)$"),
+    db: AsyncSession = Depends(get_db)
+):
+    start, end = rollups.date_range(start, end)
+    days = await rollups.created_vs_resolved(db, start, end, type, project_id, level)
+    return ORJSONResponse({"start": start, "end": end, "days": days})
+
+# Full-text search
+@app.get("/search")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[str] = Query(None, pattern="^(task|bug)$"),
+    project_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    hits, next_cursor = await search_items(db, q, limit, cursor, type, project_id)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return ORJSONResponse(hits, headers=headers)
+
+# Delta sync
+@app.get("/changes")
+async def get_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    project_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    return ORJSONResponse(await changelog.changes_since(db, since, limit, project_id))
+
+# Prometheus scrape endpoint; values are per worker process
+@app.get("/metrics")
+async def get_metrics():
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
 
 # WebSocket endpoint
 @app.websocket("/ws/{client_id}")
-async def websocket_endpoint(websocket: WebSocket, client_id: str):
+async def websocket_endpoint(websocket: WebSocket, client_id: str, last_seq: Optional[int] = None):
     await manager.connect(websocket, client_id)
+    if last_seq is not None:
+        await replay_changes(client_id, last_seq)
     try:
         while True:
             data = await websocket.receive_text()
-            # Echo the message or process it
-            await manager.send_personal_message(f"Message received: {data}", client_id)
+            try:
+                message = json.loads(data)
+            except ValueError:
+                message = None
+            
+            # Typed messages manage project subscriptions; anything else is echoed
+            if isinstance(message, dict) and message.get("type") in ("subscribe", "unsubscribe"):
+                await handle_subscription(client_id, message)
+            else:
+                await manager.send_personal_message(f"Message received: {data}", client_id)
     except WebSocketDisconnect:
-        manager.disconnect(client_id)
+        manager.disconnect(client_id, websocket)
+
+async def replay_changes(client_id: str, since: int):
+    """Queue what a reconnecting client missed since `since`, then go live.
+    
+    The client is registered before the log is read, so nothing falls in
+    between; an event may arrive both live and replayed. Replayed events
+    are packed into batch frames so they do not flood the send queue, and
+    a client too far behind is told to refetch instead.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            page = await changelog.changes_since(db, since, settings.WEBSOCKET_REPLAY_MAX)
+        except HTTPException:
+            page = None
+    if page is None or page["has_more"]:
+        await manager.send_personal_message(json.dumps({"type": "resync_required"}), client_id)
+        return
+    
+    events = [
+        {"type": change.get("event_type", f"{change['entity']}_deleted"), "seq": change["seq"],
+         "data": change.get("data", {"id": change["id"]})}
+        for change in page["changes"]
+    ]
+    for start in range(0, len(events), REPLAY_FRAME_SIZE):
+        frame = {"type": "batch", "events": events[start:start + REPLAY_FRAME_SIZE]}
+        await manager.send_personal_message(dumps(frame).decode(), client_id)
+    await manager.send_personal_message(json.dumps({"type": "replay_complete", "last_seq": page["last_seq"]}), client_id)
+
+async def handle_subscription(client_id: str, message: dict):
+    project_id = message.get("project_id")
+    if not isinstance(project_id, int) or isinstance(project_id, bool):
+        await manager.send_personal_message(json.dumps({
+            "type": "error",
+            "message": "project_id must be an integer"
+        }), client_id)
+        return
+    
+    if message["type"] == "subscribe":
+        manager.subscribe(client_id, project_id)
+    else:
+        manager.unsubscribe(client_id, project_id)
+    await manager.send_personal_message(json.dumps({
+        "type": f"{message['type']}d",
+        "project_id": project_id
+    }), client_id)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    from .ws_compression import DeflateThresholdWebSocketProtocol
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        ws=DeflateThresholdWebSocketProtocol,
+        ws_per_message_deflate=settings.WEBSOCKET_PER_MESSAGE_DEFLATE,
+    )
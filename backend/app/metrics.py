@@ -0,0 +1,196 @@
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Default latency buckets, in seconds (the same as the official clients)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric:
+    """Base for metrics keyed by a tuple of label values."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels[name] for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(lines + self.samples())
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), collect: Optional[Callable[[], float]] = None):
+        super().__init__(name, help, labelnames)
+        self.values: Dict[tuple, float] = {}
+        # Read the value from elsewhere at scrape time instead of inc()
+        self.collect = collect
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        if self.collect is not None:
+            return [f"{self.name} {_number(self.collect())}"]
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}" for key, value in self.values.items()]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        # Label values -> [count per bucket (not cumulative), sum, count]
+        self.series: Dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = [[0] * len(self.buckets), 0.0, 0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][index] += 1
+                break
+        series[1] += value
+        series[2] += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in self.series.items():
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, counts):
+                cumulative += bucket
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self.metrics) + "\n"
+
+registry = Registry()
+
+REQUEST_SECONDS = registry.register(Histogram(
+    "devtrack_http_request_duration_seconds", "HTTP request latency by route.", ("method", "route", "status")))
+REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "devtrack_http_requests_in_flight", "HTTP requests currently being served."))
+REQUEST_STATEMENTS = registry.register(Histogram(
+    "devtrack_http_request_sql_statements", "SQL statements executed per HTTP request.", ("route",), STATEMENT_BUCKETS))
+REQUEST_DB_SECONDS = registry.register(Histogram(
+    "devtrack_http_request_db_seconds", "Time spent in SQL per HTTP request.", ("route",)))
+DB_STATEMENTS = registry.register(Counter(
+    "devtrack_db_statements_total", "SQL statements executed, in requests or not."))
+DB_SECONDS = registry.register(Counter(
+    "devtrack_db_seconds_total", "Time spent executing SQL statements."))
+WS_FANOUT_SECONDS = registry.register(Histogram(
+    "devtrack_websocket_fanout_seconds", "Time to queue one broadcast for every recipient.",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)))
+
+def track_websockets(manager):
+    """Expose a ConnectionManager's client count and drop counters."""
+    registry.register(Gauge("devtrack_websocket_connected_clients", "Connected WebSocket clients.",
+                            collect=manager.get_connected_count))
+    registry.register(Counter("devtrack_websocket_dropped_messages_total",
+                              "Messages not queued because a client's queue was full.",
+                              collect=lambda: manager.dropped_messages))
+    registry.register(Counter("devtrack_websocket_evicted_clients_total",
+                              "Clients disconnected for falling too far behind.",
+                              collect=lambda: manager.evicted_clients))
+    manager.on_fanout = WS_FANOUT_SECONDS.observe
+
+# [statements, seconds] for the HTTP request being handled, if any
+_request_queries: ContextVar[Optional[list]] = ContextVar("request_queries", default=None)
+
+# SQLAlchemy engine event hooks, installed in database.py
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.query_start = time.perf_counter()
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context.query_start
+    DB_STATEMENTS.inc()
+    DB_SECONDS.inc(elapsed)
+    queries = _request_queries.get()
+    if queries is not None:
+        queries[0] += 1
+        queries[1] += elapsed
+
+def _route(scope) -> str:
+    # The path template, not the raw path, so ids do not explode the series
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and SQL work per HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        queries = [0, 0.0]
+        token = _request_queries.set(queries)
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.dec()
+            _request_queries.reset(token)
+            route = _route(scope)
+            REQUEST_SECONDS.observe(elapsed, method=scope["method"], route=route, status=status[0])
+            REQUEST_STATEMENTS.observe(queries[0], route=route)
+            REQUEST_DB_SECONDS.observe(queries[1], route=route)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Boolean, ForeignKey, Enum, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -42,6 +42,14 @@ class Project(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    # Hot filter paths (migration 0002) and per-project keyset pagination
+    # in both sort orders (migration 0007)
+    __table_args__ = (
+        Index("ix_tasks_project_id_status", "project_id", "status"),
+        Index("ix_tasks_assigned_to_status", "assigned_to", "status"),
+        Index("ix_tasks_project_id_id", "project_id", "id"),
+        Index("ix_tasks_project_id_touched_at", "project_id", text("coalesce(updated_at, created_at)"), "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -61,6 +69,14 @@ class Task(Base):
 
 class Bug(Base):
     __tablename__ = "bugs"
+    # Hot filter paths (migration 0002) and per-project keyset pagination
+    # in both sort orders (migration 0007)
+    __table_args__ = (
+        Index("ix_bugs_project_id_status", "project_id", "status"),
+        Index("ix_bugs_assigned_to_status", "assigned_to", "status"),
+        Index("ix_bugs_project_id_id", "project_id", "id"),
+        Index("ix_bugs_project_id_touched_at", "project_id", text("coalesce(updated_at, created_at)"), "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -77,3 +93,98 @@ class Bug(Base):
     project = relationship("Project", back_populates="bugs")
     assignee = relationship("User", foreign_keys=[assigned_to], back_populates="assigned_bugs")
     reporter = relationship("User", foreign_keys=[reported_by], back_populates="reported_bugs")
+
+class ArchivedTask(Base):
+    """Done tasks moved out of `tasks` by the archival job (app/archive.py).
+    
+    Same columns and ids as `tasks`, plus when the row was archived, so the
+    hot table only holds the working set.
+    """
+    __tablename__ = "tasks_archive"
+    __table_args__ = (
+        Index("ix_tasks_archive_project_id", "project_id"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    title = Column(String, nullable=False)
+    description = Column(Text)
+    status = Column(Enum(TaskStatus))
+    priority = Column(Enum(TaskPriority))
+    project_id = Column(Integer)
+    assigned_to = Column(Integer)
+    created_by = Column(Integer)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ArchivedBug(Base):
+    """Closed bugs moved out of `bugs` by the archival job."""
+    __tablename__ = "bugs_archive"
+    __table_args__ = (
+        Index("ix_bugs_archive_project_id", "project_id"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    title = Column(String, nullable=False)
+    description = Column(Text)
+    severity = Column(Enum(BugSeverity))
+    status = Column(Enum(BugStatus))
+    project_id = Column(Integer)
+    assigned_to = Column(Integer)
+    reported_by = Column(Integer)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ChangeLog(Base):
+    """Append-only log of writes to projects, tasks and bugs.
+    
+    Each row records that an entity changed (op "upsert") or disappeared
+    (op "delete"); the entity's current state is read from its own table.
+    Rows are written in the same transaction as the change they describe.
+    """
+    __tablename__ = "change_log"
+    __table_args__ = (
+        Index("ix_change_log_entity_entity_id", "entity", "entity_id"),
+        Index("ix_change_log_project_id_seq", "project_id", "seq"),
+        # Clients resume from a seq, so one must never be handed out twice,
+        # even after compaction deletes the newest rows
+        {"sqlite_autoincrement": True},
+    )
+    
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String, nullable=False)  # project, task or bug
+    entity_id = Column(Integer, nullable=False)
+    project_id = Column(Integer)
+    op = Column(String, nullable=False)
+    event_type = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ChangeLogState(Base):
+    """Single row of change log bookkeeping."""
+    __tablename__ = "change_log_state"
+    
+    id = Column(Integer, primary_key=True)
+    # Highest seq whose tombstone compaction has discarded; clients that
+    # last synced before it must refetch
+    compacted_through = Column(Integer, nullable=False, default=0)
+
+class DailyRollup(Base):
+    """Per-day task and bug activity for one project and priority/severity.
+    
+    Flow columns count what happened that day; the *_delta columns are net
+    changes to the number of open and in-progress items, so a running sum
+    gives the counts on any day. Write handlers add to these rows in the
+    same transaction as the change (see app/rollups.py).
+    """
+    __tablename__ = "daily_rollups"
+    
+    project_id = Column(Integer, primary_key=True)  # 0 totals every project
+    day = Column(Date, primary_key=True)
+    entity = Column(String, primary_key=True)  # task or bug
+    level = Column(String, primary_key=True)  # task priority or bug severity
+    created = Column(Integer, nullable=False, default=0)
+    closed = Column(Integer, nullable=False, default=0)
+    reopened = Column(Integer, nullable=False, default=0)
+    open_delta = Column(Integer, nullable=False, default=0)
+    in_progress_delta = Column(Integer, nullable=False, default=0)
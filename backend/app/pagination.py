@@ -0,0 +1,154 @@
+import base64
+import json
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple, Type
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import DateTime, String, and_, func, or_, type_coerce
+from sqlalchemy.sql import Select
+from sqlalchemy.types import TypeDecorator
+
+from .database import AsyncSessionLocal
+from .responses import dumps
+from .schemas import Schema
+
+# Largest page a client may request
+MAX_PAGE_SIZE = 500
+
+# Rows fetched per round trip when streaming NDJSON
+STREAM_BATCH_SIZE = 500
+
+SORT_KEYS = ("id", "updated_at")
+
+def encode_cursor(values: list) -> str:
+    """Encode keyset values into an opaque cursor string."""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> list:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or not values:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def validate_sort(sort: str) -> str:
+    """Reject sort keys that have no keyset ordering."""
+    if sort not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(SORT_KEYS)}")
+    return sort
+
+class SortTimestamp(TypeDecorator):
+    """Timestamp type of the updated_at sort key.
+
+    Postgres compares real timestamps, so cursor values are parsed back
+    into datetimes before binding. SQLite stores timestamps as text, with
+    or without microseconds depending on who wrote the row, so there the
+    key is read and compared exactly as stored.
+    """
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str) and dialect.name != "sqlite":
+            return datetime.fromisoformat(value)
+        return value
+
+def _updated_key(model):
+    # Rows that were never updated sort by their creation time. type_coerce
+    # renders no CAST, so the expression index on the key still applies.
+    return type_coerce(func.coalesce(model.updated_at, model.created_at), SortTimestamp)
+
+def _timestamp(value) -> str:
+    # Cursor timestamps are ISO strings; anything else is a forged cursor
+    try:
+        datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value
+
+def _id(value) -> int:
+    # Cursor ids are JSON integers; anything else is a forged cursor
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value
+
+def keyset_select(stmt: Select, model, sort: str = "id", cursor: Optional[str] = None) -> Select:
+    """Order a select by the keyset for `sort` and seek past `cursor`.
+
+    `sort=id` walks rows in ascending id order; `sort=updated_at` walks the
+    most recently touched rows first, using id as the tie breaker.
+    """
+    validate_sort(sort)
+    values = decode_cursor(cursor) if cursor else None
+
+    if sort == "id":
+        if values is not None:
+            if len(values) != 1:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            stmt = stmt.where(model.id > _id(values[0]))
+        return stmt.order_by(model.id)
+
+    key = _updated_key(model)
+    if values is not None:
+        if len(values) != 2:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        last_key, last_id = _timestamp(values[0]), _id(values[1])
+        stmt = stmt.where(or_(key < last_key, and_(key == last_key, model.id < last_id)))
+    return stmt.add_columns(key.label("sort_key")).order_by(key.desc(), model.id.desc())
+
+def _cursor_for(row, sort: str) -> str:
+    if sort == "id":
+        return encode_cursor([row.id])
+    return encode_cursor(jsonable_encoder([row.sort_key, row.id]))
+
+async def paginate(db, stmt: Select, model, schema: Type[Schema], limit: Optional[int],
+             cursor: Optional[str] = None, sort: str = "id") -> Tuple[List[Schema], Optional[str]]:
+    """Fetch one page of `model` rows as `schema` instances, and the cursor for the next page.
+
+    `stmt` selects the schema's columns (see Schema.columns), so rows are
+    validated straight from Row tuples without loading ORM entities. With
+    no limit every remaining row is returned and the next cursor is None.
+    """
+    stmt = keyset_select(stmt, model, sort, cursor)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+
+    rows = (await db.execute(stmt)).all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _cursor_for(rows[-1], sort)
+    return [schema.from_row(row) for row in rows], next_cursor
+
+def stream_ndjson(stmt: Select, model, schema: Type[Schema], limit: Optional[int] = None,
+                  cursor: Optional[str] = None, sort: str = "id") -> AsyncIterator[bytes]:
+    """Return an iterator of `model` rows as newline-delimited JSON.
+
+    The cursor and sort are validated up front so bad input is reported
+    before the response starts; rows are then read lazily.
+    """
+    stmt = keyset_select(stmt, model, sort, cursor)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return _iter_ndjson(stmt.execution_options(yield_per=STREAM_BATCH_SIZE), schema)
+
+async def _iter_ndjson(stmt: Select, schema: Type[Schema]) -> AsyncIterator[bytes]:
+    # Rows arrive in batches of STREAM_BATCH_SIZE so memory stays flat
+    # regardless of table size, and each batch goes out as one chunk, which
+    # a compressing middleware flushes once. The generator owns its session
+    # because it outlives the request handler.
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt)
+        async for rows in result.partitions():
+            yield b"".join(dumps(schema.from_row(row), newline=True) for row in rows)
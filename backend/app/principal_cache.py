@@ -0,0 +1,119 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+
+from sqlalchemy import event, inspect
+
+from .database import UserRole
+from .models import User
+
+@dataclass(frozen=True)
+class Principal:
+    """Immutable snapshot of the authenticated user.
+
+    Carries the attributes request handlers read from the current user, so
+    it can be cached across requests without holding a session-bound ORM
+    object.
+    """
+    id: int
+    email: str
+    username: str
+    role: UserRole
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            role=user.role,
+            is_active=bool(user.is_active),
+        )
+
+def token_key(token: str) -> str:
+    """Cache key for a bearer token; the raw token is never stored."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+class PrincipalCache:
+    """TTL + LRU cache of principals keyed by token hash."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[str]] = {}
+        # Invalidation runs from ORM flush events, which may be on a worker
+        # thread, so guard the two maps together.
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Principal]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            principal, expires_at = entry
+            if expires_at <= now:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return principal
+
+    def put(self, key: str, principal: Principal, expires_at: Optional[float] = None):
+        """Cache a principal until `expires_at` (monotonic) or the TTL, whichever is sooner."""
+        deadline = time.monotonic() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (principal, deadline)
+            self._keys_by_user.setdefault(principal.id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int):
+        """Drop every cached token for a user."""
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[0].id
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+def watch_user_changes(cache: PrincipalCache):
+    """Invalidate cached principals when a user's access changes."""
+
+    @event.listens_for(User, "after_update")
+    def _user_updated(mapper, connection, target):
+        state = inspect(target)
+        if any(state.attrs[name].history.has_changes() for name in ("role", "is_active", "email", "username")):
+            cache.invalidate_user(target.id)
+
+    @event.listens_for(User, "after_delete")
+    def _user_deleted(mapper, connection, target):
+        cache.invalidate_user(target.id)
@@ -0,0 +1,138 @@
+import os
+import re
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import greenlet
+except ImportError:  # only needed to see past SQLAlchemy's async bridge
+    greenlet = None
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Literals and placeholder lists vary between otherwise identical queries
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\?|%\(\w+\)s|%s|\$\d+|:\w+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACE = re.compile(r"\s+")
+
+def query_shape(statement: str) -> str:
+    """`statement` with literals and parameters replaced by `?`."""
+    shape = _STRING.sub("?", statement)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+def call_site() -> Optional[str]:
+    """The innermost app frame that led to the current statement.
+
+    Async sessions run statements in a child greenlet whose stack ends at
+    SQLAlchemy's bridge, so the walk continues in the awaiting greenlet.
+    """
+    frame = sys._getframe(1)
+    current = greenlet.getcurrent() if greenlet is not None else None
+    while True:
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(APP_DIR) and filename != __file__:
+                return f"{os.path.relpath(filename, os.path.dirname(APP_DIR))}:{frame.f_lineno} in {frame.f_code.co_name}"
+            frame = frame.f_back
+        current = current.parent if current is not None else None
+        if current is None:
+            return None
+        frame = current.gr_frame
+
+class QueryLog:
+    """Statements executed while the log was active, with their call sites."""
+
+    def __init__(self):
+        self.entries: List[Tuple[str, Optional[str]]] = []
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def record(self, statement: str):
+        self.entries.append((statement, call_site()))
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int, Dict[str, int]]]:
+        """(shape, count, call site counts) for shapes run `threshold`+ times."""
+        shapes = Counter(query_shape(statement) for statement, _ in self.entries)
+        found = []
+        for shape, count in shapes.most_common():
+            if count < threshold:
+                break
+            sites = Counter(site or "unknown" for statement, site in self.entries if query_shape(statement) == shape)
+            found.append((shape, count, dict(sites)))
+        return found
+
+    def describe(self) -> str:
+        return "\n".join(f"  {i}. {statement}  [{site or 'unknown'}]"
+                         for i, (statement, site) in enumerate(self.entries, 1))
+
+# Logs receiving every statement in the process (assert_max_queries), and
+# the one for the HTTP request being handled (the N+1 detector)
+_global_logs: List[QueryLog] = []
+_request_log: ContextVar[Optional[QueryLog]] = ContextVar("request_log", default=None)
+
+# SQLAlchemy engine event hook, installed in database.py
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    request_log = _request_log.get()
+    if request_log is None and not _global_logs:
+        return
+    for log in _global_logs:
+        log.record(statement)
+    if request_log is not None:
+        request_log.record(statement)
+
+@contextmanager
+def capture_queries() -> Iterator[QueryLog]:
+    """Log every statement run in this process until the block exits."""
+    log = QueryLog()
+    _global_logs.append(log)
+    try:
+        yield log
+    finally:
+        _global_logs.remove(log)
+
+@contextmanager
+def assert_max_queries(n: int) -> Iterator[QueryLog]:
+    """Fail if the block runs more than `n` SQL statements.
+
+    Counts statements from every thread and task, so requests made through
+    a test client count towards the budget:
+
+        with assert_max_queries(3):
+            client.get("/tasks?project_id=1")
+    """
+    with capture_queries() as log:
+        yield log
+    if len(log) > n:
+        raise AssertionError(f"{len(log)} queries executed, the budget is {n}:\n{log.describe()}")
+
+class QueryDebugMiddleware:
+    """ASGI middleware logging N+1 patterns: one query shape repeated in a request."""
+
+    def __init__(self, app, threshold: int):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        log = QueryLog()
+        token = _request_log.set(log)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_log.reset(token)
+            route = getattr(scope.get("route"), "path", scope["path"])
+            for shape, count, sites in log.repeated(self.threshold):
+                where = ", ".join(f"{site} ({hits}x)" for site, hits in sites.items())
+                print(f"Possible N+1 in {scope['method']} {route}: {count} x {shape[:300]} from {where}")
@@ -0,0 +1,193 @@
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import DailyRollup
+
+# Rows with this project_id total every project, so unscoped charts read
+# one row per day and level instead of one per project
+ALL_PROJECTS = 0
+
+# Longest range a chart may ask for, and the default when none is given
+MAX_RANGE_DAYS = 3660
+DEFAULT_RANGE_DAYS = 30
+
+# Entity -> (table, column broken down by, statuses counting as closed)
+ENTITIES = {
+    "task": ("tasks", "priority", ("done",)),
+    "bug": ("bugs", "severity", ("fixed", "closed")),
+}
+IN_PROGRESS = "in_progress"
+
+COUNTS = ("created", "closed", "reopened", "open_delta", "in_progress_delta")
+
+class ItemState(NamedTuple):
+    """What the rollups track about one task or bug."""
+    project_id: Optional[int]
+    level: Optional[str]
+    status: Optional[str]
+
+def _name(value) -> Optional[str]:
+    return getattr(value, "value", value)
+
+def item_state(project_id: Optional[int], level, status) -> ItemState:
+    """State from column values, given as enums or their names."""
+    return ItemState(project_id, _name(level), _name(status))
+
+def _deltas(entity: str, old: Optional[ItemState], new: Optional[ItemState]) -> Dict[tuple, Counter]:
+    """Rollup increments for one item moving from `old` to `new` (None: absent)."""
+    closed = ENTITIES[entity][2]
+    deltas: Dict[tuple, Counter] = defaultdict(Counter)
+    if old is not None:
+        counts = deltas[(old.project_id, old.level)]
+        counts["open_delta"] -= old.status not in closed
+        counts["in_progress_delta"] -= old.status == IN_PROGRESS
+    if new is not None:
+        counts = deltas[(new.project_id, new.level)]
+        counts["open_delta"] += new.status not in closed
+        counts["in_progress_delta"] += new.status == IN_PROGRESS
+        was_closed = old is not None and old.status in closed
+        if old is None:
+            counts["created"] += 1
+        if new.status in closed and not was_closed:
+            counts["closed"] += 1
+        elif was_closed and new.status not in closed:
+            counts["reopened"] += 1
+    return deltas
+
+def _upsert(dialect: str):
+    # Imported here so startup does not load the Postgres dialect for SQLite
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = insert(DailyRollup)
+    return stmt.on_conflict_do_update(
+        index_elements=["project_id", "day", "entity", "level"],
+        set_={name: getattr(DailyRollup, name) + getattr(stmt.excluded, name) for name in COUNTS},
+    )
+
+async def record_transitions(db: AsyncSession, entity: str,
+                             transitions: Iterable[Tuple[Optional[ItemState], Optional[ItemState]]]):
+    """Add (old, new) item state changes to today's rollups.
+
+    Runs in the caller's transaction, so the rollups commit with the write
+    itself. Transitions that change nothing tracked write nothing.
+    """
+    totals: Dict[tuple, Counter] = defaultdict(Counter)
+    for old, new in transitions:
+        for (project_id, level), counts in _deltas(entity, old, new).items():
+            if project_id is None:
+                continue
+            totals[(project_id, level)].update(counts)
+            totals[(ALL_PROJECTS, level)].update(counts)
+
+    day = datetime.utcnow().date()
+    # Sorted, so concurrent writers lock shared rows in the same order
+    rows = [
+        dict({name: counts[name] for name in COUNTS}, project_id=project_id, day=day, entity=entity, level=level)
+        for (project_id, level), counts in sorted(totals.items())
+        if any(counts.values())
+    ]
+    if rows:
+        await db.execute(_upsert(db.bind.dialect.name), rows)
+
+def date_range(start: Optional[date], end: Optional[date]) -> Tuple[date, date]:
+    """Validate a chart range; defaults to the last DEFAULT_RANGE_DAYS days."""
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range too long (max {MAX_RANGE_DAYS} days)")
+    return start, end
+
+def _filters(entity: Optional[str], project_id: Optional[int], level: Optional[str]) -> list:
+    filters = [DailyRollup.project_id == (project_id if project_id is not None else ALL_PROJECTS)]
+    if entity is not None:
+        filters.append(DailyRollup.entity == entity)
+    if level is not None:
+        filters.append(DailyRollup.level == level)
+    return filters
+
+def _days(start: date, end: date):
+    for offset in range((end - start).days + 1):
+        yield start + timedelta(days=offset)
+
+async def _daily_sums(db: AsyncSession, filters: list, start: date, end: date, columns) -> dict:
+    stmt = (
+        select(DailyRollup.day, *(func.sum(column) for column in columns))
+        .where(*filters, DailyRollup.day >= start, DailyRollup.day <= end)
+        .group_by(DailyRollup.day)
+    )
+    return {row[0]: row[1:] for row in await db.execute(stmt)}
+
+async def burndown(db: AsyncSession, start: date, end: date, entity: Optional[str] = None,
+                   project_id: Optional[int] = None, level: Optional[str] = None) -> List[dict]:
+    """Open and in-progress item counts at the end of each day in the range."""
+    filters = _filters(entity, project_id, level)
+    columns = (DailyRollup.open_delta, DailyRollup.in_progress_delta)
+    # Counts going into the range: everything that happened before it
+    open_items, in_progress = (await db.execute(
+        select(*(func.coalesce(func.sum(column), 0) for column in columns)).where(*filters, DailyRollup.day < start)
+    )).one()
+    sums = await _daily_sums(db, filters, start, end, columns)
+
+    days = []
+    for day in _days(start, end):
+        open_delta, in_progress_delta = sums.get(day, (0, 0))
+        open_items += open_delta
+        in_progress += in_progress_delta
+        days.append({"day": day, "open": open_items, "in_progress": in_progress})
+    return days
+
+async def created_vs_resolved(db: AsyncSession, start: date, end: date, entity: Optional[str] = None,
+                              project_id: Optional[int] = None, level: Optional[str] = None) -> List[dict]:
+    """Items created, closed and reopened on each day in the range."""
+    columns = (DailyRollup.created, DailyRollup.closed, DailyRollup.reopened)
+    sums = await _daily_sums(db, _filters(entity, project_id, level), start, end, columns)
+    days = []
+    for day in _days(start, end):
+        created, closed, reopened = sums.get(day, (0, 0, 0))
+        days.append({"day": day, "created": created, "closed": closed, "reopened": reopened})
+    return days
+
+def _backfill_sql(entity: str, per_project: bool) -> str:
+    table, level, closed = ENTITIES[entity]
+    scope = "project_id" if per_project else str(ALL_PROJECTS)
+    closed_list = ", ".join(f"'{status}'" for status in closed)
+    closed_day = "date(coalesce(updated_at, created_at))"
+    return f"""
+        INSERT INTO daily_rollups (project_id, day, entity, level, created, closed, reopened, open_delta, in_progress_delta)
+        SELECT {scope}, day, '{entity}', level, sum(created), sum(closed), 0, sum(open_delta), sum(in_progress_delta)
+        FROM (
+            SELECT project_id, date(created_at) AS day, {level} AS level,
+                   1 AS created, 0 AS closed, 1 AS open_delta, 0 AS in_progress_delta
+            FROM {table} WHERE project_id IS NOT NULL
+            UNION ALL
+            SELECT project_id, {closed_day}, {level}, 0, 1, -1, 0
+            FROM {table} WHERE project_id IS NOT NULL AND status IN ({closed_list})
+            UNION ALL
+            SELECT project_id, {closed_day}, {level}, 0, 0, 0, 1
+            FROM {table} WHERE project_id IS NOT NULL AND status = '{IN_PROGRESS}'
+        ) AS events
+        GROUP BY {"project_id, " if per_project else ""}day, level
+    """
+
+# Rebuilds the rollups from the current rows. Past transitions are not
+# stored anywhere, so items count as closed (or started) on the day they
+# were last updated, and reopen history is lost.
+BACKFILL_SQL = [_backfill_sql(entity, per_project) for entity in ENTITIES for per_project in (True, False)]
+
+def backfill_rollups(engine: Engine):
+    """Populate empty rollups from existing tasks and bugs, e.g. after seeding."""
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT 1 FROM daily_rollups LIMIT 1")).first():
+            return
+        for statement in BACKFILL_SQL:
+            conn.execute(text(statement))
@@ -0,0 +1,169 @@
+import html
+import re
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .pagination import decode_cursor, encode_cursor
+
+# Largest page of search hits
+MAX_SEARCH_RESULTS = 100
+
+# Matched words come back from the database between private-use characters,
+# which user text cannot usefully contain; the snippet is HTML-escaped and
+# the markers swapped for <mark> tags only afterwards
+SNIPPET_START = "\ue000"
+SNIPPET_END = "\ue001"
+SNIPPET_WORDS = 12
+
+ENTITIES = ("task", "bug")
+
+# SQLite: one FTS5 table for tasks and bugs, kept in sync by triggers, so
+# every write path (handlers, batch endpoints, scripts) updates it. Tasks
+# use rowid 2*id and bugs 2*id+1, which makes updates and deletes rowid
+# lookups and lets the entity be recovered from the rowid.
+SQLITE_INDEX_DDL = [
+    """CREATE VIRTUAL TABLE search_index USING fts5(
+        title, description, project_id UNINDEXED, tokenize = 'porter unicode61'
+    )""",
+]
+for _table, _offset in (("tasks", 0), ("bugs", 1)):
+    SQLITE_INDEX_DDL += [
+        f"""CREATE TRIGGER IF NOT EXISTS {_table}_search_insert AFTER INSERT ON {_table} BEGIN
+            INSERT INTO search_index (rowid, title, description, project_id)
+            VALUES (new.id * 2 + {_offset}, new.title, new.description, new.project_id);
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {_table}_search_update AFTER UPDATE OF title, description, project_id ON {_table} BEGIN
+            UPDATE search_index SET title = new.title, description = new.description, project_id = new.project_id
+            WHERE rowid = old.id * 2 + {_offset};
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {_table}_search_delete AFTER DELETE ON {_table} BEGIN
+            DELETE FROM search_index WHERE rowid = old.id * 2 + {_offset};
+        END""",
+        f"""INSERT INTO search_index (rowid, title, description, project_id)
+            SELECT id * 2 + {_offset}, title, description, project_id FROM {_table}""",
+    ]
+
+# Postgres: a generated tsvector column per table with a GIN index; the
+# database keeps it current on every write.
+POSTGRES_INDEX_DDL = []
+for _table in ("tasks", "bugs"):
+    POSTGRES_INDEX_DDL += [
+        f"""ALTER TABLE {_table} ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED""",
+        f"CREATE INDEX IF NOT EXISTS ix_{_table}_search_vector ON {_table} USING gin (search_vector)",
+    ]
+
+def create_search_index(engine: Engine):
+    """Create the full-text index if it is missing, indexing existing rows."""
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'search_index'")).first()
+            if not exists:
+                for statement in SQLITE_INDEX_DDL:
+                    conn.execute(text(statement))
+        elif engine.dialect.name == "postgresql":
+            for statement in POSTGRES_INDEX_DDL:
+                conn.execute(text(statement))
+
+def drop_search_index(engine: Engine):
+    """Drop the index (the Postgres column stays), e.g. before a bulk load.
+
+    create_search_index rebuilds it from the rows afterwards, which is
+    much faster than maintaining it row by row.
+    """
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            for table in ("tasks", "bugs"):
+                for event in ("insert", "update", "delete"):
+                    conn.execute(text(f"DROP TRIGGER IF EXISTS {table}_search_{event}"))
+            conn.execute(text("DROP TABLE IF EXISTS search_index"))
+        elif engine.dialect.name == "postgresql":
+            for table in ("tasks", "bugs"):
+                conn.execute(text(f"DROP INDEX IF EXISTS ix_{table}_search_vector"))
+
+def match_expression(q: str) -> str:
+    """FTS5 query for free text: every word must match, the last as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation in user input are
+    never interpreted.
+    """
+    words = re.findall(r"\w+", q)
+    if not words:
+        raise HTTPException(status_code=400, detail="q must contain at least one word")
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+def highlight(snippet: str) -> str:
+    """HTML for a database snippet: the text escaped, the matches in <mark>."""
+    return html.escape(snippet).replace(SNIPPET_START, "<mark>").replace(SNIPPET_END, "</mark>")
+
+def _sqlite_query(entity: Optional[str], project_id: Optional[int]):
+    filters = ""
+    if entity is not None:
+        filters += f" AND rowid % 2 = {ENTITIES.index(entity)}"
+    if project_id is not None:
+        filters += " AND project_id = :project_id"
+    # bm25() is lower-is-better; titles weigh ten times the description
+    return text(f"""
+        SELECT rowid, project_id, title,
+               snippet(search_index, -1, :start, :end, '…', {SNIPPET_WORDS}) AS snippet,
+               -bm25(search_index, 10.0, 1.0) AS score
+        FROM search_index
+        WHERE search_index MATCH :match{filters}
+        ORDER BY bm25(search_index, 10.0, 1.0), rowid
+        LIMIT :limit OFFSET :offset
+    """)
+
+def _postgres_query(entity: Optional[str], project_id: Optional[int]):
+    filters = " AND project_id = :project_id" if project_id is not None else ""
+    selects = [
+        f"""SELECT '{name}' AS entity, id, project_id, title, description, ts_rank_cd(search_vector, q) AS score
+            FROM {name}s, websearch_to_tsquery('english', :q) AS q
+            WHERE search_vector @@ q{filters}"""
+        for name in ENTITIES if entity in (None, name)
+    ]
+    # Rank and page first, so snippets are only built for the returned hits
+    return text(f"""
+        SELECT entity, id, project_id, title,
+               ts_headline('english', coalesce(title, '') || ' ' || coalesce(description, ''),
+                           websearch_to_tsquery('english', :q),
+                           'StartSel=' || :start || ', StopSel=' || :end || ', MaxWords={SNIPPET_WORDS}, MinWords=4') AS snippet,
+               score
+        FROM ({" UNION ALL ".join(selects)}) AS hits
+        ORDER BY score DESC, entity, id
+        LIMIT :limit OFFSET :offset
+    """)
+
+async def search_items(db: AsyncSession, q: str, limit: int, cursor: Optional[str] = None,
+                       entity: Optional[str] = None, project_id: Optional[int] = None) -> Tuple[List[dict], Optional[str]]:
+    """One page of ranked hits for `q`, best first, and the next page's cursor."""
+    offset = decode_cursor(cursor)[0] if cursor else 0
+    if not isinstance(offset, int) or offset < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    params = {"limit": limit + 1, "offset": offset, "start": SNIPPET_START, "end": SNIPPET_END, "project_id": project_id}
+
+    if db.bind.dialect.name == "postgresql":
+        rows = (await db.execute(_postgres_query(entity, project_id), dict(params, q=q))).all()
+        hits = [
+            {"entity": row.entity, "id": row.id, "project_id": row.project_id, "title": row.title,
+             "snippet": highlight(row.snippet), "score": row.score}
+            for row in rows
+        ]
+    else:
+        rows = (await db.execute(_sqlite_query(entity, project_id), dict(params, match=match_expression(q)))).all()
+        hits = [
+            {"entity": ENTITIES[row.rowid % 2], "id": row.rowid // 2, "project_id": row.project_id,
+             "title": row.title, "snippet": highlight(row.snippet), "score": row.score}
+            for row in rows
+        ]
+
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        next_cursor = encode_cursor([offset + limit])
+    return hits, next_cursor
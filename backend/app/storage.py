@@ -0,0 +1,85 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+# Named storage profiles (STORAGE_PROFILE). SQLite settings are PRAGMAs run
+# on every new connection; Postgres settings size the connection pool and
+# bound how long one statement may run.
+PROFILES = {
+    # Library defaults: rollback journal, where readers wait behind every writer
+    "default": {
+        "sqlite": {},
+        "postgresql": {},
+    },
+    # WAL lets reads proceed during a write, and NORMAL only syncs at
+    # checkpoints: a power loss can drop the last commits, never corrupt
+    "concurrent": {
+        "sqlite": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 15000,  # ms a writer waits for the lock before "database is locked"
+            "cache_size": -65536,  # 64 MB
+            "mmap_size": 268435456,  # 256 MB
+            "temp_store": "MEMORY",
+        },
+        "postgresql": {
+            "pool_size": 10,
+            "max_overflow": 20,
+            "pool_pre_ping": True,
+            "pool_recycle": 1800,
+            "statement_timeout_ms": 30000,
+        },
+    },
+    # Concurrent, but every commit is synced to disk
+    "durable": {
+        "sqlite": {
+            "journal_mode": "WAL",
+            "synchronous": "FULL",
+            "busy_timeout": 15000,
+            "cache_size": -65536,
+        },
+        "postgresql": {
+            "pool_size": 5,
+            "max_overflow": 10,
+            "pool_pre_ping": True,
+            "pool_recycle": 1800,
+            "statement_timeout_ms": 60000,
+        },
+    },
+}
+
+def _settings(url, profile: str) -> dict:
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown STORAGE_PROFILE {profile!r}; expected one of {', '.join(PROFILES)}")
+    return PROFILES[profile].get(make_url(url).get_backend_name(), {})
+
+def engine_options(url, profile: str, statement_timeout: bool = True) -> dict:
+    """Keyword arguments for create_engine / create_async_engine.
+
+    Pass statement_timeout=False for engines running migrations, backfills
+    and bulk loads, whose statements may legitimately run for minutes.
+    """
+    url = make_url(url)
+    options = dict(_settings(url, profile))
+    if url.get_backend_name() != "postgresql":
+        return {}
+    timeout = options.pop("statement_timeout_ms", None)
+    if timeout is not None and statement_timeout:
+        # asyncpg takes server settings directly; libpq drivers take startup options
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(timeout)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+def apply_profile(engine: Engine, profile: str):
+    """Run the profile's SQLite PRAGMAs on each connection `engine` opens."""
+    pragmas = _settings(engine.url, profile) if engine.dialect.name == "sqlite" else {}
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
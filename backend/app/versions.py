@@ -0,0 +1,63 @@
+import uuid
+from collections import Counter
+from typing import Optional
+
+from fastapi import Response
+
+# Collections with a list endpoint
+COLLECTIONS = ("projects", "tasks", "bugs")
+
+class CollectionVersions:
+    """Monotonic change counters per collection and per project.
+
+    Write handlers bump a collection after committing, and list endpoints
+    use the current version as their ETag, so an unchanged collection can
+    be answered with 304 before any query runs. Counters live in process
+    memory: the epoch in every tag changes on restart, and writes made by
+    other workers are applied through the event bus (see `invalidate`).
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._versions: Counter = Counter()
+
+    def bump(self, collection: str, *project_ids: Optional[int]):
+        """Record a write to `collection`, touching the given projects."""
+        self._versions[(collection, None)] += 1
+        for project_id in set(project_ids):
+            if project_id is not None:
+                self._versions[(collection, project_id)] += 1
+
+    def invalidate(self, project_id: Optional[int] = None):
+        """Bump every collection, e.g. for a write seen on another worker."""
+        for collection in COLLECTIONS:
+            self.bump(collection, project_id)
+
+    def version(self, collection: str, project_id: Optional[int] = None) -> int:
+        return self._versions[(collection, project_id)]
+
+    def etag(self, collection: str, project_id: Optional[int] = None, variant: Optional[str] = None) -> str:
+        """Tag for the collection's current version; `variant` tells apart
+        responses built differently from the same rows."""
+        scope = project_id if project_id is not None else "all"
+        if variant:
+            scope = f"{scope}-{variant}"
+        return f'W/"{self.epoch}-{collection}-{scope}-{self.version(collection, project_id)}"'
+
+def _opaque(tag: str) -> str:
+    return tag.strip().removeprefix("W/")
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against `etag`."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in if_none_match.split(",")}
+
+def cache_headers(etag: str) -> dict:
+    # no-cache: browsers may store the body but must revalidate every time
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
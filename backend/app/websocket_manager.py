@@ -1,18 +1,142 @@
 from fastapi import WebSocket
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, List, Optional, Set
+import asyncio
 import json
+import time
+
+from .event_bus import EventBus
+
+# What to do when a client's outbound queue is full
+OVERFLOW_POLICIES = ("disconnect", "drop_oldest", "drop_newest")
+
+def coalesce_key(message: str):
+    """Key under which a queued event may be replaced by a later one.
+
+    Events about the same entity (e.g. successive task_updated for task 5)
+    share a key. JSON events without an entity id get a unique key, so they
+    are batched but never replaced; anything else returns None and is sent
+    in a frame of its own.
+    """
+    try:
+        event = json.loads(message)
+    except ValueError:
+        return None
+    if not isinstance(event, dict):
+        return None
+    data = event.get("data")
+    if isinstance(data, dict) and "id" in data:
+        return f"{event.get('type')}:{data['id']}"
+    return object()
+
+def coalesce_frames(items: List[tuple]) -> List[str]:
+    """Merge queued (key, message) items into as few frames as possible.
+
+    Consecutive keyed events become one batch frame in which a later event
+    replaces an earlier one with the same key, taking its place at the end.
+    Unkeyed messages keep their own frame and their position.
+    """
+    frames: List[str] = []
+    pending: Dict[object, str] = {}
+
+    def flush():
+        if len(pending) == 1:
+            frames.extend(pending.values())
+        elif pending:
+            frames.append('{"type": "batch", "events": [' + ", ".join(pending.values()) + "]}")
+        pending.clear()
+
+    for key, message in items:
+        if key is None:
+            flush()
+            frames.append(message)
+        else:
+            pending.pop(key, None)
+            pending[key] = message
+    flush()
+    return frames
+
+class ClientConnection:
+    """A connected client with its bounded outbound queue and writer task."""
+
+    def __init__(self, websocket: WebSocket, client_id: str, queue_size: int):
+        self.websocket = websocket
+        self.client_id = client_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.writer: Optional[asyncio.Task] = None
+        self.projects: Set[int] = set()
 
 class ConnectionManager:
-    """Manages WebSocket connections for real-time communication."""
-    
-    def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
-    
+    """Manages WebSocket connections for real-time communication.
+
+    Sends never wait on a socket: each connection has its own queue drained
+    by a dedicated writer task, so one slow client cannot hold up the others
+    or the HTTP request that triggered the broadcast.
+
+    Project-scoped events go only to clients subscribed to that project.
+    Clients without any subscription, whether they never subscribed or
+    unsubscribed from everything, receive every event, as before
+    subscriptions existed.
+
+    With an event bus attached, broadcasts are also published to the other
+    workers, and their broadcasts are delivered to this worker's clients.
+
+    With a coalescing window, each writer waits that long after the first
+    pending event and sends everything queued meanwhile as one "batch"
+    frame, keeping only the latest event per entity.
+    """
+
+    def __init__(self, queue_size: int = 256, overflow_policy: str = "disconnect", coalesce_window: float = 0.0):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {', '.join(OVERFLOW_POLICIES)}")
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+        self.coalesce_window = coalesce_window
+        self.active_connections: Dict[str, ClientConnection] = {}
+        self.project_subscribers: Dict[int, Set[str]] = {}
+        self.unscoped_clients: Set[str] = set()
+        self.dropped_messages = 0
+        self.evicted_clients = 0
+        self.bus: Optional[EventBus] = None
+        # Called with the project id (or None) of each event from another worker
+        self.on_remote_event: Optional[Callable[[Optional[int]], None]] = None
+        # Called with the seconds each broadcast took to queue for its recipients
+        self.on_fanout: Optional[Callable[[float], None]] = None
+
+    async def attach_bus(self, bus: EventBus):
+        """Start exchanging broadcasts with other workers through `bus`."""
+        self.bus = bus
+        await bus.start(self.receive_from_bus)
+
+    async def detach_bus(self):
+        if self.bus is not None:
+            await self.bus.close()
+            self.bus = None
+
+    async def receive_from_bus(self, envelope: dict):
+        """Deliver another worker's broadcast to local clients only."""
+        project_ids = envelope.get("project_ids") or [envelope.get("project_id")]
+        if self.on_remote_event is not None:
+            for project_id in project_ids:
+                self.on_remote_event(project_id)
+        if envelope.get("project_id") is None:
+            self._deliver_all(envelope["message"])
+        else:
+            self._deliver_to_projects(envelope["message"], project_ids)
+
     async def connect(self, websocket: WebSocket, client_id: str):
         """Accept a new WebSocket connection."""
         await websocket.accept()
-        self.active_connections[client_id] = websocket
-        
+
+        # A reconnect under the same id replaces the previous socket
+        previous = self.active_connections.get(client_id)
+        if previous is not None:
+            self._remove(previous)
+
+        connection = ClientConnection(websocket, client_id, self.queue_size)
+        connection.writer = asyncio.create_task(self._writer(connection))
+        self.active_connections[client_id] = connection
+        self.unscoped_clients.add(client_id)
+
         # Send welcome message
         await self.send_personal_message(
             json.dumps({
@@ -22,45 +146,162 @@ class ConnectionManager:
             }),
             client_id
         )
-    
-    def disconnect(self, client_id: str):
-        """Remove a WebSocket connection."""
-        if client_id in self.active_connections:
-            del self.active_connections[client_id]
-    
+
+    def disconnect(self, client_id: str, websocket: Optional[WebSocket] = None):
+        """Remove a WebSocket connection.
+
+        When `websocket` is given, only remove the client if it is still
+        registered with that socket, so a stale socket closing cannot evict
+        the connection that replaced it.
+        """
+        connection = self.active_connections.get(client_id)
+        if connection is None:
+            return
+        if websocket is not None and connection.websocket is not websocket:
+            return
+        self._remove(connection)
+
     async def send_personal_message(self, message: str, client_id: str):
-        """Send a message to a specific client."""
-        if client_id in self.active_connections:
-            try:
-                await self.active_connections[client_id].send_text(message)
-            except:
-                # Connection might be closed, remove it
-                self.disconnect(client_id)
-    
+        """Queue a message for a specific client."""
+        connection = self.active_connections.get(client_id)
+        if connection is not None:
+            self._enqueue(connection, (None, message))
+
     async def broadcast(self, message: str):
-        """Broadcast a message to all connected clients."""
-        disconnected_clients = []
-        
-        for client_id, connection in self.active_connections.items():
-            try:
-                await connection.send_text(message)
-            except:
-                # Connection is closed, mark for removal
-                disconnected_clients.append(client_id)
-        
-        # Clean up disconnected clients
-        for client_id in disconnected_clients:
-            self.disconnect(client_id)
-    
-    async def broadcast_to_project(self, message: str, project_id: int):
-        """Broadcast a message to all clients in a specific project."""
-        # For now, broadcast to all. In production, you'd track project memberships
-        await self.broadcast(message)
-    
+        """Queue a message for every connected client."""
+        self._deliver_all(message)
+        if self.bus is not None:
+            self.bus.publish({"message": message, "project_id": None})
+
+    async def broadcast_to_project(self, message: str, project_id: int, *other_project_ids: int):
+        """Broadcast a message to the clients subscribed to a project.
+
+        An event touching several projects (a task moved between them) goes
+        once to the subscribers of any of them, and other workers invalidate
+        every one.
+        """
+        project_ids = list(dict.fromkeys((project_id, *other_project_ids)))
+        self._deliver_to_projects(message, project_ids)
+        if self.bus is not None:
+            self.bus.publish({"message": message, "project_id": project_id, "project_ids": project_ids})
+
+    def subscribe(self, client_id: str, project_id: int) -> bool:
+        """Add a project to a client's subscriptions."""
+        connection = self.active_connections.get(client_id)
+        if connection is None:
+            return False
+        connection.projects.add(project_id)
+        self.project_subscribers.setdefault(project_id, set()).add(client_id)
+        self.unscoped_clients.discard(client_id)
+        return True
+
+    def unsubscribe(self, client_id: str, project_id: int) -> bool:
+        """Remove a project from a client's subscriptions.
+
+        A client left with no subscriptions receives every event again.
+        """
+        connection = self.active_connections.get(client_id)
+        if connection is None or project_id not in connection.projects:
+            return False
+        connection.projects.discard(project_id)
+        self._drop_subscriber(project_id, client_id)
+        if not connection.projects:
+            self.unscoped_clients.add(client_id)
+        return True
+
+    def get_project_subscribers(self, project_id: int) -> List[str]:
+        """Get the client IDs subscribed to a project."""
+        return list(self.project_subscribers.get(project_id, ()))
+
     def get_connected_count(self) -> int:
         """Get the number of active connections."""
         return len(self.active_connections)
-    
+
     def get_connected_clients(self) -> List[str]:
         """Get list of connected client IDs."""
         return list(self.active_connections.keys())
+
+    def _queue_item(self, message: str) -> tuple:
+        # The key is computed once per broadcast, not once per recipient
+        return (coalesce_key(message) if self.coalesce_window > 0 else None, message)
+
+    def _deliver_all(self, message: str):
+        start = time.perf_counter()
+        item = self._queue_item(message)
+        for connection in list(self.active_connections.values()):
+            self._enqueue(connection, item)
+        if self.on_fanout is not None:
+            self.on_fanout(time.perf_counter() - start)
+
+    def _deliver_to_projects(self, message: str, project_ids: Iterable[int]):
+        start = time.perf_counter()
+        item = self._queue_item(message)
+        recipients = set(self.unscoped_clients)
+        for project_id in project_ids:
+            recipients |= self.project_subscribers.get(project_id, set())
+        for client_id in recipients:
+            connection = self.active_connections.get(client_id)
+            if connection is not None:
+                self._enqueue(connection, item)
+        if self.on_fanout is not None:
+            self.on_fanout(time.perf_counter() - start)
+
+    def _enqueue(self, connection: ClientConnection, item: tuple):
+        try:
+            connection.queue.put_nowait(item)
+            return
+        except asyncio.QueueFull:
+            self.dropped_messages += 1
+
+        if self.overflow_policy == "drop_oldest":
+            connection.queue.get_nowait()
+            connection.queue.put_nowait(item)
+        elif self.overflow_policy == "disconnect":
+            # Slow consumer: evict it and let the client reconnect
+            self.evicted_clients += 1
+            self._remove(connection)
+            asyncio.create_task(self._close(connection.websocket))
+
+    async def _writer(self, connection: ClientConnection):
+        """Drain one connection's queue onto its socket."""
+        try:
+            while True:
+                item = await connection.queue.get()
+                if self.coalesce_window <= 0:
+                    await connection.websocket.send_text(item[1])
+                    continue
+
+                await asyncio.sleep(self.coalesce_window)
+                items = [item]
+                while not connection.queue.empty():
+                    items.append(connection.queue.get_nowait())
+                for frame in coalesce_frames(items):
+                    await connection.websocket.send_text(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Connection is closed, remove it
+            self._remove(connection)
+
+    def _remove(self, connection: ClientConnection):
+        if self.active_connections.get(connection.client_id) is connection:
+            del self.active_connections[connection.client_id]
+            self.unscoped_clients.discard(connection.client_id)
+            for project_id in connection.projects:
+                self._drop_subscriber(project_id, connection.client_id)
+        writer = connection.writer
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+
+    def _drop_subscriber(self, project_id: int, client_id: str):
+        subscribers = self.project_subscribers.get(project_id)
+        if subscribers is not None:
+            subscribers.discard(client_id)
+            if not subscribers:
+                del self.project_subscribers[project_id]
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            await websocket.close(code=1013)
+        except Exception:
+            pass
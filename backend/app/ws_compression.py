@@ -0,0 +1,53 @@
+from websockets import frames
+from websockets.extensions.permessage_deflate import PerMessageDeflate, ServerPerMessageDeflateFactory
+from uvicorn.protocols.websockets.websockets_impl import WebSocketProtocol
+
+from config import settings
+
+class ThresholdPerMessageDeflate(PerMessageDeflate):
+    """permessage-deflate that leaves small messages uncompressed.
+
+    RFC 7692 lets each message choose: compressed messages set RSV1,
+    others go out as-is. Deflating a 60-byte event costs more CPU than the
+    bytes it saves, so only single-frame messages of at least `min_size`
+    bytes are compressed.
+    """
+
+    def __init__(self, *args, min_size: int = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.min_size = min_size
+
+    def encode(self, frame: frames.Frame) -> frames.Frame:
+        if frame.opcode in (frames.OP_TEXT, frames.OP_BINARY) and frame.fin and len(frame.data) < self.min_size:
+            return frame
+        return super().encode(frame)
+
+class ThresholdDeflateFactory(ServerPerMessageDeflateFactory):
+    """Negotiates permessage-deflate and applies the size threshold."""
+
+    def __init__(self, min_size: int, **kwargs):
+        super().__init__(**kwargs)
+        self.min_size = min_size
+
+    def process_request_params(self, params, accepted_extensions):
+        response_params, extension = super().process_request_params(params, accepted_extensions)
+        return response_params, ThresholdPerMessageDeflate(
+            extension.remote_no_context_takeover,
+            extension.local_no_context_takeover,
+            extension.remote_max_window_bits,
+            extension.local_max_window_bits,
+            extension.compress_settings,
+            min_size=self.min_size,
+        )
+
+class DeflateThresholdWebSocketProtocol(WebSocketProtocol):
+    """uvicorn WebSocket protocol using ThresholdDeflateFactory.
+
+    Pass as `ws=` to uvicorn.run; with ws_per_message_deflate off it
+    behaves exactly like the stock protocol.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.config.ws_per_message_deflate:
+            self.available_extensions = [ThresholdDeflateFactory(settings.WEBSOCKET_DEFLATE_MIN_SIZE)]
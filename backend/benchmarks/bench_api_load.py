@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Load test: a realistic request mix against the API, with a regression gate.
+
+Drives the real app in-process through httpx's ASGI transport. Each of
+--concurrency virtual users logs in, then issues requests drawn from a
+weighted mix: logins, task and bug lists, Kanban status moves, bug
+reports and dashboard polls (sent with the last ETag, like the UI).
+Per operation it records throughput and p50/p95/p99 latency.
+
+Results can be written as JSON with --output. With --baseline, the run
+is compared against a stored result file and exits non-zero if any
+operation's p50/p95 latency grew, or its throughput fell, by more than
+--tolerance, or if any request failed. Baselines are only comparable on
+the same machine and settings; record one with --save-baseline.
+
+Usage (from backend/):
+    python benchmarks/bench_api_load.py --mix default --requests 5000 --concurrency 16
+    python benchmarks/bench_api_load.py --save-baseline benchmarks/results/api_load.json
+    python benchmarks/bench_api_load.py --baseline benchmarks/results/api_load.json --output run.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+from common import Timer, seed_rows, summarize, use_temp_database
+
+use_temp_database()
+
+# Operation -> relative weight
+MIXES = {
+    "default": {"login": 2, "list_tasks": 30, "list_bugs": 15, "move_task": 20, "create_bug": 8, "dashboard": 25},
+    "read_heavy": {"login": 1, "list_tasks": 45, "list_bugs": 25, "move_task": 5, "create_bug": 2, "dashboard": 22},
+    "write_heavy": {"login": 2, "list_tasks": 15, "list_bugs": 8, "move_task": 45, "create_bug": 20, "dashboard": 10},
+}
+
+# Settings that must match for two runs to be compared
+COMPARABLE = ("mix", "concurrency", "tasks", "projects", "rounds")
+
+PASSWORD = "load-password"
+TASK_STATUSES = ["todo", "in_progress", "review", "done"]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mix", choices=sorted(MIXES), default="default")
+    parser.add_argument("--requests", type=int, default=5000, help="measured requests, after warmup")
+    parser.add_argument("--warmup", type=int, default=200, help="unmeasured requests first")
+    parser.add_argument("--concurrency", type=int, default=16, help="virtual users")
+    parser.add_argument("--tasks", type=int, default=20000, help="tasks to seed (plus a quarter as many bugs)")
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost for logins")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write results as the new baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against this baseline and fail on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression (0.25 = 25%%)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    return parser.parse_args()
+
+args = parse_args()
+os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+# Every virtual user may be logging in at once; queue them instead of 503s
+os.environ.setdefault("PASSWORD_HASH_QUEUE", str(args.concurrency))
+
+import httpx
+from sqlalchemy import update
+
+from app import auth
+from app.database import engine
+from app.main import app
+from app.models import User
+
+class VirtualUser:
+    """One client session: its token, the ETag it last saw and a private RNG."""
+
+    def __init__(self, client: httpx.AsyncClient, user_id: int, rng: random.Random):
+        self.client = client
+        self.email = f"user{user_id}@bench.local"
+        self.rng = rng
+        self.headers = {}
+        self.dashboard_etag = None
+
+    async def login(self) -> httpx.Response:
+        response = await self.client.post("/auth/login", json={"email": self.email, "password": PASSWORD})
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return response
+
+    async def list_tasks(self) -> httpx.Response:
+        project_id = self.rng.randint(1, args.projects)
+        return await self.client.get(f"/tasks?project_id={project_id}&limit=50", headers=self.headers)
+
+    async def list_bugs(self) -> httpx.Response:
+        project_id = self.rng.randint(1, args.projects)
+        return await self.client.get(f"/bugs?project_id={project_id}&limit=50", headers=self.headers)
+
+    async def move_task(self) -> httpx.Response:
+        task_id = self.rng.randint(1, args.tasks)
+        return await self.client.put(f"/tasks/{task_id}", json={"status": self.rng.choice(TASK_STATUSES)},
+                                     headers=self.headers)
+
+    async def create_bug(self) -> httpx.Response:
+        return await self.client.post("/bugs", json={
+            "title": f"Load test bug {self.rng.random():.6f}",
+            "description": "Steps to reproduce: run the load test",
+            "severity": self.rng.choice(["low", "medium", "high", "critical"]),
+            "project_id": self.rng.randint(1, args.projects),
+        }, headers=self.headers)
+
+    async def dashboard(self) -> httpx.Response:
+        headers = {"If-None-Match": self.dashboard_etag} if self.dashboard_etag else {}
+        response = await self.client.get("/analytics/dashboard", headers=headers)
+        self.dashboard_etag = response.headers.get("ETag", self.dashboard_etag)
+        return response
+
+def seed():
+    seed_rows(projects=args.projects, tasks=args.tasks, bugs=args.tasks // 4, users=args.concurrency)
+    # One hash shared by every user: seeding should not pay bcrypt per user
+    hashed = auth.pwd_context.hash(PASSWORD)
+    with engine.begin() as conn:
+        conn.execute(update(User).values(hashed_password=hashed))
+
+async def run_load() -> dict:
+    weights = MIXES[args.mix]
+    operations = list(weights)
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    budget = {"warmup": args.warmup, "measured": args.requests}
+    # Unhandled errors become 500s and count as failures instead of aborting the run
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        users = [VirtualUser(client, i + 1, random.Random(args.seed + i)) for i in range(args.concurrency)]
+        for response in await asyncio.gather(*(user.login() for user in users)):
+            response.raise_for_status()
+
+        async def worker(user: VirtualUser, phase: str):
+            while budget[phase] > 0:
+                budget[phase] -= 1
+                operation = user.rng.choices(operations, weights=list(weights.values()))[0]
+                start = time.perf_counter()
+                response = await getattr(user, operation)()
+                elapsed = time.perf_counter() - start
+                if phase == "measured":
+                    latencies[operation].append(elapsed)
+                    if response.status_code >= 400:
+                        errors[operation] += 1
+
+        await asyncio.gather(*(worker(user, "warmup") for user in users))
+        with Timer() as timer:
+            await asyncio.gather(*(worker(user, "measured") for user in users))
+
+    results = {}
+    for operation in operations:
+        results[operation] = summarize(latencies[operation], timer.elapsed)
+        results[operation]["errors"] = errors[operation]
+    overall = summarize([value for values in latencies.values() for value in values], timer.elapsed)
+    overall["errors"] = sum(errors.values())
+    return {
+        "config": {name: getattr(args, name) for name in COMPARABLE},
+        "operations": results,
+        "overall": overall,
+    }
+
+def regressions(report: dict, baseline: dict, tolerance: float) -> list:
+    """Human-readable regressions of `report` against `baseline`."""
+    found = []
+    for operation, before in baseline["operations"].items():
+        now = report["operations"].get(operation)
+        if not now or not before["requests"]:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            if now[metric] > before[metric] * (1 + tolerance):
+                found.append(f"{operation} {metric}: {before[metric]} -> {now[metric]}")
+        if now["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            found.append(f"{operation} throughput_rps: {before['throughput_rps']} -> {now['throughput_rps']}")
+    return found
+
+def write_json(path: str, report: dict):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+def main() -> int:
+    seed()
+    report = asyncio.run(run_load())
+    for path in (args.output, args.save_baseline):
+        if path:
+            write_json(path, report)
+
+    failures = []
+    if report["overall"]["errors"]:
+        failures.append(f"{report['overall']['errors']} requests failed")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["config"] != report["config"]:
+            print(f"Baseline was recorded with {baseline['config']}, this run used {report['config']}", file=sys.stderr)
+            return 2
+        failures += regressions(report, baseline, args.tolerance)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"mix={args.mix}, {args.requests} requests, {args.concurrency} users, {args.tasks} tasks")
+        print(f"{'operation':<12} {'requests':>9} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for name, row in list(report["operations"].items()) + [("overall", report["overall"])]:
+            print(f"{name:<12} {row['requests']:>9} {row['throughput_rps']:>9} {row['p50_ms']:>9} "
+                  f"{row['p95_ms']:>9} {row['p99_ms']:>9} {row['errors']:>7}")
+
+    if failures:
+        print(f"\nFailed (tolerance {args.tolerance:.0%}):", file=sys.stderr)
+        for failure in failures:
+            print(f"  {failure}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: hot list queries as finished history grows, before and after archival.
+
+Seeds --live open tasks and bugs plus --history done tasks and closed bugs
+last touched a year ago, spread over --projects projects. The hot queries
+are the ones clients make: a project's full task list (the Kanban board),
+the most recently updated page of tasks, and a project's bugs. Each runs
+--repeat times, then app/archive.py moves the history out in batches and
+the queries run again. The report has hot table row counts, archival
+throughput and latency per query before and after.
+
+Usage (from backend/):
+    python benchmarks/bench_archive.py --live 10000 --history 200000 --repeat 30
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+from common import Timer, percentile, use_temp_database
+
+use_temp_database()
+
+from sqlalchemy import func, insert, select
+
+from app.archive import archive
+from app.database import AsyncSessionLocal, engine, upgrade_schema
+from app.models import User, Project, Task, Bug
+from app.pagination import paginate
+from app.schemas import TaskOut, BugOut
+
+LEVELS = ["low", "medium", "high", "critical"]
+
+def seed(projects: int, live: int, history: int, batch: int = 20000):
+    upgrade_schema()
+    old = datetime.utcnow() - timedelta(days=365)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "bench@bench.local", "username": "bench", "hashed_password": "x"}])
+        conn.execute(insert(Project), [{"name": f"Project {i}", "owner_id": 1} for i in range(projects)])
+        # History first, so live rows hold the highest ids, as they would
+        for count, task_status, bug_status, touched in ((history, "done", "closed", old),
+                                                        (live, "in_progress", "open", None)):
+            for start in range(0, count, batch):
+                size = min(batch, count - start)
+                conn.execute(insert(Task), [
+                    {"title": f"Task {i}", "description": "Benchmark task " * 8, "status": task_status,
+                     "priority": LEVELS[i % 4], "project_id": i % projects + 1, "created_by": 1,
+                     "created_at": touched, "updated_at": touched}
+                    for i in range(start, start + size)
+                ])
+                conn.execute(insert(Bug), [
+                    {"title": f"Bug {i}", "description": "Benchmark bug " * 8, "status": bug_status,
+                     "severity": LEVELS[i % 4], "project_id": i % projects + 1, "reported_by": 1,
+                     "created_at": touched, "updated_at": touched}
+                    for i in range(start, start + size // 4)
+                ])
+
+QUERIES = {
+    "project tasks": lambda project_id: (select(*TaskOut.columns(Task)).where(Task.project_id == project_id),
+                                         Task, TaskOut, None, "id"),
+    "recent tasks page": lambda project_id: (select(*TaskOut.columns(Task)), Task, TaskOut, 50, "updated_at"),
+    "project bugs": lambda project_id: (select(*BugOut.columns(Bug)).where(Bug.project_id == project_id),
+                                        Bug, BugOut, None, "id"),
+}
+
+async def measure(projects: int, repeat: int) -> dict:
+    results = {}
+    async with AsyncSessionLocal() as db:
+        for name, query in QUERIES.items():
+            latencies = []
+            for i in range(repeat):
+                stmt, model, schema, limit, sort = query(i % projects + 1)
+                start = time.perf_counter()
+                await paginate(db, stmt, model, schema, limit, sort=sort)
+                latencies.append(time.perf_counter() - start)
+            results[name] = {"p50_ms": round(percentile(latencies, 50) * 1000, 2),
+                             "p95_ms": round(percentile(latencies, 95) * 1000, 2)}
+    return results
+
+def hot_rows() -> dict:
+    with engine.connect() as conn:
+        return {"tasks": conn.scalar(select(func.count(Task.id))), "bugs": conn.scalar(select(func.count(Bug.id)))}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--live", type=int, default=10000, help="open tasks (and a quarter as many bugs)")
+    parser.add_argument("--history", type=int, default=200000, help="finished tasks (and a quarter as many bugs)")
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows archived per transaction")
+    parser.add_argument("--repeat", type=int, default=30, help="runs per query")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    seed(args.projects, args.live, args.history)
+    report = {"before": {"hot_rows": hot_rows(), "queries": asyncio.run(measure(args.projects, args.repeat))}}
+    with Timer() as timer:
+        moved = asyncio.run(archive(timedelta(days=90), args.batch_size))
+    report["archived"] = {**moved, "seconds": round(timer.elapsed, 2),
+                          "rows_per_second": round(sum(moved.values()) / timer.elapsed, 1)}
+    report["after"] = {"hot_rows": hot_rows(), "queries": asyncio.run(measure(args.projects, args.repeat))}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    archived = report["archived"]
+    print(f"Archived {archived['task']} tasks and {archived['bug']} bugs in {archived['seconds']} s "
+          f"({archived['rows_per_second']} rows/s, batches of {args.batch_size})")
+    before, after = report["before"], report["after"]
+    print(f"Hot rows: tasks {before['hot_rows']['tasks']} -> {after['hot_rows']['tasks']}, "
+          f"bugs {before['hot_rows']['bugs']} -> {after['hot_rows']['bugs']}")
+    print(f"{'query':<20} {'before p50':>11} {'before p95':>11} {'after p50':>10} {'after p95':>10}")
+    for name in QUERIES:
+        b, a = before["queries"][name], after["queries"][name]
+        print(f"{name:<20} {b['p50_ms']:>11} {b['p95_ms']:>11} {a['p50_ms']:>10} {a['p95_ms']:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark: request concurrency on the async database path vs. the sync path.
+
+The sync baseline reproduces the previous handler shape (an `async def`
+route doing blocking Session queries on the event loop); the async side is
+the real app on AsyncSession. Both serve the same task list and dashboard
+counts from the same database. Alongside throughput and latency the run
+reports event loop lag: how late a 1 ms ticker wakes up while requests are
+in flight, which is what WebSocket clients feel when a query blocks.
+
+Usage (from backend/):
+    python benchmarks/bench_async_db.py --rows 20000 --requests 400 --concurrency 1,8,32,64
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from common import Timer, seed_rows, summarize, use_temp_database
+
+use_temp_database()
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import func, select
+
+from app.database import SessionLocal
+from app.main import app as async_app
+from app.models import Bug, Project, Task
+
+def build_sync_app() -> FastAPI:
+    """The pre-async handlers: blocking queries inside async routes."""
+    sync_app = FastAPI()
+
+    @sync_app.get("/tasks")
+    async def get_tasks(limit: int = 100):
+        db = SessionLocal()
+        try:
+            return db.execute(select(Task).order_by(Task.id).limit(limit)).scalars().all()
+        finally:
+            db.close()
+
+    @sync_app.get("/analytics/dashboard")
+    async def get_dashboard_analytics():
+        db = SessionLocal()
+        try:
+            return {
+                "total_projects": db.scalar(select(func.count(Project.id))),
+                "total_tasks": db.scalar(select(func.count(Task.id))),
+                "total_bugs": db.scalar(select(func.count(Bug.id))),
+                "open_bugs": db.scalar(select(func.count(Bug.id)).where(Bug.status == "open")),
+                "completed_tasks": db.scalar(select(func.count(Task.id)).where(Task.status == "done")),
+            }
+        finally:
+            db.close()
+
+    return sync_app
+
+async def measure_loop_lag(lags: list, stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - start - 0.001)
+
+async def run_load(target, path: str, total: int, concurrency: int) -> dict:
+    latencies = []
+    lags = []
+    stop = asyncio.Event()
+    queue = iter(range(total))
+    transport = httpx.ASGITransport(app=target)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            for _ in queue:
+                start = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        ticker = asyncio.create_task(measure_loop_lag(lags, stop))
+        with Timer() as timer:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        stop.set()
+        await ticker
+
+    result = summarize(latencies, timer.elapsed)
+    result["max_loop_lag_ms"] = round(max(lags, default=0.0) * 1000, 2)
+    return result
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="tasks to seed")
+    parser.add_argument("--requests", type=int, default=400, help="requests per run")
+    parser.add_argument("--concurrency", default="1,8,32,64", help="comma separated concurrency levels")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    seed_rows(projects=50, tasks=args.rows, bugs=args.rows // 4)
+    targets = {"sync": build_sync_app(), "async": async_app}
+    paths = ["/tasks?limit=100", "/analytics/dashboard"]
+
+    results = []
+    for path in paths:
+        for level in [int(c) for c in args.concurrency.split(",")]:
+            for name, target in targets.items():
+                row = {"path": path, "mode": name, "concurrency": level}
+                row.update(await run_load(target, path, args.requests, level))
+                results.append(row)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'path':<24} {'mode':<6} {'conc':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'lag ms':>9}")
+    for row in results:
+        print(f"{row['path']:<24} {row['mode']:<6} {row['concurrency']:>5} {row['throughput_rps']:>9} "
+              f"{row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9} {row['max_loop_lag_ms']:>9}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: WebSocket broadcast latency with thousands of simulated clients.
+
+Simulated sockets deliver instantly, except a configurable share of slow
+ones that take --slow-ms per frame. Each run reports how long the
+broadcast call blocks its caller (the HTTP handler) and how long it takes
+for every fast client to receive the message. The "serial" mode reproduces
+the previous loop that awaited each send in turn.
+
+Usage (from backend/):
+    python benchmarks/bench_broadcast.py --clients 5000 --slow 50 --slow-ms 20 --messages 20
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from common import percentile
+
+from app.websocket_manager import ConnectionManager
+
+class SimulatedSocket:
+    """Stands in for a starlette WebSocket; records delivery times."""
+
+    def __init__(self, delay: float, received: dict):
+        self.delay = delay
+        self.received = received
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if message.startswith("{\"seq\""):
+            seq = json.loads(message)["seq"]
+            self.received.setdefault(seq, []).append((self, time.perf_counter()))
+
+    async def close(self, code: int = 1000):
+        pass
+
+async def serial_broadcast(sockets, message: str):
+    for socket in sockets:
+        try:
+            await socket.send_text(message)
+        except Exception:
+            pass
+
+async def run(mode: str, args) -> dict:
+    received = {}
+    fast = [SimulatedSocket(0, received) for _ in range(args.clients - args.slow)]
+    slow = [SimulatedSocket(args.slow_ms / 1000, received) for _ in range(args.slow)]
+    # Interleave slow clients so the serial loop hits them throughout
+    sockets = fast + slow
+    random.Random(7).shuffle(sockets)
+
+    manager = ConnectionManager(queue_size=args.queue_size, overflow_policy=args.policy)
+    if mode == "queued":
+        for index, socket in enumerate(sockets):
+            await manager.connect(socket, f"client-{index}")
+        await asyncio.sleep(0.05)  # let welcome messages drain
+
+    call_times, fanout_times = [], []
+    fast_set = set(map(id, fast))
+    for seq in range(args.messages):
+        message = json.dumps({"seq": seq, "type": "task_updated", "data": {"id": seq}})
+        start = time.perf_counter()
+        if mode == "queued":
+            await manager.broadcast(message)
+        else:
+            await serial_broadcast(sockets, message)
+        call_times.append(time.perf_counter() - start)
+
+        # Wait until every fast client has the message
+        while sum(1 for sock, _ in received.get(seq, ()) if id(sock) in fast_set) < len(fast):
+            await asyncio.sleep(0.001)
+        last_fast = max(t for sock, t in received[seq] if id(sock) in fast_set)
+        fanout_times.append(last_fast - start)
+
+    for index in range(len(sockets)):
+        manager.disconnect(f"client-{index}")
+    return {
+        "mode": mode,
+        "call_p50_ms": round(percentile(call_times, 50) * 1000, 2),
+        "call_p99_ms": round(percentile(call_times, 99) * 1000, 2),
+        "fast_fanout_p50_ms": round(percentile(fanout_times, 50) * 1000, 2),
+        "fast_fanout_p99_ms": round(percentile(fanout_times, 99) * 1000, 2),
+        "dropped_messages": manager.dropped_messages,
+        "evicted_clients": manager.evicted_clients,
+    }
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--slow", type=int, default=50, help="how many clients are slow")
+    parser.add_argument("--slow-ms", type=float, default=20, help="per-frame delay of a slow client")
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--queue-size", type=int, default=256)
+    parser.add_argument("--policy", default="disconnect")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = [await run("serial", args), await run("queued", args)]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.clients} clients, {args.slow} slow at {args.slow_ms} ms/frame, {args.messages} broadcasts")
+    print(f"{'mode':<7} {'call p50':>9} {'call p99':>9} {'fanout p50':>11} {'fanout p99':>11} {'dropped':>8} {'evicted':>8}")
+    for row in results:
+        print(f"{row['mode']:<7} {row['call_p50_ms']:>9} {row['call_p99_ms']:>9} {row['fast_fanout_p50_ms']:>11} "
+              f"{row['fast_fanout_p99_ms']:>11} {row['dropped_messages']:>8} {row['evicted_clients']:>8}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark: list payload size and latency across field sets and encodings.
+
+Requests a project's full task list through the real app (httpx's ASGI
+transport, so middleware included) with each --fieldsets entry as
+`fields=` ("all" sends none) and each Accept-Encoding in --encodings.
+Per combination it reports the JSON size, the bytes actually sent, the
+compression ratio and p50/p95 latency. Narrow field sets also skip the
+description column in SQL, so latency reflects less database I/O, not
+only less encoding.
+
+It then streams the whole task table as NDJSON under each encoding,
+calling the app directly so every body chunk is seen as it is sent, and
+decodes the chunks incrementally. It reports time to the first complete
+row and to the end of the stream, and exits non-zero if a compressed
+stream's first row only became readable with its last chunk.
+
+Usage (from backend/):
+    python benchmarks/bench_fieldsets.py --tasks 50000 --projects 25 --repeat 30
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import zlib
+
+from common import percentile, seed_rows, use_temp_database
+
+use_temp_database()
+
+import httpx
+
+from app.compression import brotli
+from app.main import app
+
+FIELDSETS = {
+    "all": None,
+    "board": "title,status,priority,assigned_to",
+    "table": "title,status,priority,assigned_to,updated_at",
+    "minimal": "status",
+}
+ENCODINGS = ["identity", "gzip", "br"]
+
+async def measure(fieldset: str, encoding: str, args) -> dict:
+    params = {"fields": FIELDSETS[fieldset]} if FIELDSETS[fieldset] else {}
+    headers = {"Accept-Encoding": encoding}
+    latencies, raw, wire, used = [], 0, 0, None
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for i in range(args.repeat):
+            start = time.perf_counter()
+            response = await client.get("/tasks", params={**params, "project_id": i % args.projects + 1},
+                                        headers=headers)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+            raw += len(response.content)
+            wire += response.num_bytes_downloaded
+            used = response.headers.get("content-encoding", "identity")
+    return {
+        "fieldset": fieldset,
+        "encoding": used,
+        "json_kb": round(raw / args.repeat / 1024, 1),
+        "wire_kb": round(wire / args.repeat / 1024, 1),
+        "ratio": round(raw / wire, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+    }
+
+def decoder_for(encoding: str):
+    """Incremental decompress function for a Content-Encoding."""
+    if encoding == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+    if encoding == "br":
+        return brotli.Decompressor().process
+    return lambda data: data
+
+async def measure_stream(encoding: str) -> dict:
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "scheme": "http", "server": ("bench", 80), "client": ("127.0.0.1", 1), "root_path": "",
+             "path": "/tasks", "raw_path": b"/tasks", "query_string": b"format=ndjson",
+             "headers": [(b"host", b"bench"), (b"accept-encoding", encoding.encode())]}
+    chunks, state = [], {"decode": None, "text": b"", "first_row": None, "first_chunk": None}
+    start = time.perf_counter()
+
+    requested = asyncio.Event()
+
+    async def receive():
+        # The request, then nothing: the client never disconnects
+        if requested.is_set():
+            await asyncio.Event().wait()
+        requested.set()
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            headers = dict(message["headers"])
+            state["encoding"] = headers.get(b"content-encoding", b"identity").decode()
+            state["decode"] = decoder_for(state["encoding"])
+        elif message["type"] == "http.response.body":
+            chunks.append(time.perf_counter() - start)
+            if state["first_row"] is None:
+                state["text"] += state["decode"](message.get("body", b""))
+                if b"\n" in state["text"]:
+                    state["first_row"], state["first_chunk"] = chunks[-1], len(chunks)
+
+    await app(scope, receive, send)
+    return {
+        "encoding": state["encoding"],
+        "chunks": len(chunks),
+        "first_row_chunk": state["first_chunk"],
+        "first_row_ms": round(state["first_row"] * 1000, 2),
+        "total_ms": round(chunks[-1] * 1000, 2),
+    }
+
+async def run(args) -> list:
+    results = []
+    for fieldset in args.fieldsets.split(","):
+        for encoding in args.encodings.split(","):
+            results.append(await measure(fieldset, encoding, args))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=50000, help="tasks to seed")
+    parser.add_argument("--projects", type=int, default=25, help="tasks per list = tasks / projects")
+    parser.add_argument("--repeat", type=int, default=30, help="requests per combination")
+    parser.add_argument("--fieldsets", default=",".join(FIELDSETS), help="comma separated subset of " + ",".join(FIELDSETS))
+    parser.add_argument("--encodings", default=",".join(ENCODINGS), help="Accept-Encoding values to compare")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    seed_rows(projects=args.projects, tasks=args.tasks)
+    results = asyncio.run(run(args))
+    streams = [asyncio.run(measure_stream(encoding)) for encoding in args.encodings.split(",")]
+    # The app sends one chunk per batch of rows; a stream whose first row
+    # needed its last chunk was buffered, not streamed
+    sent = max(row["chunks"] for row in streams)
+    buffered = [row["encoding"] for row in streams if sent > 1 and row["first_row_chunk"] == row["chunks"]]
+
+    if args.json:
+        print(json.dumps({"lists": results, "streams": streams}, indent=2))
+        sys.exit(1 if buffered else 0)
+    print(f"GET /tasks?project_id=..., {args.tasks // args.projects} tasks per list, {args.repeat} requests each")
+    print(f"{'fields':<8} {'encoding':<9} {'json KB':>9} {'wire KB':>9} {'ratio':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    for row in results:
+        print(f"{row['fieldset']:<8} {row['encoding']:<9} {row['json_kb']:>9} {row['wire_kb']:>9} "
+              f"{row['ratio']:>6} {row['p50_ms']:>8} {row['p95_ms']:>8}")
+    print(f"\nGET /tasks?format=ndjson, {args.tasks} tasks")
+    print(f"{'encoding':<9} {'chunks':>7} {'first row ms':>13} {'total ms':>9}")
+    for row in streams:
+        print(f"{row['encoding']:<9} {row['chunks']:>7} {row['first_row_ms']:>13} {row['total_ms']:>9}")
+    if buffered:
+        print(f"FAIL: {', '.join(buffered)} streams arrived in one piece at the end")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latency of unrelated endpoints during a login storm.
+
+Keeps a fixed number of logins in flight while a probe client polls
+/analytics/dashboard, and reports the probe's p50/p95/p99. The "inline" mode
+reproduces the previous behaviour of running bcrypt on the event loop; the
+"pool" mode is the current hashing thread pool.
+
+Usage (from backend/):
+    python benchmarks/bench_login_storm.py --logins 200 --storm 32 --rounds 12
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from common import Timer, summarize, use_temp_database
+
+use_temp_database()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200, help="logins per run")
+    parser.add_argument("--storm", type=int, default=32, help="logins kept in flight")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    return parser.parse_args()
+
+args = parse_args()
+os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+# Let the whole storm queue so the run measures latency, not rejections
+os.environ.setdefault("PASSWORD_HASH_QUEUE", str(args.storm))
+
+import httpx
+
+from app import auth, main
+from app.database import SessionLocal, upgrade_schema
+from app.models import User
+
+PASSWORD = "storm-password"
+
+async def verify_inline(plain_password, hashed_password):
+    return auth.pwd_context.verify_and_update(plain_password, hashed_password)
+
+async def run_storm(mode: str) -> dict:
+    main.verify_and_update_password = verify_inline if mode == "inline" else auth.verify_and_update_password
+    transport = httpx.ASGITransport(app=main.app)
+    probe_latencies = []
+    login_latencies = []
+    remaining = iter(range(args.logins))
+    storm_done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def login_worker():
+            for _ in remaining:
+                start = time.perf_counter()
+                response = await client.post("/auth/login", json={"email": "storm@bench.local", "password": PASSWORD})
+                response.raise_for_status()
+                login_latencies.append(time.perf_counter() - start)
+
+        async def probe():
+            while not storm_done.is_set():
+                start = time.perf_counter()
+                (await client.get("/analytics/dashboard")).raise_for_status()
+                probe_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.005)
+
+        probe_task = asyncio.create_task(probe())
+        with Timer() as timer:
+            await asyncio.gather(*(login_worker() for _ in range(args.storm)))
+        storm_done.set()
+        await probe_task
+
+    return {
+        "mode": mode,
+        "logins": summarize(login_latencies, timer.elapsed),
+        "probe": summarize(probe_latencies, timer.elapsed),
+    }
+
+async def run():
+    upgrade_schema()
+    db = SessionLocal()
+    db.add(User(email="storm@bench.local", username="storm", hashed_password=auth.pwd_context.hash(PASSWORD)))
+    db.commit()
+    db.close()
+
+    results = [await run_storm("inline"), await run_storm("pool")]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"bcrypt rounds={args.rounds}, {args.logins} logins, {args.storm} in flight")
+    print(f"{'mode':<7} {'login rps':>10} {'probe p50':>10} {'probe p95':>10} {'probe p99':>10}")
+    for row in results:
+        probe = row["probe"]
+        print(f"{row['mode']:<7} {row['logins']['throughput_rps']:>10} {probe['p50_ms']:>10} "
+              f"{probe['p95_ms']:>10} {probe['p99_ms']:>10}")
+
+if __name__ == "__main__":
+    asyncio.run(run())
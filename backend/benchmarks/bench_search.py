@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /search on the full-text index vs. scanning with LIKE.
+
+Generates --rows tasks and bugs (half each) whose titles and descriptions
+draw words from a Zipf-like vocabulary, so some terms are very common and
+most are rare. Rows are inserted through the normal tables, so the load
+rate includes keeping the index in sync. Each query then runs through the
+same code as the /search endpoint, against a baseline that finds every
+row whose title or description contains the words with LIKE, which is
+what filtering the full lists amounts to.
+
+Usage (from backend/):
+    python benchmarks/bench_search.py --rows 1000000 --repeat 20
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from common import Timer, percentile, use_temp_database
+
+use_temp_database()
+
+from sqlalchemy import insert, text
+
+from app.database import AsyncSessionLocal, engine, upgrade_schema
+from app.models import User, Project, Task, Bug
+from app.search import search_items
+
+VOCABULARY = (
+    "login logout session token refresh redirect dashboard widget chart report export import "
+    "upload download avatar profile settings password email notification webhook payment invoice "
+    "checkout cart search filter sort pagination cache timeout retry queue worker cron migration "
+    "schema index query latency memory leak crash freeze render layout mobile tablet desktop dark "
+    "theme font icon tooltip modal dropdown calendar timezone locale translation accessibility "
+    "keyboard shortcut clipboard drag drop resize scroll animation build deploy pipeline release"
+).split()
+
+# Zipf-like: word k is drawn with weight 1/(k+1)
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+def make_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(VOCABULARY, weights=WEIGHTS, k=words))
+
+def load(rows: int, projects: int, batch: int, seed: int) -> float:
+    """Insert the dataset; returns rows per second."""
+    rng = random.Random(seed)
+    upgrade_schema()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "bench@bench.local", "username": "bench", "hashed_password": "x"}])
+        conn.execute(insert(Project), [{"name": f"Project {i}", "owner_id": 1} for i in range(projects)])
+
+    start = time.perf_counter()
+    for model, creator in ((Task, "created_by"), (Bug, "reported_by")):
+        remaining = rows // 2
+        while remaining:
+            count = min(batch, remaining)
+            remaining -= count
+            with engine.begin() as conn:
+                conn.execute(insert(model), [
+                    {"title": make_text(rng, 5).capitalize(), "description": make_text(rng, 30),
+                     "project_id": rng.randrange(projects) + 1, creator: 1}
+                    for _ in range(count)
+                ])
+    return rows / (time.perf_counter() - start)
+
+def like_scan(words) -> int:
+    """Baseline: every task and bug containing all the words."""
+    where = " AND ".join(f"(title LIKE :w{i} OR description LIKE :w{i})" for i in range(len(words)))
+    params = {f"w{i}": f"%{word}%" for i, word in enumerate(words)}
+    with engine.connect() as conn:
+        return sum(
+            len(conn.execute(text(f"SELECT id, title, description FROM {table} WHERE {where}"), params).all())
+            for table in ("tasks", "bugs")
+        )
+
+async def timed_search(q: str, limit: int):
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        hits, _ = await search_items(db, q, limit)
+        return time.perf_counter() - start, len(hits)
+
+async def run(args) -> dict:
+    with Timer() as timer:
+        rows_per_sec = load(args.rows, args.projects, args.batch, args.seed)
+    queries = {
+        "common word": VOCABULARY[0],
+        "mid word": VOCABULARY[len(VOCABULARY) // 4],
+        "rare word": VOCABULARY[-1],
+        "two words": f"{VOCABULARY[1]} {VOCABULARY[10]}",
+        "prefix": VOCABULARY[5][:4],
+    }
+    results = []
+    for name, q in queries.items():
+        fts = [await timed_search(q, args.limit) for _ in range(args.repeat)]
+        scans = []
+        for _ in range(max(1, args.repeat // 10)):
+            with Timer() as scan:
+                matches = like_scan(q.split())
+            scans.append(scan.elapsed)
+        latencies = [elapsed for elapsed, _ in fts]
+        results.append({
+            "query": name,
+            "q": q,
+            "hits_returned": fts[0][1],
+            "like_matches": matches,
+            "fts_p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "fts_p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "like_p50_ms": round(percentile(scans, 50) * 1000, 2),
+        })
+    return {"rows": args.rows, "load_seconds": round(timer.elapsed, 1),
+            "load_rows_per_sec": round(rows_per_sec), "queries": results}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=10000, help="rows per insert transaction")
+    parser.add_argument("--repeat", type=int, default=20, help="searches per query")
+    parser.add_argument("--limit", type=int, default=20, help="hits per page")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{report['rows']} rows loaded in {report['load_seconds']} s ({report['load_rows_per_sec']} rows/s, index kept in sync)")
+    print(f"{'query':<12} {'q':<22} {'matches':>8} {'fts p50':>8} {'fts p95':>8} {'like p50':>9}")
+    for row in report["queries"]:
+        print(f"{row['query']:<12} {row['q']:<22} {row['like_matches']:>8} {row['fts_p50_ms']:>8} "
+              f"{row['fts_p95_ms']:>8} {row['like_p50_ms']:>9}")
+
+if __name__ == "__main__":
+    main()
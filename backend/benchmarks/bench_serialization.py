@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: list response serialization, ORM + jsonable_encoder vs. schemas + orjson.
+
+"before" reproduces the previous list path: load full Task entities and
+let FastAPI run jsonable_encoder over them before json.dumps. "after" is
+the current path: select only the TaskOut columns, validate the Row tuples
+into TaskOut and encode with orjson. Each run reports the query and the
+encode time separately, plus end-to-end rows per second, and checks that
+both paths produce the same JSON document.
+
+Usage (from backend/):
+    python benchmarks/bench_serialization.py --tasks 50000 --repeat 5
+"""
+
+import argparse
+import json
+import statistics
+
+from common import Timer, seed_rows, use_temp_database
+
+use_temp_database()
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models import Task
+from app.responses import dumps
+from app.schemas import TaskOut
+
+def before(db):
+    with Timer() as query:
+        rows = db.execute(select(Task).order_by(Task.id)).scalars().all()
+    with Timer() as encode:
+        # Same settings as starlette's JSONResponse.render
+        body = json.dumps(jsonable_encoder(rows), ensure_ascii=False, allow_nan=False,
+                          separators=(",", ":")).encode("utf-8")
+    return query.elapsed, encode.elapsed, body
+
+def after(db):
+    with Timer() as query:
+        rows = db.execute(select(*TaskOut.columns(Task)).order_by(Task.id)).all()
+    with Timer() as encode:
+        body = dumps([TaskOut.from_row(row) for row in rows])
+    return query.elapsed, encode.elapsed, body
+
+def measure(name: str, fn, repeat: int, tasks: int) -> dict:
+    queries, encodes, body = [], [], b""
+    for _ in range(repeat):
+        # A fresh session per run so the identity map does not carry over
+        db = SessionLocal()
+        try:
+            query, encode, body = fn(db)
+        finally:
+            db.close()
+        queries.append(query)
+        encodes.append(encode)
+    query, encode = statistics.median(queries), statistics.median(encodes)
+    return {
+        "path": name,
+        "query_ms": round(query * 1000, 1),
+        "encode_ms": round(encode * 1000, 1),
+        "total_ms": round((query + encode) * 1000, 1),
+        "rows_per_sec": round(tasks / (query + encode)),
+        "bytes": len(body),
+        "body": body,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per path; the median is reported")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    seed_rows(projects=50, tasks=args.tasks, users=20)
+    results = [measure("before", before, args.repeat, args.tasks), measure("after", after, args.repeat, args.tasks)]
+    same = json.loads(results[0].pop("body")) == json.loads(results[1].pop("body"))
+    speedup = round(results[0]["total_ms"] / results[1]["total_ms"], 2)
+
+    if args.json:
+        print(json.dumps({"tasks": args.tasks, "identical_output": same, "speedup": speedup, "results": results}, indent=2))
+        return
+    print(f"{args.tasks} tasks, median of {args.repeat} runs")
+    print(f"{'path':<7} {'query ms':>9} {'encode ms':>10} {'total ms':>9} {'rows/s':>9} {'bytes':>10}")
+    for row in results:
+        print(f"{row['path']:<7} {row['query_ms']:>9} {row['encode_ms']:>10} {row['total_ms']:>9} "
+              f"{row['rows_per_sec']:>9} {row['bytes']:>10}")
+    print(f"speedup: {speedup}x, identical output: {same}")
+
+if __name__ == "__main__":
+    main()
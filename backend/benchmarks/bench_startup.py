@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: API cold start, with an import-time profile.
+
+Each run is a fresh interpreter that imports app.main and runs the startup
+handlers against an already migrated database, timing both phases. For
+comparison it also times the work startup used to do on every boot:
+create_all, the full-text index and rollup backfill checks, and counting
+users to decide on seeding. The profile comes from `python -X importtime`
+and lists where import time goes, by package and for the app's modules.
+
+Usage (from backend/):
+    python benchmarks/bench_startup.py --runs 10 --top 15
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from common import BACKEND_DIR, percentile, seed_rows, use_temp_database
+
+use_temp_database()
+
+# Runs in the child interpreter; prints one JSON line of timings
+CHILD = """
+import asyncio, json, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def boot():
+    await app.router.startup()
+    started = time.perf_counter()
+    await app.router.shutdown()
+    return started
+
+started = asyncio.run(boot())
+timings = {"import_ms": (imported - start) * 1000, "startup_ms": (started - imported) * 1000}
+
+if PREVIOUS:
+    from sqlalchemy import func, select
+    from app.database import Base, SessionLocal, engine
+    from app.models import User
+    from app.rollups import backfill_rollups
+    from app.search import create_search_index
+    start = time.perf_counter()
+    Base.metadata.create_all(bind=engine)
+    create_search_index(engine)
+    backfill_rollups(engine)
+    with SessionLocal() as db:
+        db.scalar(select(func.count(User.id)))
+    timings["previous_startup_ms"] = (time.perf_counter() - start) * 1000
+print(json.dumps(timings))
+"""
+
+def run_child(previous: bool) -> dict:
+    code = CHILD.replace("PREVIOUS", str(previous))
+    output = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=os.environ,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def import_profile() -> list:
+    """(module, self µs, cumulative µs) for every module app.main imports."""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=BACKEND_DIR,
+                            env=os.environ, capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(own), int(cumulative)))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per measurement")
+    parser.add_argument("--tasks", type=int, default=20000, help="tasks to seed")
+    parser.add_argument("--top", type=int, default=15, help="rows per profile table")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    seed_rows(projects=50, tasks=args.tasks, bugs=args.tasks // 4)
+    runs = [run_child(previous=True) for _ in range(args.runs)]
+    summary = {}
+    for name in runs[0]:
+        values = [run[name] for run in runs]
+        summary[name] = {"p50_ms": round(percentile(values, 50), 1), "max_ms": round(max(values), 1)}
+
+    rows = import_profile()
+    packages = defaultdict(int)
+    for module, own, _ in rows:
+        packages[module.split(".")[0]] += own
+    report = {
+        "timings": summary,
+        "packages": sorted(((name, round(us / 1000, 1)) for name, us in packages.items()), key=lambda row: -row[1]),
+        "app_modules": sorted(((module, round(own / 1000, 1), round(cumulative / 1000, 1))
+                               for module, own, cumulative in rows if module.split(".")[0] == "app"),
+                              key=lambda row: -row[2]),
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{args.runs} cold starts, {args.tasks} tasks")
+    print(f"{'phase':<22} {'p50 ms':>9} {'max ms':>9}")
+    for name, row in summary.items():
+        print(f"{name[:-3]:<22} {row['p50_ms']:>9} {row['max_ms']:>9}")
+    print(f"\n{'package':<22} {'self ms':>9}")
+    for name, ms in report["packages"][:args.top]:
+        print(f"{name:<22} {ms:>9}")
+    print(f"\n{'app module':<22} {'self ms':>9} {'cumul ms':>9}")
+    for module, own, cumulative in report["app_modules"][:args.top]:
+        print(f"{module:<22} {own:>9} {cumulative:>9}")
+
+if __name__ == "__main__":
+    main()
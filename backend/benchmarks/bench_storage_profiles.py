@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark: mixed read/write load under each storage profile.
+
+Concurrent workers share one async engine built with a profile from
+app/storage.py. Each operation is either a read (a page of a project's
+tasks) or, with probability --write-ratio, a Kanban move: read the task,
+update its status, commit. Per profile the run reports read and write
+throughput and latency, and how many operations failed, e.g. with
+"database is locked".
+
+On SQLite every profile gets its own copy of the seeded database, with the
+journal mode reset first, since WAL mode persists in the file. Against
+Postgres (--database-url) all profiles run on the same database.
+
+Usage (from backend/):
+    python benchmarks/bench_storage_profiles.py --operations 4000 --concurrency 32 --write-ratio 0.3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import time
+
+from common import Timer, seed_rows, summarize, use_temp_database
+
+use_temp_database()
+
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import engine, to_async_url
+from app.models import Task
+from app.storage import PROFILES, apply_profile, engine_options
+
+TASK_STATUSES = ["todo", "in_progress", "review", "done"]
+
+def database_for(profile: str) -> str:
+    """A database URL for `profile`: a fresh copy of the seeded file on SQLite."""
+    url = make_url(str(engine.url))
+    if url.get_backend_name() != "sqlite":
+        return engine.url.render_as_string(hide_password=False)
+    root, ext = os.path.splitext(url.database)
+    path = f"{root}-{profile}{ext}"
+    shutil.copyfile(url.database, path)
+    copy = create_engine(f"sqlite:///{path}")
+    with copy.connect() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode = DELETE")
+    copy.dispose()
+    return f"sqlite:///{path}"
+
+async def run_profile(profile: str, args) -> dict:
+    url = to_async_url(database_for(profile))
+    async_engine = create_async_engine(url, **engine_options(url, profile))
+    apply_profile(async_engine.sync_engine, profile)
+    sessions = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    latencies = {"read": [], "write": []}
+    errors = {"read": 0, "write": 0}
+    queue = iter(range(args.operations))
+
+    async def read(rng: random.Random):
+        async with sessions() as db:
+            stmt = select(Task).where(Task.project_id == rng.randint(1, args.projects)).order_by(Task.id).limit(50)
+            (await db.scalars(stmt)).all()
+
+    async def write(rng: random.Random):
+        async with sessions() as db:
+            task = await db.get(Task, rng.randint(1, args.tasks))
+            await db.execute(update(Task).where(Task.id == task.id).values(status=rng.choice(TASK_STATUSES)))
+            await db.commit()
+
+    async def worker(seed: int):
+        rng = random.Random(seed)
+        for _ in queue:
+            kind = "write" if rng.random() < args.write_ratio else "read"
+            start = time.perf_counter()
+            try:
+                await (write if kind == "write" else read)(rng)
+            except DBAPIError:
+                errors[kind] += 1
+                continue
+            latencies[kind].append(time.perf_counter() - start)
+
+    try:
+        with Timer() as timer:
+            await asyncio.gather(*(worker(args.seed + i) for i in range(args.concurrency)))
+    finally:
+        await async_engine.dispose()
+
+    result = {"profile": profile}
+    for kind in ("read", "write"):
+        result[kind] = summarize(latencies[kind], timer.elapsed)
+        result[kind]["errors"] = errors[kind]
+    result["throughput_rps"] = round(sum(map(len, latencies.values())) / timer.elapsed, 1)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", default=",".join(PROFILES), help="comma separated profiles to compare")
+    parser.add_argument("--operations", type=int, default=4000, help="reads plus writes per profile")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--write-ratio", type=float, default=0.3, help="share of operations that write")
+    parser.add_argument("--tasks", type=int, default=20000, help="tasks to seed")
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    seed_rows(projects=args.projects, tasks=args.tasks)
+    # Checkpoint and close, so the copies hold every seeded row
+    engine.dispose()
+    results = [asyncio.run(run_profile(profile, args)) for profile in args.profiles.split(",")]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.operations} operations, {args.concurrency} workers, {args.write_ratio:.0%} writes, "
+          f"{engine.dialect.name}")
+    print(f"{'profile':<12} {'ops/s':>8} {'read p50':>9} {'read p95':>9} {'write p50':>10} {'write p95':>10} {'errors':>7}")
+    for row in results:
+        read, write = row["read"], row["write"]
+        print(f"{row['profile']:<12} {row['throughput_rps']:>8} {read['p50_ms']:>9} {read['p95_ms']:>9} "
+              f"{write['p50_ms']:>10} {write['p95_ms']:>10} {read['errors'] + write['errors']:>7}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Shared helpers for the DevTrack benchmark scripts.
+
+Benchmarks run against a throwaway SQLite database unless --database-url
+names another one. An exported DATABASE_URL is deliberately ignored: the
+scripts bulk insert, drop indexes and empty tables, so a real database has
+to be asked for on the command line.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+def use_temp_database() -> str:
+    """Point DATABASE_URL at a fresh SQLite file, or at --database-url if given.
+
+    The option is taken out of sys.argv, so the script's own parser never
+    sees it. Must run before anything under `app` is imported, since the
+    engines are created from settings at import time.
+    """
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument("--database-url")
+    known, sys.argv[1:] = parser.parse_known_args(sys.argv[1:])
+    if known.database_url:
+        os.environ["DATABASE_URL"] = known.database_url
+    else:
+        path = os.path.join(tempfile.mkdtemp(prefix="devtrack-bench-"), "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    return os.environ["DATABASE_URL"]
+
+def seed_rows(projects: int, tasks: int, bugs: int = 0, users: int = 1):
+    """Create the schema and bulk insert synthetic rows with core inserts."""
+    from sqlalchemy import insert
+    from app.database import engine, upgrade_schema
+    from app.models import User, Project, Task, Bug
+
+    upgrade_schema()
+    statuses = ["todo", "in_progress", "review", "done"]
+    bug_statuses = ["open", "in_progress", "fixed", "closed"]
+    levels = ["low", "medium", "high", "critical"]
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"email": f"user{i}@bench.local", "username": f"user{i}", "hashed_password": "x", "role": "developer"}
+            for i in range(1, users + 1)
+        ])
+        conn.execute(insert(Project), [
+            {"name": f"Project {i}", "description": "Benchmark project", "owner_id": 1}
+            for i in range(1, projects + 1)
+        ])
+        if tasks:
+            conn.execute(insert(Task), [
+                {"title": f"Task {i}", "description": "Benchmark task " * 8,
+                 "status": statuses[i % 4], "priority": levels[i % 4],
+                 "project_id": i % projects + 1, "assigned_to": i % users + 1, "created_by": 1}
+                for i in range(tasks)
+            ])
+        if bugs:
+            conn.execute(insert(Bug), [
+                {"title": f"Bug {i}", "description": "Benchmark bug " * 8,
+                 "status": bug_statuses[i % 4], "severity": levels[i % 4],
+                 "project_id": i % projects + 1, "assigned_to": i % users + 1, "reported_by": 1}
+                for i in range(bugs)
+            ])
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def summarize(latencies, elapsed: float) -> dict:
+    """Throughput and latency percentiles (milliseconds) for one run."""
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+class Timer:
+    """Context manager recording wall-clock seconds in `.elapsed`."""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
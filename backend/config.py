@@ -7,15 +7,31 @@ class Settings:
     # Database - Use absolute path to ensure persistence
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
     DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(BASE_DIR, 'devtrack.db')}")
+    STORAGE_PROFILE = os.getenv("STORAGE_PROFILE", "concurrent")  # or default / durable, see app/storage.py
     
     # JWT
     SECRET_KEY = os.getenv("SECRET_KEY", "your-super-secret-jwt-key-change-in-production")
     ALGORITHM = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES = 30
     
+    # Password hashing
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "64"))  # waiting requests before 503
+    
+    # Authenticated principal cache
+    PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+    PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    
     # Redis
     REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
     
+    # Cross-worker WebSocket events: "local" (single worker), "redis" or "memory" (one process, tests)
+    EVENT_BUS_BACKEND = os.getenv("EVENT_BUS_BACKEND", "local")
+    EVENT_BUS_CHANNEL = os.getenv("EVENT_BUS_CHANNEL", "devtrack:events")
+    EVENT_BUS_BATCH_MS = float(os.getenv("EVENT_BUS_BATCH_MS", "5"))
+    WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))  # worker processes, as passed to uvicorn/gunicorn
+    
     # CORS
     CORS_ORIGINS = [
         "http://localhost:3000", 
@@ -26,5 +42,34 @@ class Settings:
     
     # WebSocket
     WEBSOCKET_MANAGER_TTL = 300  # 5 minutes
+    WEBSOCKET_SEND_QUEUE_SIZE = int(os.getenv("WEBSOCKET_SEND_QUEUE_SIZE", "256"))  # messages per client
+    WEBSOCKET_OVERFLOW_POLICY = os.getenv("WEBSOCKET_OVERFLOW_POLICY", "disconnect")  # or drop_oldest / drop_newest
+    WEBSOCKET_COALESCE_MS = float(os.getenv("WEBSOCKET_COALESCE_MS", "5"))  # 0 sends every event on its own
+    WEBSOCKET_PER_MESSAGE_DEFLATE = os.getenv("WEBSOCKET_PER_MESSAGE_DEFLATE", "true").lower() == "true"
+    WEBSOCKET_DEFLATE_MIN_SIZE = int(os.getenv("WEBSOCKET_DEFLATE_MIN_SIZE", "512"))  # bytes
+    WEBSOCKET_REPLAY_MAX = int(os.getenv("WEBSOCKET_REPLAY_MAX", "1000"))  # missed changes replayed on reconnect
+    
+    # Analytics
+    ANALYTICS_RECONCILE_SECONDS = int(os.getenv("ANALYTICS_RECONCILE_SECONDS", "60"))
+    
+    # Change log
+    CHANGE_LOG_COMPACT_SECONDS = int(os.getenv("CHANGE_LOG_COMPACT_SECONDS", "3600"))
+    CHANGE_LOG_TOMBSTONE_DAYS = int(os.getenv("CHANGE_LOG_TOMBSTONE_DAYS", "7"))  # then clients that far behind must refetch
+    
+    # HTTP response compression (gzip, or brotli when the package is installed)
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # bytes; smaller bodies go out as-is
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))  # higher is smaller but much slower
+    
+    # Archival of done tasks and closed bugs
+    ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "0"))  # untouched for this long, e.g. 90; 0 (default) disables archival
+    ARCHIVE_INTERVAL_SECONDS = int(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+    ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))  # rows moved per transaction
+    
+    # Metrics
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"  # /metrics and SQL timing hooks
+    QUERY_DEBUG = os.getenv("QUERY_DEBUG", "false").lower() == "true"  # log N+1 query patterns per request
+    QUERY_DEBUG_REPEAT_THRESHOLD = int(os.getenv("QUERY_DEBUG_REPEAT_THRESHOLD", "3"))  # same-shape queries that count as N+1
 
 settings = Settings()
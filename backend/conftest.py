@@ -0,0 +1,77 @@
+import os
+import tempfile
+
+import pytest
+
+# Tests never run against a configured database. The engines are created
+# from DATABASE_URL when app is imported, so it is set before anything else.
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="devtrack-test-"), "test.db")
+
+from app.query_log import assert_max_queries
+
+PROJECTS, TASKS, BUGS, USERS = 20, 2000, 500, 10
+
+def seed(engine):
+    """Bulk insert synthetic rows, then derive what the write path maintains."""
+    from sqlalchemy import insert
+    from app.changelog import backfill_change_log
+    from app.models import User, Project, Task, Bug
+    from app.rollups import backfill_rollups
+
+    statuses = ["todo", "in_progress", "review", "done"]
+    bug_statuses = ["open", "in_progress", "fixed", "closed"]
+    levels = ["low", "medium", "high", "critical"]
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"email": f"user{i}@test.local", "username": f"user{i}", "hashed_password": "x", "role": "developer"}
+            for i in range(1, USERS + 1)
+        ])
+        conn.execute(insert(Project), [
+            {"name": f"Project {i}", "description": "Test project", "owner_id": 1} for i in range(1, PROJECTS + 1)
+        ])
+        conn.execute(insert(Task), [
+            {"title": f"Task {i}", "description": "Test task", "status": statuses[i % 4], "priority": levels[i % 4],
+             "project_id": i % PROJECTS + 1, "assigned_to": i % USERS + 1, "created_by": 1}
+            for i in range(TASKS)
+        ])
+        conn.execute(insert(Bug), [
+            {"title": f"Bug {i}", "description": "Test bug", "status": bug_statuses[i % 4], "severity": levels[i % 4],
+             "project_id": i % PROJECTS + 1, "assigned_to": i % USERS + 1, "reported_by": 1}
+            for i in range(BUGS)
+        ])
+    backfill_rollups(engine)
+    backfill_change_log(engine)
+
+@pytest.fixture(scope="session")
+def engine():
+    """The migrated and seeded test database, shared by every test."""
+    from app.database import engine, upgrade_schema
+
+    upgrade_schema()
+    seed(engine)
+    return engine
+
+@pytest.fixture(scope="session")
+def client(engine):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture(scope="session")
+def auth_headers(engine):
+    """Bearer token for user1, who created every seeded project, task and bug."""
+    from app.auth import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token({'sub': 'user1@test.local'})}"}
+
+@pytest.fixture
+def max_queries():
+    """Query budget for endpoint tests, failing with every statement run:
+
+        def test_project_tasks(client, max_queries):
+            with max_queries(1):
+                client.get("/tasks?project_id=1")
+    """
+    return assert_max_queries
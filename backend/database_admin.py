@@ -2,10 +2,31 @@
 """
 DevTrack Database Administration Tool
 Run this script to manage data directly in the database
+
+Without arguments it opens the interactive menu on devtrack.db. The export
+command streams users, projects, tasks and bugs from DATABASE_URL instead:
+
+    python database_admin.py export --format parquet --output-dir export/
+    python database_admin.py export --format csv --project-id 3 --since 2025-09-01T00:00:00
+
+The archive command runs the API's archival job once, e.g. to work through
+a large backlog off-peak:
+
+    python database_admin.py archive --days 90 --batch-size 5000
 """
 
+import argparse
+import asyncio
+import csv
+import enum
+import json
+import os
 import sqlite3
-from datetime import datetime
+import sys
+from datetime import datetime, timedelta
+
+import orjson
+
 from app.models import UserRole
 
 def connect_db():
@@ -168,6 +189,203 @@ def create_sample_data():
     finally:
         conn.close()
 
+# Streaming export
+# Rows are read in batches of --batch-size through a streaming cursor
+# (server-side on Postgres), so memory stays flat however big the tables.
+
+EXPORT_ENTITIES = ["users", "projects", "tasks", "bugs"]
+EXPORT_FORMATS = {"ndjson": "ndjson", "csv": "csv", "parquet": "parquet"}
+ARCHIVE_ENTITIES = ["tasks", "bugs"]
+
+def export_query(entity, project_ids=None, since=None):
+    """SELECT for one entity, with the names its foreign keys point at."""
+    from sqlalchemy import func, select
+    from sqlalchemy.orm import aliased
+    from app.models import User, Project, Task, Bug
+    
+    if entity == "users":
+        # Never export password hashes
+        stmt = select(User.id, User.email, User.username, User.role, User.is_active,
+                      User.created_at, User.updated_at)
+        model = User
+    elif entity == "projects":
+        owner = aliased(User)
+        stmt = (select(Project.id, Project.name, Project.description, Project.owner_id,
+                       owner.username.label("owner_username"), Project.is_active,
+                       Project.created_at, Project.updated_at)
+                .outerjoin(owner, Project.owner_id == owner.id))
+        model = Project
+        if project_ids:
+            stmt = stmt.where(Project.id.in_(project_ids))
+    else:
+        model = Task if entity == "tasks" else Bug
+        level = Task.priority if model is Task else Bug.severity
+        author = Task.created_by if model is Task else Bug.reported_by
+        assignee, creator = aliased(User), aliased(User)
+        stmt = (select(model.id, model.title, model.description, model.status, level,
+                       model.project_id, Project.name.label("project_name"),
+                       model.assigned_to, assignee.username.label("assignee_username"),
+                       author, creator.username.label(f"{author.key}_username"),
+                       model.created_at, model.updated_at)
+                .outerjoin(Project, model.project_id == Project.id)
+                .outerjoin(assignee, model.assigned_to == assignee.id)
+                .outerjoin(creator, author == creator.id))
+        if project_ids:
+            stmt = stmt.where(model.project_id.in_(project_ids))
+    
+    if since is not None:
+        stmt = stmt.where(func.coalesce(model.updated_at, model.created_at) >= since)
+    return stmt.order_by(model.id)
+
+def plain(value):
+    """Enum members as their values; everything else unchanged."""
+    return value.value if isinstance(value, enum.Enum) else value
+
+class NdjsonWriter:
+    def __init__(self, path, columns):
+        self.file = open(path, "wb")
+        self.columns = columns
+    
+    def write(self, rows):
+        for row in rows:
+            self.file.write(orjson.dumps(dict(zip(self.columns, map(plain, row)))) + b"\n")
+    
+    def close(self):
+        self.file.close()
+
+class CsvWriter:
+    def __init__(self, path, columns):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+    
+    def write(self, rows):
+        for row in rows:
+            self.writer.writerow([value.isoformat() if isinstance(value, datetime) else plain(value) for value in row])
+    
+    def close(self):
+        self.file.close()
+
+class ParquetWriter:
+    """One row group per batch, typed from the query's columns."""
+    
+    def __init__(self, path, columns, types):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            sys.exit("Parquet export needs pyarrow: pip install -r requirements.txt")
+        self.pa = pa
+        self.schema = pa.schema([(name, self.arrow_type(sql_type)) for name, sql_type in zip(columns, types)])
+        self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+    
+    def arrow_type(self, sql_type):
+        from sqlalchemy import Boolean, Date, DateTime, Integer
+        pa = self.pa
+        if isinstance(sql_type, Integer):
+            return pa.int64()
+        if isinstance(sql_type, Boolean):
+            return pa.bool_()
+        if isinstance(sql_type, DateTime):
+            return pa.timestamp("us")
+        if isinstance(sql_type, Date):
+            return pa.date32()
+        return pa.string()
+    
+    def write(self, rows):
+        columns = [[plain(value) for value in column] for column in zip(*rows)]
+        self.writer.write_table(self.pa.Table.from_arrays(
+            [self.pa.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+            schema=self.schema,
+        ))
+    
+    def close(self):
+        self.writer.close()
+
+def export_entity(conn, entity, fmt, path, batch_size, project_ids=None, since=None):
+    """Stream one entity into `path`; returns the number of rows written."""
+    stmt = export_query(entity, project_ids, since)
+    columns = [column.name for column in stmt.selected_columns]
+    if fmt == "parquet":
+        writer = ParquetWriter(path, columns, [column.type for column in stmt.selected_columns])
+    else:
+        writer = (NdjsonWriter if fmt == "ndjson" else CsvWriter)(path, columns)
+    
+    count = 0
+    try:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(stmt)
+        for rows in result.partitions():
+            writer.write(rows)
+            count += len(rows)
+    finally:
+        writer.close()
+    return count
+
+def export(args):
+    """Non-interactive export of users, projects, tasks and bugs."""
+    from app.database import engine
+    
+    # Taken before reading, so the next --since export misses nothing
+    started = datetime.utcnow()
+    os.makedirs(args.output_dir, exist_ok=True)
+    print(f"Exporting from {engine.url.render_as_string(hide_password=True)} to {args.output_dir}/")
+    
+    manifest = {"started_at": started.isoformat(), "since": args.since.isoformat() if args.since else None,
+                "project_ids": args.project_id, "format": args.format, "files": {}}
+    with engine.connect() as conn:
+        for entity in args.entities:
+            path = os.path.join(args.output_dir, f"{entity}.{EXPORT_FORMATS[args.format]}")
+            count = export_entity(conn, entity, args.format, path, args.batch_size, args.project_id, args.since)
+            manifest["files"][entity] = {"path": os.path.basename(path), "rows": count}
+            print(f"  {entity:<10} {count:>10} rows -> {path}")
+    
+    with open(os.path.join(args.output_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Next incremental export: --since {started.isoformat()}")
+
+def run_archive(args):
+    """Move done tasks and closed bugs untouched for args.days into the archive tables."""
+    from app.archive import archive
+    from app.database import engine
+    
+    print(f"Archiving rows untouched for {args.days} days in {engine.url.render_as_string(hide_password=True)}")
+    entities = [name[:-1] for name in args.entities]  # app.archive names them singular
+    moved = asyncio.run(archive(timedelta(days=args.days), args.batch_size, entities=entities))
+    for entity, count in moved.items():
+        print(f"  {entity + 's':<10} {count:>10} rows archived")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="DevTrack database administration (interactive without a command)")
+    commands = parser.add_subparsers(dest="command")
+    
+    exporter = commands.add_parser("export", help="stream tables to NDJSON, CSV or Parquet files",
+                                   description="Export rows from DATABASE_URL, one file per entity plus manifest.json.")
+    exporter.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="ndjson",
+                          help="output format (default ndjson); parquet needs pyarrow, from requirements.txt")
+    exporter.add_argument("--output-dir", default="export")
+    exporter.add_argument("--entities", type=lambda value: value.split(","), default=EXPORT_ENTITIES,
+                          help="comma separated subset of " + ",".join(EXPORT_ENTITIES))
+    exporter.add_argument("--project-id", type=int, action="append",
+                          help="only this project's projects, tasks and bugs (repeatable; users are never filtered)")
+    exporter.add_argument("--since", type=datetime.fromisoformat,
+                          help="only rows created or updated at or after this UTC time, e.g. the last run's started_at")
+    exporter.add_argument("--batch-size", type=int, default=5000, help="rows fetched per round trip")
+    
+    archiver = commands.add_parser("archive", help="move old done tasks and closed bugs to the archive tables",
+                                   description="Run the archival job once against DATABASE_URL. Running API "
+                                               "workers see the rows leave on their next write or restart.")
+    archiver.add_argument("--days", type=int, default=90, help="archive rows not updated for this many days")
+    archiver.add_argument("--batch-size", type=int, default=1000, help="rows moved per transaction")
+    archiver.add_argument("--entities", type=lambda value: value.split(","), default=ARCHIVE_ENTITIES,
+                          help="comma separated subset of " + ",".join(ARCHIVE_ENTITIES))
+    args = parser.parse_args()
+    if args.command in ("export", "archive"):
+        known = EXPORT_ENTITIES if args.command == "export" else ARCHIVE_ENTITIES
+        unknown = set(args.entities) - set(known)
+        if unknown:
+            parser.error(f"unknown entities: {', '.join(sorted(unknown))}")
+    return args
+
 def main():
     """Main menu for database administration"""
     while True:
@@ -201,4 +419,10 @@ def main():
             print("❌ Invalid choice. Please try again.")
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.command == "export":
+        export(args)
+    elif args.command == "archive":
+        run_archive(args)
+    else:
+        main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Synthetic dataset generator and bulk loader for DevTrack
+
+Fills an empty database (--database-url, SQLite or Postgres) with a seeded,
+realistic dataset for performance testing. Distributions are skewed the
+way real trackers are: a few projects hold most of the work, a few people
+are assigned most of it, and recent months are busier than old ones.
+
+Rows are generated batch by batch and written with executemany core
+inserts, one transaction per batch. Secondary indexes and the full-text
+index are dropped for the load and rebuilt once at the end; on SQLite the
+loading connection also relaxes durability with PRAGMAs, and on Postgres
+it turns off synchronous_commit. Reports rows per second per table.
+
+The target database is only ever taken from --database-url, never from an
+exported DATABASE_URL, and one that already holds rows is refused before
+anything is written.
+
+Every user's password is "password123".
+
+Usage (from backend/):
+    python generate_dataset.py --database-url sqlite:///./perf.db --users 2000 --projects 1000 --tasks 5000000 --bugs 1250000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import inspect, insert, select, text
+from sqlalchemy.schema import CreateIndex, DropIndex
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True, help="empty database to fill, e.g. sqlite:///./perf.db")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--bugs", type=int, help="default: a quarter of --tasks")
+    parser.add_argument("--days", type=int, default=730, help="history the timestamps spread over")
+    parser.add_argument("--batch", type=int, default=10000, help="rows per insert transaction")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+# The engines are created from DATABASE_URL when app is imported
+if __name__ == "__main__":
+    ARGS = parse_args()
+    os.environ["DATABASE_URL"] = ARGS.database_url
+
+from app.auth import get_password_hash
+from app.database import engine, upgrade_schema
+from app.models import User, Project, Task, Bug
+from app.changelog import backfill_change_log
+from app.rollups import backfill_rollups
+from app.search import create_search_index, drop_search_index
+
+PASSWORD = "password123"
+
+# Bulk-load settings for the loading connection only. The file can be
+# corrupted if the machine crashes mid-load, which is fine for a
+# generated dataset.
+SQLITE_BULK_PRAGMAS = [
+    "PRAGMA synchronous = OFF",
+    "PRAGMA journal_mode = MEMORY",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -262144",  # 256 MB
+]
+
+# Value -> weight
+ROLES = {"developer": 60, "tester": 20, "manager": 15, "admin": 5}
+TASK_STATUSES = {"todo": 30, "in_progress": 15, "review": 10, "done": 45}
+TASK_PRIORITIES = {"low": 20, "medium": 45, "high": 25, "critical": 10}
+BUG_STATUSES = {"open": 30, "in_progress": 15, "fixed": 25, "closed": 30}
+BUG_SEVERITIES = {"low": 25, "medium": 40, "high": 25, "critical": 10}
+
+WORDS = (
+    "login session token dashboard widget chart report export import upload avatar profile "
+    "settings password email notification webhook payment invoice checkout cart search filter "
+    "pagination cache timeout retry queue worker migration schema index query latency memory "
+    "crash render layout mobile tablet theme tooltip modal calendar timezone locale keyboard "
+    "clipboard scroll animation build deploy pipeline release api sync offline permissions audit"
+).split()
+TASK_VERBS = ["Implement", "Refactor", "Add", "Update", "Remove", "Document", "Test", "Optimize", "Design"]
+BUG_PREFIXES = ["Crash in", "Wrong", "Slow", "Broken", "Missing", "Flaky", "Unexpected"]
+
+def zipf_weights(n: int, s: float) -> list:
+    """Cumulative weights with rank k drawn in proportion to 1/k**s."""
+    total, cumulative = 0.0, []
+    for rank in range(1, n + 1):
+        total += 1 / rank ** s
+        cumulative.append(total)
+    return cumulative
+
+class Generator:
+    """Seeded row generator; ids are positions in the user and project lists."""
+
+    def __init__(self, seed: int, days: int):
+        self.rng = random.Random(seed)
+        self.now = datetime.utcnow()
+        self.days = days
+
+    def pick(self, weights: dict, k: int) -> list:
+        return self.rng.choices(list(weights), weights=list(weights.values()), k=k)
+
+    def timestamps(self, k: int) -> list:
+        # Squaring a uniform draw puts more activity in the recent past
+        seconds = self.days * 86400
+        return [self.now - timedelta(seconds=int(self.rng.random() ** 2 * seconds)) for _ in range(k)]
+
+    def text(self, words: int) -> str:
+        return " ".join(self.rng.choices(WORDS, k=words))
+
+    def users(self, count: int, hashed_password: str) -> list:
+        roles = self.pick(ROLES, count)
+        return [
+            {"email": f"user{i}@devtrack.test", "username": f"user{i}", "hashed_password": hashed_password, "role": role}
+            for i, role in enumerate(roles, 1)
+        ]
+
+    def projects(self, count: int, owners: list) -> list:
+        return [
+            {"name": f"{self.text(2).title()} {i}", "description": self.text(12).capitalize(),
+             "owner_id": self.rng.choice(owners), "created_at": created_at}
+            for i, created_at in enumerate(self.timestamps(count), 1)
+        ]
+
+    def items(self, kind: str, count: int, projects: list, users: list, project_weights: list, user_weights: list) -> list:
+        """One batch of tasks or bugs."""
+        rng = self.rng
+        project_ids = rng.choices(projects, cum_weights=project_weights, k=count)
+        assignees = rng.choices(users, cum_weights=user_weights, k=count)
+        authors = rng.choices(users, k=count)
+        created = self.timestamps(count)
+        if kind == "task":
+            statuses, levels = self.pick(TASK_STATUSES, count), self.pick(TASK_PRIORITIES, count)
+            titles = [f"{rng.choice(TASK_VERBS)} {self.text(3)}" for _ in range(count)]
+            level_field, author_field, fresh = "priority", "created_by", "todo"
+        else:
+            statuses, levels = self.pick(BUG_STATUSES, count), self.pick(BUG_SEVERITIES, count)
+            titles = [f"{rng.choice(BUG_PREFIXES)} {self.text(3)}" for _ in range(count)]
+            level_field, author_field, fresh = "severity", "reported_by", "open"
+
+        rows = []
+        for i in range(count):
+            created_at = created[i]
+            # Items that moved on were last touched some time after creation
+            updated_at = None
+            if statuses[i] != fresh:
+                updated_at = min(self.now, created_at + timedelta(seconds=int(rng.expovariate(1 / 259200))))
+            rows.append({
+                "title": titles[i], "description": self.text(rng.randint(8, 40)).capitalize(),
+                "status": statuses[i], level_field: levels[i], "project_id": project_ids[i],
+                "assigned_to": assignees[i] if rng.random() < 0.85 else None, author_field: authors[i],
+                "created_at": created_at, "updated_at": updated_at,
+            })
+        return rows
+
+def deferred_indexes(model) -> list:
+    """Secondary indexes worth building after the load instead of during it."""
+    return [index for index in model.__table__.indexes if not index.unique]
+
+def check_empty(conn):
+    # Runs before migrating, so tables may not exist yet
+    for model in (User, Project, Task, Bug):
+        if inspect(conn).has_table(model.__tablename__) and conn.execute(select(model.id).limit(1)).first():
+            sys.exit(f"{model.__tablename__} is not empty; generate_dataset.py only loads into an empty database")
+
+def configure_bulk(conn):
+    if engine.dialect.name == "sqlite":
+        for pragma in SQLITE_BULK_PRAGMAS:
+            conn.exec_driver_sql(pragma)
+    elif engine.dialect.name == "postgresql":
+        conn.exec_driver_sql("SET synchronous_commit = off")
+    conn.commit()
+
+def load_items(conn, gen: Generator, kind: str, model, total: int, batch: int, projects: list, users: list) -> float:
+    """Insert `total` tasks or bugs in batches; returns seconds taken."""
+    # Project sizes follow a steep power law; assignees a gentler one
+    project_weights = zipf_weights(len(projects), 1.1)
+    user_weights = zipf_weights(len(users), 0.8)
+    start = time.perf_counter()
+    done = 0
+    while done < total:
+        count = min(batch, total - done)
+        conn.execute(insert(model), gen.items(kind, count, projects, users, project_weights, user_weights))
+        conn.commit()
+        done += count
+        elapsed = time.perf_counter() - start
+        print(f"\r  {model.__tablename__}: {done}/{total} ({done / elapsed:,.0f} rows/s)", end="", flush=True)
+    print()
+    return time.perf_counter() - start
+
+def main(args):
+    bugs = args.tasks // 4 if args.bugs is None else args.bugs
+
+    print(f"Loading into {engine.url.render_as_string(hide_password=True)}")
+    with engine.connect() as conn:
+        check_empty(conn)
+    upgrade_schema()
+    gen = Generator(args.seed, args.days)
+    timings = {}
+
+    with engine.connect() as conn:
+        configure_bulk(conn)
+
+        start = time.perf_counter()
+        users = gen.users(args.users, get_password_hash(PASSWORD))
+        user_ids = list(conn.scalars(insert(User).returning(User.id, sort_by_parameter_order=True), users))
+        owners = [user_id for user_id, user in zip(user_ids, users) if user["role"] in ("admin", "manager")] or user_ids
+        project_ids = list(conn.scalars(insert(Project).returning(Project.id, sort_by_parameter_order=True),
+                                        gen.projects(args.projects, owners)))
+        conn.commit()
+        timings["users + projects"] = (args.users + args.projects, time.perf_counter() - start)
+
+        indexes = deferred_indexes(Task) + deferred_indexes(Bug)
+        for index in indexes:
+            # IF EXISTS rather than checkfirst: expression indexes are not reflected
+            conn.execute(DropIndex(index, if_exists=True))
+        conn.commit()
+        drop_search_index(engine)
+
+        timings["tasks"] = (args.tasks, load_items(conn, gen, "task", Task, args.tasks, args.batch, project_ids, user_ids))
+        timings["bugs"] = (bugs, load_items(conn, gen, "bug", Bug, bugs, args.batch, project_ids, user_ids))
+
+        print("  building indexes...")
+        start = time.perf_counter()
+        for index in indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+        conn.commit()
+        timings["indexes"] = (None, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    create_search_index(engine)
+    timings["search index"] = (None, time.perf_counter() - start)
+    start = time.perf_counter()
+    backfill_rollups(engine)
+    backfill_change_log(engine)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    timings["rollups + log"] = (None, time.perf_counter() - start)
+
+    print(f"\n{'step':<18} {'rows':>10} {'seconds':>9} {'rows/s':>10}")
+    for step, (rows, seconds) in timings.items():
+        rate = f"{rows / seconds:,.0f}" if rows else ""
+        print(f"{step:<18} {rows or '':>10} {seconds:>9.1f} {rate:>10}")
+    total_rows = args.users + args.projects + args.tasks + bugs
+    total_seconds = sum(seconds for _, seconds in timings.values())
+    print(f"{'total':<18} {total_rows:>10} {total_seconds:>9.1f} {total_rows / total_seconds:>10,.0f}")
+    print(f"\nEvery user's password is {PASSWORD!r}, e.g. user1@devtrack.test")
+
+if __name__ == "__main__":
+    main(ARGS)
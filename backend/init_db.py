@@ -1,22 +1,33 @@
 #!/usr/bin/env python3
 """
 Database initialization script for DevTrack
-Creates the database tables and optionally adds sample data
+Applies the Alembic migrations and optionally adds sample data
+
+The API never changes the schema or seeds data itself; run this (or
+`alembic upgrade head`) once per deploy, before starting the workers.
+
+Usage (from backend/):
+    python init_db.py                  # migrate, then ask about sample data
+    python init_db.py --sample-data    # migrate and seed, no prompt
+    python init_db.py --no-sample-data
 """
 
+import argparse
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.database import create_tables, SessionLocal, Base, engine
+from app.database import upgrade_schema, SessionLocal, Base, engine
 from app.models import User, Project, Task, Bug
 from app.auth import get_password_hash
+from app.changelog import backfill_change_log
+from app.rollups import backfill_rollups
 
 def init_database():
-    """Initialize the database with tables"""
-    print("Creating database tables...")
-    create_tables()
-    print("Database tables created successfully!")
+    """Bring the database schema up to the latest migration"""
+    print("Applying database migrations...")
+    upgrade_schema()
+    print("Database schema is up to date!")
 
 def add_sample_data():
     """Add sample data to the database"""
@@ -130,6 +141,10 @@ def add_sample_data():
         db.add_all([bug1, bug2])
         db.commit()
         
+        # The rows bypassed the API, so derive what its write path maintains
+        backfill_rollups(engine)
+        backfill_change_log(engine)
+        
         print("Sample data added successfully!")
         print("\nSample user accounts:")
         print("Admin: admin@devtrack.com / admin123")
@@ -144,11 +159,18 @@ def add_sample_data():
         db.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sample-data", action=argparse.BooleanOptionalAction,
+                        help="add the demo users, project, tasks and bugs (default: ask)")
+    args = parser.parse_args()
+    
     init_database()
     
     # Ask if user wants to add sample data
-    response = input("\nAdd sample data? (y/n): ").lower().strip()
-    if response in ['y', 'yes']:
+    if args.sample_data is None:
+        response = input("\nAdd sample data? (y/n): ").lower().strip()
+        args.sample_data = response in ['y', 'yes']
+    if args.sample_data:
         add_sample_data()
     
     print("\nDatabase initialization complete!")
@@ -0,0 +1,96 @@
+"""Initial schema
+
+Databases created earlier by create_tables() already have these tables;
+they are left untouched so the revision can be applied on top of them.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-08-27 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+user_role = sa.Enum("admin", "manager", "developer", "tester", name="userrole")
+task_status = sa.Enum("todo", "in_progress", "review", "done", name="taskstatus")
+task_priority = sa.Enum("low", "medium", "high", "critical", name="taskpriority")
+bug_severity = sa.Enum("low", "medium", "high", "critical", name="bugseverity")
+bug_status = sa.Enum("open", "in_progress", "fixed", "closed", name="bugstatus")
+
+def _timestamps():
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    ]
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("username", sa.String(), nullable=False),
+            sa.Column("hashed_password", sa.String(), nullable=False),
+            sa.Column("role", user_role),
+            sa.Column("is_active", sa.Boolean()),
+            *_timestamps(),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+        op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    if "projects" not in existing:
+        op.create_table(
+            "projects",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("description", sa.Text()),
+            sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("is_active", sa.Boolean()),
+            *_timestamps(),
+        )
+        op.create_index("ix_projects_id", "projects", ["id"])
+
+    if "tasks" not in existing:
+        op.create_table(
+            "tasks",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("description", sa.Text()),
+            sa.Column("status", task_status),
+            sa.Column("priority", task_priority),
+            sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id")),
+            sa.Column("assigned_to", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.id")),
+            *_timestamps(),
+        )
+        op.create_index("ix_tasks_id", "tasks", ["id"])
+
+    if "bugs" not in existing:
+        op.create_table(
+            "bugs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("description", sa.Text()),
+            sa.Column("severity", bug_severity),
+            sa.Column("status", bug_status),
+            sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id")),
+            sa.Column("assigned_to", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("reported_by", sa.Integer(), sa.ForeignKey("users.id")),
+            *_timestamps(),
+        )
+        op.create_index("ix_bugs_id", "bugs", ["id"])
+
+def downgrade() -> None:
+    op.drop_table("bugs")
+    op.drop_table("tasks")
+    op.drop_table("projects")
+    op.drop_table("users")
+    for enum_type in (bug_status, bug_severity, task_priority, task_status, user_role):
+        enum_type.drop(op.get_bind(), checkfirst=True)
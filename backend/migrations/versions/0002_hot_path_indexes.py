@@ -0,0 +1,34 @@
+"""Composite indexes for hot task and bug filters
+
+Covers the project list filters, the status analytics filters, the
+assignee lookups and keyset pagination by updated_at.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-09-01 00:00:00
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+HOT_PATH_INDEXES = [
+    ("project_id", "status"),
+    ("assigned_to", "status"),
+    ("project_id", "updated_at"),
+]
+
+def _index_name(table, columns):
+    return f"ix_{table}_{'_'.join(columns)}"
+
+def upgrade() -> None:
+    for table in ("tasks", "bugs"):
+        for columns in HOT_PATH_INDEXES:
+            op.create_index(_index_name(table, columns), table, list(columns), if_not_exists=True)
+
+def downgrade() -> None:
+    for table in ("tasks", "bugs"):
+        for columns in HOT_PATH_INDEXES:
+            op.drop_index(_index_name(table, columns), table_name=table)
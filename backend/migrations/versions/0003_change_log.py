@@ -0,0 +1,45 @@
+"""Change log for delta sync
+
+Append-only record of project, task and bug writes, read by GET /changes
+and by WebSocket clients resuming with last_seq.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-09-08 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "change_log" not in existing:
+        op.create_table(
+            "change_log",
+            sa.Column("seq", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("entity", sa.String(), nullable=False),
+            sa.Column("entity_id", sa.Integer(), nullable=False),
+            sa.Column("project_id", sa.Integer()),
+            sa.Column("op", sa.String(), nullable=False),
+            sa.Column("event_type", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sqlite_autoincrement=True,
+        )
+        op.create_index("ix_change_log_entity_entity_id", "change_log", ["entity", "entity_id"])
+        op.create_index("ix_change_log_project_id_seq", "change_log", ["project_id", "seq"])
+
+    if "change_log_state" not in existing:
+        op.create_table(
+            "change_log_state",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("compacted_through", sa.Integer(), nullable=False),
+        )
+
+def downgrade() -> None:
+    op.drop_table("change_log_state")
+    op.drop_table("change_log")
@@ -0,0 +1,67 @@
+"""Full-text search index over tasks and bugs
+
+SQLite gets an FTS5 table kept in sync by triggers (tasks at rowid 2*id,
+bugs at 2*id+1); Postgres gets a generated, weighted tsvector column with
+a GIN index on each table. Existing rows are indexed.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-09-15 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+TABLES = (("tasks", 0), ("bugs", 1))
+
+def _sqlite_upgrade():
+    if sa.inspect(op.get_bind()).has_table("search_index"):
+        return
+    op.execute("""CREATE VIRTUAL TABLE search_index USING fts5(
+        title, description, project_id UNINDEXED, tokenize = 'porter unicode61'
+    )""")
+    for table, offset in TABLES:
+        op.execute(f"""CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO search_index (rowid, title, description, project_id)
+            VALUES (new.id * 2 + {offset}, new.title, new.description, new.project_id);
+        END""")
+        op.execute(f"""CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE OF title, description, project_id ON {table} BEGIN
+            UPDATE search_index SET title = new.title, description = new.description, project_id = new.project_id
+            WHERE rowid = old.id * 2 + {offset};
+        END""")
+        op.execute(f"""CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table} BEGIN
+            DELETE FROM search_index WHERE rowid = old.id * 2 + {offset};
+        END""")
+        op.execute(f"""INSERT INTO search_index (rowid, title, description, project_id)
+            SELECT id * 2 + {offset}, title, description, project_id FROM {table}""")
+
+def _postgres_upgrade():
+    for table, _ in TABLES:
+        op.execute(f"""ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED""")
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)")
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        _sqlite_upgrade()
+    elif dialect == "postgresql":
+        _postgres_upgrade()
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for table, _ in TABLES:
+            for action in ("insert", "update", "delete"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_search_{action}")
+        op.execute("DROP TABLE IF EXISTS search_index")
+    elif dialect == "postgresql":
+        for table, _ in TABLES:
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+            op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
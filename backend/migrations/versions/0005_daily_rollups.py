@@ -0,0 +1,66 @@
+"""Daily task and bug rollups for trend charts
+
+One row per project, day, entity and priority/severity, plus project 0
+totalling every project. Backfilled from existing rows: items count as
+closed (or started) on the day they were last updated.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-09-22 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# Entity -> (table, column broken down by, statuses counting as closed)
+ENTITIES = {
+    "task": ("tasks", "priority", "'done'"),
+    "bug": ("bugs", "severity", "'fixed', 'closed'"),
+}
+
+def _backfill(entity: str, per_project: bool):
+    table, level, closed = ENTITIES[entity]
+    scope = "project_id" if per_project else "0"
+    closed_day = "date(coalesce(updated_at, created_at))"
+    op.execute(f"""
+        INSERT INTO daily_rollups (project_id, day, entity, level, created, closed, reopened, open_delta, in_progress_delta)
+        SELECT {scope}, day, '{entity}', level, sum(created), sum(closed), 0, sum(open_delta), sum(in_progress_delta)
+        FROM (
+            SELECT project_id, date(created_at) AS day, {level} AS level,
+                   1 AS created, 0 AS closed, 1 AS open_delta, 0 AS in_progress_delta
+            FROM {table} WHERE project_id IS NOT NULL
+            UNION ALL
+            SELECT project_id, {closed_day}, {level}, 0, 1, -1, 0
+            FROM {table} WHERE project_id IS NOT NULL AND status IN ({closed})
+            UNION ALL
+            SELECT project_id, {closed_day}, {level}, 0, 0, 0, 1
+            FROM {table} WHERE project_id IS NOT NULL AND status = 'in_progress'
+        ) AS events
+        GROUP BY {"project_id, " if per_project else ""}day, level
+    """)
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("daily_rollups"):
+        return
+    op.create_table(
+        "daily_rollups",
+        sa.Column("project_id", sa.Integer(), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("entity", sa.String(), primary_key=True),
+        sa.Column("level", sa.String(), primary_key=True),
+        sa.Column("created", sa.Integer(), nullable=False),
+        sa.Column("closed", sa.Integer(), nullable=False),
+        sa.Column("reopened", sa.Integer(), nullable=False),
+        sa.Column("open_delta", sa.Integer(), nullable=False),
+        sa.Column("in_progress_delta", sa.Integer(), nullable=False),
+    )
+    for entity in ENTITIES:
+        _backfill(entity, per_project=True)
+        _backfill(entity, per_project=False)
+
+def downgrade() -> None:
+    op.drop_table("daily_rollups")
@@ -0,0 +1,53 @@
+"""Archive tables for done tasks and closed bugs
+
+Rows the archival job moves out of the hot tasks and bugs tables, with
+their original ids and an archived_at timestamp.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-09-29 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# The enum types already exist on Postgres (migration 0001)
+task_status = postgresql.ENUM("todo", "in_progress", "review", "done", name="taskstatus", create_type=False)
+task_priority = postgresql.ENUM("low", "medium", "high", "critical", name="taskpriority", create_type=False)
+bug_severity = postgresql.ENUM("low", "medium", "high", "critical", name="bugseverity", create_type=False)
+bug_status = postgresql.ENUM("open", "in_progress", "fixed", "closed", name="bugstatus", create_type=False)
+
+def _columns(level: str, level_type, status_type, author: str):
+    return [
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column(level, level_type),
+        sa.Column("status", status_type),
+        sa.Column("project_id", sa.Integer()),
+        sa.Column("assigned_to", sa.Integer()),
+        sa.Column(author, sa.Integer()),
+        sa.Column("created_at", sa.DateTime(timezone=True)),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    ]
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "tasks_archive" not in existing:
+        op.create_table("tasks_archive", *_columns("priority", task_priority, task_status, "created_by"))
+        op.create_index("ix_tasks_archive_project_id", "tasks_archive", ["project_id"])
+
+    if "bugs_archive" not in existing:
+        op.create_table("bugs_archive", *_columns("severity", bug_severity, bug_status, "reported_by"))
+        op.create_index("ix_bugs_archive_project_id", "bugs_archive", ["project_id"])
+
+def downgrade() -> None:
+    op.drop_table("bugs_archive")
+    op.drop_table("tasks_archive")
@@ -0,0 +1,34 @@
+"""Indexes serving per-project keyset pagination
+
+Pages of a project's tasks or bugs are ordered by id, or by
+coalesce(updated_at, created_at) then id for sort=updated_at. The
+(project_id, updated_at) indexes could not serve either order, so every
+page sorted all of the project's rows; they are replaced by indexes on
+exactly the pagination keys.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-10-06 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+TABLES = ("tasks", "bugs")
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.create_index(f"ix_{table}_project_id_id", table, ["project_id", "id"], if_not_exists=True)
+        op.create_index(f"ix_{table}_project_id_touched_at", table,
+                        ["project_id", sa.text("coalesce(updated_at, created_at)"), "id"], if_not_exists=True)
+        op.drop_index(f"ix_{table}_project_id_updated_at", table_name=table, if_exists=True)
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.create_index(f"ix_{table}_project_id_updated_at", table, ["project_id", "updated_at"], if_not_exists=True)
+        op.drop_index(f"ix_{table}_project_id_touched_at", table_name=table)
+        op.drop_index(f"ix_{table}_project_id_id", table_name=table)
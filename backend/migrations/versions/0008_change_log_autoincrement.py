@@ -0,0 +1,48 @@
+"""Never reuse change log seqs on SQLite
+
+Without AUTOINCREMENT, SQLite hands out max(rowid) + 1, so once compaction
+deleted the newest entries (e.g. expired tombstones) the next write reused
+their seq and clients resuming from it missed the change. Postgres
+sequences never go back and need nothing.
+
+Databases created by migration 0003 before it declared AUTOINCREMENT get
+the table rebuilt, with the counter started past every seq handed out so
+far that can still be known.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-10-13 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+def _rebuild(autoincrement: bool):
+    with op.batch_alter_table("change_log", recreate="always",
+                              table_kwargs={"sqlite_autoincrement": autoincrement}) as batch:
+        pass
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    ddl = bind.scalar(sa.text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'change_log'"))
+    if "AUTOINCREMENT" in ddl.upper():
+        return
+    _rebuild(True)
+    # Compaction may already have deleted the head; its horizon is the best
+    # remaining record of how far seqs went
+    bind.execute(sa.text("DELETE FROM sqlite_sequence WHERE name = 'change_log'"))
+    bind.execute(sa.text("""
+        INSERT INTO sqlite_sequence (name, seq)
+        SELECT 'change_log', max(coalesce((SELECT max(seq) FROM change_log), 0),
+                                 coalesce((SELECT max(compacted_through) FROM change_log_state), 0))
+    """))
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        _rebuild(False)
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import delete
+
+from app import changelog
+from app.database import AsyncSessionLocal
+from app.models import ChangeLogState
+
+@pytest.fixture
+def compaction(engine):
+    """Forget the compaction horizon afterwards, so other tests can still sync from 0."""
+    yield
+    with engine.begin() as conn:
+        conn.execute(delete(ChangeLogState))
+
+def test_seq_is_not_reused_after_compacting_the_head(client, auth_headers, compaction):
+    task = client.post("/tasks", json={"title": "Tombstoned", "project_id": 1}, headers=auth_headers).json()
+
+    async def tombstone_and_compact():
+        async with AsyncSessionLocal() as db:
+            seq = await changelog.record_change(db, "task", task["id"], 1, "task_archived", op=changelog.DELETE)
+            await db.commit()
+            # A negative retention expires the tombstone, the head of the log, at once
+            await changelog.compact(db, timedelta(days=-1))
+        return seq
+
+    head = client.portal.call(tombstone_and_compact)
+    response = client.put(f"/tasks/{task['id']}", json={"status": "review"}, headers=auth_headers)
+    assert response.status_code == 200
+
+    changes = client.get("/changes", params={"since": head}).json()["changes"]
+    assert [(change["id"], change["event_type"]) for change in changes] == [(task["id"], "task_updated")]
+    assert changes[0]["seq"] > head
@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from app.event_bus import InProcessBroker, InProcessEventBus, create_event_bus
+from app.versions import CollectionVersions
+from app.websocket_manager import ConnectionManager
+
+@pytest.mark.parametrize("backend", ["local", "memory"])
+def test_process_local_backends_refuse_several_workers(backend):
+    with pytest.raises(ValueError, match="use redis"):
+        create_event_bus(backend, "redis://localhost:6379", "devtrack:events", 5, workers=4)
+
+def test_process_local_backends_serve_one_worker():
+    assert create_event_bus("local", "redis://localhost:6379", "devtrack:events", 5, workers=1) is None
+    assert isinstance(create_event_bus("memory", "redis://localhost:6379", "devtrack:events", 5), InProcessEventBus)
+
+def test_remote_workers_invalidate_every_project_an_event_touches():
+    local, remote, versions = ConnectionManager(), ConnectionManager(), CollectionVersions()
+    remote.on_remote_event = versions.invalidate
+    before = {project_id: versions.etag("tasks", project_id) for project_id in (1, 2, 3)}
+
+    async def move_task():
+        broker = InProcessBroker()
+        await local.attach_bus(InProcessEventBus(broker))
+        await remote.attach_bus(InProcessEventBus(broker))
+        # A task moved from project 1 to project 2
+        await local.broadcast_to_project('{"type": "task_updated", "data": {"id": 7}}', 2, 1)
+        await asyncio.sleep(0)
+
+    asyncio.run(move_task())
+    assert versions.etag("tasks", 1) != before[1]
+    assert versions.etag("tasks", 2) != before[2]
+    assert versions.etag("tasks", 3) == before[3]
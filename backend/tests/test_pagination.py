@@ -0,0 +1,27 @@
+import pytest
+
+from app.pagination import encode_cursor
+
+@pytest.mark.parametrize("sort, values", [
+    ("id", ["x"]),
+    ("id", [True]),
+    ("id", [1, 2]),
+    ("updated_at", ["2025-01-01T00:00:00", "x"]),
+    ("updated_at", ["not a time", 1]),
+])
+def test_forged_cursor_is_rejected(client, sort, values):
+    response = client.get("/tasks", params={"project_id": 1, "limit": 10, "sort": sort, "cursor": encode_cursor(values)})
+    assert (response.status_code, response.json()["detail"]) == (400, "Invalid cursor")
+
+@pytest.mark.parametrize("sort", ["id", "updated_at"])
+def test_cursor_walks_every_row_once(client, sort):
+    seen, cursor = [], None
+    while True:
+        params = {"project_id": 3, "limit": 40, "sort": sort, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/tasks", params=params)
+        assert response.status_code == 200
+        seen += [task["id"] for task in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == len(client.get("/tasks", params={"project_id": 3}).json())
@@ -0,0 +1,39 @@
+"""
+Query-budget regression tests for the API endpoints.
+
+Each endpoint is called once to warm caches, then again inside the
+max_queries fixture, and fails if it runs more SQL statements than its
+budget. A failure lists every statement with the line of app code that
+issued it, so an N+1 loop or an accidental lazy load shows up where it was
+introduced. Lower a budget when an endpoint gets cheaper.
+"""
+
+import pytest
+
+# (method, path, JSON body, most statements one call may run)
+BUDGETS = [
+    ("GET", "/projects", None, 1),
+    ("GET", "/tasks?project_id=1&limit=50", None, 1),
+    ("GET", "/tasks?project_id=1&limit=50&format=ndjson", None, 1),
+    ("GET", "/bugs?project_id=1&limit=50", None, 1),
+    ("GET", "/analytics/dashboard", None, 0),
+    ("GET", "/analytics/burndown?project_id=1", None, 2),
+    ("GET", "/analytics/created-vs-resolved", None, 1),
+    ("GET", "/search?q=task", None, 1),
+    # The horizon, the log page, then one query per entity type on the page
+    ("GET", "/changes?since=0", None, 5),
+    ("POST", "/tasks", {"title": "Budget task", "project_id": 1}, 6),
+    ("PUT", "/tasks/1", {"status": "done"}, 6),
+    ("POST", "/bugs", {"title": "Budget bug", "project_id": 1}, 6),
+    ("PUT", "/bugs/1", {"status": "closed"}, 6),
+    # SQLite runs INSERT ... RETURNING once per row when ids must follow item order
+    ("POST", "/tasks:batch", {"items": [{"title": f"Batch {i}", "project_id": 1} for i in range(20)]}, 25),
+    ("PATCH", "/tasks:batch", {"items": [{"id": i, "status": "review"} for i in range(1, 21)]}, 6),
+]
+
+@pytest.mark.parametrize("method, path, body, budget", BUDGETS, ids=[f"{m} {p}" for m, p, _, _ in BUDGETS])
+def test_endpoint_stays_within_query_budget(client, auth_headers, max_queries, method, path, body, budget):
+    client.request(method, path, json=body, headers=auth_headers).raise_for_status()
+    with max_queries(budget):
+        response = client.request(method, path, json=body, headers=auth_headers)
+    assert response.status_code < 400, response.text
@@ -0,0 +1,62 @@
+"""
+Query-plan regression tests for the hot task and bug queries.
+
+Runs EXPLAIN QUERY PLAN on each hot query against the migrated, seeded
+SQLite test database and fails if any of them falls back to a full table
+scan or sorts its rows in a temporary b-tree for ORDER BY (for a keyset
+page, that sorts every matching row to return a few). Scans of a covering
+index are allowed, since they never touch the table rows, and so are
+GROUP BY b-trees, which hold one entry per group.
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models import Task, Bug, DailyRollup
+from app.pagination import keyset_select
+
+# Status each table is filtered on by the dashboard analytics
+HOT_STATUS = {Task: "done", Bug: "open"}
+
+def hot_queries():
+    """(name, statement) pairs for the access paths the API depends on."""
+    queries = []
+    for model, hot_status in HOT_STATUS.items():
+        name = model.__tablename__
+        by_project = select(model).where(model.project_id == 1)
+        queries += [
+            (f"{name}: list by project", keyset_select(by_project, model, "id").limit(101)),
+            (f"{name}: list by project, recently updated", keyset_select(by_project, model, "updated_at").limit(101)),
+            (f"{name}: assignee with status", select(model).where(model.assigned_to == 1, model.status == hot_status)),
+            (f"{name}: status count in project",
+             select(func.count(model.id)).where(model.project_id == 1, model.status == hot_status)),
+            (f"{name}: status counts", select(model.status, func.count(model.id)).group_by(model.status)),
+        ]
+    in_range = (DailyRollup.project_id == 1, DailyRollup.day >= date(2025, 1, 1), DailyRollup.day <= date(2025, 12, 31))
+    queries += [
+        ("rollups: days in range", select(DailyRollup.day, func.sum(DailyRollup.created)).where(*in_range).group_by(DailyRollup.day)),
+        ("rollups: before range", select(func.sum(DailyRollup.open_delta)).where(DailyRollup.project_id == 1, DailyRollup.day < date(2025, 1, 1))),
+    ]
+    return queries
+
+def plan_problems(plan_rows):
+    """Plan details that read a table without any index or sort rows in a temp b-tree."""
+    return [detail for *_, detail in plan_rows
+            if (detail.startswith("SCAN") and "USING" not in detail)
+            or detail.startswith(("USE TEMP B-TREE FOR ORDER BY", "USE TEMP B-TREE FOR DISTINCT"))]
+
+@pytest.fixture(scope="module")
+def analyzed(engine):
+    """The test database with planner statistics, as a real one would have."""
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return engine
+
+@pytest.mark.parametrize("name, stmt", hot_queries(), ids=[name for name, _ in hot_queries()])
+def test_hot_query_uses_an_index(analyzed, name, stmt):
+    sql = str(stmt.compile(analyzed, compile_kwargs={"literal_binds": True}))
+    with analyzed.connect() as conn:
+        plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+    assert not plan_problems(plan), "\n".join(detail for *_, detail in plan)
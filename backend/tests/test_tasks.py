@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.database import SessionLocal
+from app.models import ChangeLog, Task
+
+@pytest.mark.parametrize("body, error", [
+    ({"status": "bogus"}, "Invalid status: bogus"),
+    ({"priority": "urgent"}, "Invalid priority: urgent"),
+    ({"owner": 2}, "Unknown field: owner"),
+    ({"project_id": "2"}, "project_id must be an integer"),
+    ({"title": " "}, "title must be a non-empty string"),
+])
+def test_invalid_update_is_rejected_before_writing(client, auth_headers, body, error):
+    task = client.post("/tasks", json={"title": "Validated", "project_id": 1}, headers=auth_headers).json()
+    with SessionLocal() as db:
+        head = db.scalar(select(func.max(ChangeLog.seq)))
+
+    response = client.put(f"/tasks/{task['id']}", json=body, headers=auth_headers)
+    assert (response.status_code, response.json()["detail"]) == (422, error)
+
+    with SessionLocal() as db:
+        stored = db.get(Task, task["id"])
+        assert (stored.title, stored.status.value, stored.priority.value) == ("Validated", "todo", "medium")
+    assert client.get("/changes", params={"since": head}).json()["changes"] == []
+
+def test_update_can_move_a_task(client, auth_headers):
+    task = client.post("/tasks", json={"title": "Moved", "project_id": 1}, headers=auth_headers).json()
+    response = client.put(f"/tasks/{task['id']}", json={"status": "review", "project_id": 2}, headers=auth_headers)
+    assert response.status_code == 200
+    assert (response.json()["status"], response.json()["project_id"]) == ("review", 2)
+
+def test_invalid_create_is_rejected(client, auth_headers):
+    response = client.post("/tasks", json={"title": "Bad", "project_id": 1, "status": "bogus"}, headers=auth_headers)
+    assert (response.status_code, response.json()["detail"]) == (422, "Invalid status: bogus")
+    response = client.post("/bugs", json={"title": "Bad", "project_id": 1, "severity": "meh"}, headers=auth_headers)
+    assert (response.status_code, response.json()["detail"]) == (422, "Invalid severity: meh")
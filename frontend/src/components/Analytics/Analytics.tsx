@@ -32,8 +32,17 @@ interface AnalyticsData {
   completion_rate: number;
 }
 
+interface TrendDay {
+  day: string;
+  open: number;
+  in_progress: number;
+  created: number;
+  closed: number;
+}
+
 const Analytics: React.FC = () => {
   const [analyticsData, setAnalyticsData] = useState<AnalyticsData | null>(null);
+  const [trendData, setTrendData] = useState<TrendDay[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
 
@@ -43,8 +52,18 @@ const Analytics: React.FC = () => {
 
   const fetchAnalyticsData = async () => {
     try {
-      const response = await axios.get('/analytics/dashboard');
+      const [response, burndown, flow] = await Promise.all([
+        axios.get('/analytics/dashboard'),
+        axios.get('/analytics/burndown'),
+        axios.get('/analytics/created-vs-resolved')
+      ]);
       setAnalyticsData(response.data);
+      // Both cover the same 30 days, one entry per day
+      setTrendData(burndown.data.days.map((day: any, index: number) => ({
+        ...day,
+        ...flow.data.days[index],
+        day: day.day.slice(5)
+      })));
     } catch (err: any) {
       setError('Failed to load analytics data');
       console.error('Analytics fetch error:', err);
@@ -106,25 +125,6 @@ const Analytics: React.FC = () => {
     }
   ];
 
-  const completionData = [
-    {
-      name: 'Week 1',
-      completion: 10
-    },
-    {
-      name: 'Week 2',
-      completion: 25
-    },
-    {
-      name: 'Week 3',
-      completion: 45
-    },
-    {
-      name: 'Week 4',
-      completion: Math.round(analyticsData?.completion_rate || 0)
-    }
-  ];
-
   const COLORS = ['#0088FE', '#00C49F', '#FFBB28', '#FF8042'];
 
   return (
@@ -208,29 +208,43 @@ const Analytics: React.FC = () => {
           </CardContent>
         </Card>
 
-        {/* Completion Trend Line Chart */}
+        {/* Burndown Line Chart */}
         <Card sx={{ flex: '1 1 400px', minHeight: 400 }}>
           <CardContent>
             <Typography variant="h6" gutterBottom>
-              Completion Trend
+              Burndown (30 days)
             </Typography>
             <ResponsiveContainer width="100%" height={300}>
-              <LineChart data={completionData}>
+              <LineChart data={trendData}>
                 <CartesianGrid strokeDasharray="3 3" />
-                <XAxis dataKey="name" />
+                <XAxis dataKey="day" />
                 <YAxis />
                 <Tooltip />
-                <Line 
-                  type="monotone" 
-                  dataKey="completion" 
-                  stroke="#8884d8" 
-                  strokeWidth={2}
-                  dot={{ fill: '#8884d8' }}
-                />
+                <Line type="monotone" dataKey="open" name="Open" stroke="#f44336" strokeWidth={2} dot={false} />
+                <Line type="monotone" dataKey="in_progress" name="In progress" stroke="#ff9800" strokeWidth={2} dot={false} />
               </LineChart>
             </ResponsiveContainer>
           </CardContent>
         </Card>
+
+        {/* Created vs Resolved Bar Chart */}
+        <Card sx={{ flex: '1 1 400px', minHeight: 400 }}>
+          <CardContent>
+            <Typography variant="h6" gutterBottom>
+              Created vs Resolved (30 days)
+            </Typography>
+            <ResponsiveContainer width="100%" height={300}>
+              <BarChart data={trendData}>
+                <CartesianGrid strokeDasharray="3 3" />
+                <XAxis dataKey="day" />
+                <YAxis allowDecimals={false} />
+                <Tooltip />
+                <Bar dataKey="created" name="Created" fill="#1976d2" />
+                <Bar dataKey="closed" name="Resolved" fill="#4caf50" />
+              </BarChart>
+            </ResponsiveContainer>
+          </CardContent>
+        </Card>
       </Box>
 
       {/* Summary Cards */}
@@ -1,10 +1,12 @@
-import React, { createContext, useContext, useEffect, useState, ReactNode } from 'react';
+import React, { createContext, useContext, useEffect, useRef, useState, ReactNode } from 'react';
 import { useAuth } from './AuthContext';
 
 interface WebSocketContextType {
   socket: WebSocket | null;
   isConnected: boolean;
   sendMessage: (message: any) => void;
+  subscribe: (projectId: number) => void;
+  unsubscribe: (projectId: number) => void;
 }
 
 const WebSocketContext = createContext<WebSocketContextType | undefined>(undefined);
@@ -18,36 +20,84 @@ export const WebSocketProvider: React.FC<WebSocketProviderProps> = ({ children }
   const [isConnected, setIsConnected] = useState(false);
   const { user } = useAuth();
 
+  // Change log position of the last event seen, used to resume after a reconnect
+  const lastSeq = useRef<number | null>(null);
+  // Projects to receive events for; none means every project
+  const projects = useRef<Set<number>>(new Set());
+
   useEffect(() => {
-    if (user) {
-      const ws = new WebSocket(`ws://localhost:8000/ws/${user.id}`);
+    if (!user) {
+      return;
+    }
+    let disposed = false;
+    let ws: WebSocket;
+    let reconnectTimer: ReturnType<typeof setTimeout>;
+    
+    const handleEvent = (data: any) => {
+      if (typeof data.seq === 'number') {
+        lastSeq.current = Math.max(lastSeq.current ?? 0, data.seq);
+      }
+      
+      // Handle different message types
+      switch (data.type) {
+        case 'task_created':
+        case 'task_updated':
+        case 'task_deleted':
+        case 'bug_created':
+        case 'bug_updated':
+        case 'bug_deleted':
+        case 'project_created':
+        case 'project_updated':
+        case 'tasks_batch_created':
+        case 'tasks_batch_updated':
+        case 'bugs_batch_created':
+        case 'bugs_batch_updated':
+        case 'tasks_batch_archived':
+        case 'bugs_batch_archived':
+        case 'resync_required':
+          // Trigger UI updates here
+          window.dispatchEvent(new CustomEvent('websocket-update', { detail: data }));
+          break;
+        case 'replay_complete':
+          lastSeq.current = data.last_seq;
+          break;
+        default:
+          console.log('Unknown message type:', data.type);
+      }
+    };
+    
+    const connect = () => {
+      const resume = lastSeq.current !== null ? `?last_seq=${lastSeq.current}` : '';
+      ws = new WebSocket(`ws://localhost:8000/ws/${user.id}${resume}`);
       
       ws.onopen = () => {
         console.log('WebSocket connected');
         setIsConnected(true);
+        // Subscriptions belong to the connection, so send them again on every connect
+        projects.current.forEach((projectId) => {
+          ws.send(JSON.stringify({ type: 'subscribe', project_id: projectId }));
+        });
       };
       
       ws.onmessage = (event) => {
         const data = JSON.parse(event.data);
         console.log('WebSocket message received:', data);
         
-        // Handle different message types
-        switch (data.type) {
-          case 'task_created':
-          case 'task_updated':
-          case 'bug_created':
-          case 'project_created':
-            // Trigger UI updates here
-            window.dispatchEvent(new CustomEvent('websocket-update', { detail: data }));
-            break;
-          default:
-            console.log('Unknown message type:', data.type);
+        // The server coalesces bursts of events into one batch frame
+        if (data.type === 'batch') {
+          data.events.forEach(handleEvent);
+        } else {
+          handleEvent(data);
         }
       };
       
       ws.onclose = () => {
         console.log('WebSocket disconnected');
         setIsConnected(false);
+        // Reconnect and replay what was missed in the meantime
+        if (!disposed) {
+          reconnectTimer = setTimeout(connect, 2000);
+        }
       };
       
       ws.onerror = (error) => {
@@ -55,11 +105,15 @@ export const WebSocketProvider: React.FC<WebSocketProviderProps> = ({ children }
       };
       
       setSocket(ws);
-      
-      return () => {
-        ws.close();
-      };
-    }
+    };
+    
+    connect();
+    
+    return () => {
+      disposed = true;
+      clearTimeout(reconnectTimer);
+      ws.close();
+    };
   }, [user]);
 
   const sendMessage = (message: any) => {
@@ -68,10 +122,22 @@ export const WebSocketProvider: React.FC<WebSocketProviderProps> = ({ children }
     }
   };
 
+  const subscribe = (projectId: number) => {
+    projects.current.add(projectId);
+    sendMessage({ type: 'subscribe', project_id: projectId });
+  };
+
+  const unsubscribe = (projectId: number) => {
+    projects.current.delete(projectId);
+    sendMessage({ type: 'unsubscribe', project_id: projectId });
+  };
+
   const value: WebSocketContextType = {
     socket,
     isConnected,
-    sendMessage
+    sendMessage,
+    subscribe,
+    unsubscribe
   };
 
   return (